@@ -24,6 +24,7 @@ class AcademyClient(BaseAcademyClient):
             "getOrCreateUser",
             model=GetOrCreateUserResponse,
             json=user_data.model_dump(exclude_unset=True),
+            retry_unsent=True,
         )
 
     def enroll_user_in_course(self, enrollment_data: EnrollUserInCourseRequest) -> EnrollUserInCourseResponse:
@@ -32,6 +33,7 @@ class AcademyClient(BaseAcademyClient):
             "enrollUserInCourse",
             model=EnrollUserInCourseResponse,
             json=enrollment_data.model_dump(exclude_unset=True),
+            retry_unsent=True,
         )
 
     def generate_login_url(self, login_data: GenerateLoginUrlRequest) -> GenerateLoginUrlResponse:
@@ -40,6 +42,7 @@ class AcademyClient(BaseAcademyClient):
             "generateLoginUrl",
             model=GenerateLoginUrlResponse,
             json=login_data.model_dump(exclude_unset=True),
+            retry_unsent=True,
         )
 
     def get_user_by_external_id(self, external_id_data: GetUserByExternalIdRequest) -> GetUserByExternalIdResponse:
@@ -1,16 +1,16 @@
 import base64
 
-from httpx import Client
+from common.http_client import HttpClientConfig
 
 from django.conf import settings
 
 
-class AcademyClientConfig:
+class AcademyClientConfig(HttpClientConfig):
     timeout: float = 10.0
     max_retries: int = 3
 
-    @staticmethod
-    def get_client() -> Client:
+    @classmethod
+    def get_client_kwargs(cls):
         base_url = (academy_settings := getattr(settings, "ACADEMY_SETTINGS", {})).get("BASE_URL")
         username = academy_settings.get("USERNAME")
         password = academy_settings.get("PASSWORD")
@@ -22,10 +22,9 @@ class AcademyClientConfig:
         if not base_url:
             return
 
-        return Client(
-            timeout=AcademyClientConfig.timeout,
-            headers={
+        return {
+            "headers": {
                 "Authorization": f"Basic {basic_auth}",
             },
-            base_url=base_url,
-        )
+            "base_url": base_url,
+        }
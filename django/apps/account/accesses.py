@@ -1,6 +1,6 @@
 from itertools import chain
 from operator import methodcaller
-from typing import Callable, List, Optional, Type
+from typing import Any, Callable, Dict, Hashable, List, Optional, Type
 
 from common.utils import fj, get_all_subclasses
 from pydantic import BaseModel, InstanceOf
@@ -13,9 +13,55 @@ from django.db.models.lookups import In
 from .models import Organization, OrganizationMembership, User
 
 
+class RequestAccessCache:
+    """
+    Access check results memoized for the lifetime of a single request.
+
+    Stored on the request context, so a list of nodes checks each access once per user and
+    object, and the user's accesses and organization memberships are loaded once.
+    """
+
+    CONTEXT_ATTRIBUTE = "access_cache"
+
+    def __init__(self):
+        self.results: Dict[Hashable, Any] = {}
+
+    @classmethod
+    def from_context(cls, context) -> Optional["RequestAccessCache"]:
+        if context is None:
+            return None
+
+        if (access_cache := getattr(context, cls.CONTEXT_ATTRIBUTE, None)) is None:
+            access_cache = cls()
+            setattr(context, cls.CONTEXT_ATTRIBUTE, access_cache)
+        return access_cache
+
+    @staticmethod
+    def get_instance_key(instance: Optional[Model]) -> Optional[tuple]:
+        return instance and (instance._meta.label, instance.pk)
+
+    def get_or_set(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        if key not in self.results:
+            self.results[key] = compute()
+        return self.results[key]
+
+    def user_has_access(self, user: User, access_slug: str) -> bool:
+        return user.is_superuser or access_slug in self.get_or_set(("access_slugs", user.pk), user.get_access_slugs)
+
+    def get_member_organization_ids(self, user: User) -> set:
+        memberships: QuerySet[OrganizationMembership] = getattr(
+            user, OrganizationMembership.user.field.related_query_name()
+        )
+        return self.get_or_set(
+            ("member_organization_ids", user.pk),
+            lambda: set(memberships.values_list(OrganizationMembership.organization.field.attname, flat=True)),
+        )
+
+
 class AccessPredicateArgument(BaseModel):
     user: Optional[InstanceOf[Model]] = None
     instance: Optional[InstanceOf[Model]] = None
+    access_cache: Optional[InstanceOf[RequestAccessCache]] = None
 
 
 class AccessType(BaseModel):
@@ -62,6 +108,9 @@ def is_organization_member(kwargs: dict):
         f"Invalid argument types {user}, {instance}; expected: {User}, {Organization}"
     )
 
+    if access_cache := parsed_kwargs.access_cache:
+        return instance.pk in access_cache.get_member_organization_ids(user)
+
     memberships: QuerySet[OrganizationMembership] = getattr(
         user, OrganizationMembership.user.field.related_query_name()
     )
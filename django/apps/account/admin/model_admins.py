@@ -1,16 +1,20 @@
 from academy.models import Course, CourseResult
 from cities_light.models import City
+from common.exports import stream_csv
 from common.models import Field
 from common.utils import fj
 from graphql_auth.models import UserStatus
 from import_export.admin import ExportMixin
+from import_export.formats.base_formats import CSV, XLSX
+from import_export.signals import post_export
 
 from django.contrib import admin, messages
 from django.contrib.admin import register
 from django.contrib.auth.admin import UserAdmin as UserAdminBase
 from django.contrib.contenttypes.admin import GenericStackedInline
+from django.core.exceptions import PermissionDenied
 from django.db.models import QuerySet
-from django.http import HttpResponseRedirect
+from django.http import HttpResponseRedirect, StreamingHttpResponse
 from django.shortcuts import render
 from django.urls import path, reverse
 from django.utils.html import format_html
@@ -73,7 +77,12 @@ from ..models import (
     WorkExperience,
 )
 from ..scores import UserScorePack
-from ..tasks import get_certificate_text, set_user_resume_json, user_task_runner
+from ..tasks import (
+    export_profiles_async,
+    get_certificate_text,
+    set_user_resume_json,
+    user_task_runner,
+)
 from .resources import (
     CertificateAndLicenseResource,
     EducationResource,
@@ -231,13 +240,45 @@ class ProfileAdmin(ExportMixin, admin.ModelAdmin):
 
     @admin.action(description="Recalculate Scores")
     def recalculate_scores(self, request, queryset):
-        updated_profiles = []
-        for profile in queryset:
-            profile.scores = UserScorePack.calculate(profile.user)
-            profile.score = sum(profile.scores.values())
-            updated_profiles.append(profile)
+        UserScorePack.update_profiles(queryset)
+
+    def get_export_formats(self):
+        return [CSV, XLSX]
+
+    def _do_file_export(self, file_format, request, queryset, export_form=None):
+        # Profiles are exported row by row: csv is streamed to the response and xlsx is written in the background
+        if not self.has_export_permission(request):
+            raise PermissionDenied
+
+        export_fields = self.get_export_resource_fields_from_form(export_form)
+        if isinstance(file_format, XLSX):
+            user_task = user_task_runner(
+                export_profiles_async,
+                task_user_id=request.user.pk,
+                user_id=request.user.pk,
+                profile_ids=list(queryset.values_list(Profile._meta.pk.attname, flat=True)),
+                export_fields=export_fields,
+            )
+            self.message_user(
+                request,
+                format_html(
+                    _('The export is being prepared, its file will be linked in the result of <a href="{}">{}</a>.'),
+                    reverse("admin:auth_account_usertask_change", args=[user_task.pk]),
+                    user_task,
+                ),
+                level=messages.INFO,
+            )
+            return HttpResponseRedirect(reverse("admin:auth_account_profile_changelist"))
 
-        Profile.objects.bulk_update(updated_profiles, fields=[Profile.scores.field.name, Profile.score.field.name])
+        resource = self.choose_export_resource_class(export_form, request)(**self.get_export_resource_kwargs(request))
+        response = StreamingHttpResponse(
+            stream_csv(resource.iter_export_rows(queryset, export_fields)),
+            content_type=file_format.get_content_type(),
+        )
+        filename = self.get_export_filename(request, queryset, file_format)
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        post_export.send(sender=None, model=self.model)
+        return response
 
 
 @register(Contact)
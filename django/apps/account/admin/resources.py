@@ -1,11 +1,14 @@
+from common.exports import PrefetchedExportResourceMixin
 from common.utils import LOOKUP_SEP, fj, nested_getattr
 from import_export import fields
 from import_export.resources import ModelResource
 
 from django.conf import settings
+from django.db.models import Prefetch
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 
+from ..constants import ProfileAnnotationNames
 from ..models import (
     CertificateAndLicense,
     Contact,
@@ -17,7 +20,7 @@ from ..models import (
 )
 
 
-class ProfileResource(ModelResource):
+class ProfileResource(PrefetchedExportResourceMixin, ModelResource):
     email = fields.Field(column_name=_("Email"))
     full_name = fields.Field(column_name=_("Full Name"))
     phone_number = fields.Field(column_name=_("Phone Number"))
@@ -33,6 +36,46 @@ class ProfileResource(ModelResource):
     has_language_certificate = fields.Field(column_name=_("Has Language Certificate"))
     has_certificate_and_license = fields.Field(column_name=_("Has Certificate and License"))
 
+    export_select_related = {
+        "email": [Profile.user.field.name],
+        "full_name": [Profile.user.field.name],
+        "last_login": [Profile.user.field.name],
+        "date_joined": [Profile.user.field.name],
+        Profile.avatar.field.name: [Profile.avatar.field.name],
+    }
+    export_prefetch_related = {
+        "phone_number": [
+            Prefetch(
+                fj(Profile.contactable, Contact.contactable.field.related_query_name()),
+                queryset=Contact.objects.filter(**{Contact.type.field.name: Contact.Type.PHONE}),
+                to_attr="phone_contacts",
+            )
+        ],
+        "educations": [
+            Prefetch(
+                fj(Profile.user, Education.user.field.related_query_name()),
+                queryset=Education.objects.select_related(Education.university.field.name),
+            )
+        ],
+        "work_experiences": [fj(Profile.user, WorkExperience.user.field.related_query_name())],
+        "language_certificates": [
+            Prefetch(
+                fj(Profile.user, LanguageCertificate.user.field.related_query_name()),
+                queryset=LanguageCertificate.objects.select_related(LanguageCertificate.test.field.name),
+            )
+        ],
+        "certificate_and_licenses": [fj(Profile.user, CertificateAndLicense.user.field.related_query_name())],
+    }
+    export_annotations = {
+        "has_education": [ProfileAnnotationNames.HAS_EDUCATION],
+        "has_work_experience": [ProfileAnnotationNames.HAS_WORK_EXPERIENCE],
+        "has_language_certificate": [ProfileAnnotationNames.HAS_LANGUAGE_CERTIFICATE],
+        "has_certificate_and_license": [ProfileAnnotationNames.HAS_CERTIFICATE],
+    }
+
+    def get_annotations_dict(self):
+        return Profile.flex_report_custom_manager.get_annotations_dict()
+
     def dehydrate_educations(self, obj: Profile):
         return "\n\n".join(
             "\n".join(
@@ -43,7 +86,7 @@ class ProfileResource(ModelResource):
                     f"Admin Link: {settings.SITE_DOMAIN}{reverse_lazy('admin:auth_account_education_change', args=[education.pk])}",
                 ]
             )
-            for education in Education.objects.filter(**{Education.user.field.name: obj.user})
+            for education in getattr(obj.user, Education.user.field.related_query_name()).all()
         )
 
     def dehydrate_work_experiences(self, obj: Profile):
@@ -56,7 +99,7 @@ class ProfileResource(ModelResource):
                     f"Admin Link: {settings.SITE_DOMAIN}{reverse_lazy('admin:auth_account_workexperience_change', args=[work_experience.pk])}",
                 ]
             )
-            for work_experience in WorkExperience.objects.filter(**{WorkExperience.user.field.name: obj.user})
+            for work_experience in getattr(obj.user, WorkExperience.user.field.related_query_name()).all()
         )
 
     def dehydrate_certificate_and_licenses(self, obj: Profile):
@@ -69,9 +112,9 @@ class ProfileResource(ModelResource):
                     f"Admin Link: {settings.SITE_DOMAIN}{reverse_lazy('admin:auth_account_certificateandlicense_change', args=[certificate_and_license.pk])}",
                 ]
             )
-            for certificate_and_license in CertificateAndLicense.objects.filter(
-                **{CertificateAndLicense.user.field.name: obj.user}
-            )
+            for certificate_and_license in getattr(
+                obj.user, CertificateAndLicense.user.field.related_query_name()
+            ).all()
         )
 
     def dehydrate_language_certificates(self, obj: Profile):
@@ -84,17 +127,13 @@ class ProfileResource(ModelResource):
                     f"Admin Link: {settings.SITE_DOMAIN}{reverse_lazy('admin:auth_account_languagecertificate_change', args=[language_certificate.pk])}",
                 ]
             )
-            for language_certificate in LanguageCertificate.objects.filter(
-                **{LanguageCertificate.user.field.name: obj.user}
-            )
+            for language_certificate in getattr(obj.user, LanguageCertificate.user.field.related_query_name()).all()
         )
 
     def dehydrate_phone_number(self, obj: Profile):
         return ", ".join(
             display_value
-            for instance in Contact.objects.filter(**{Contact.type.field.name: Contact.Type.PHONE}).filter(
-                **{fj(Contact.contactable, Profile.contactable.field.related_query_name())}
-            )
+            for instance in (obj.contactable.phone_contacts if obj.contactable else [])
             if (display_dict := instance.get_display_name_and_link()) and (display_value := display_dict.get("display"))
         )
 
@@ -117,16 +156,16 @@ class ProfileResource(ModelResource):
         return obj.user.date_joined.replace(tzinfo=None) if obj.user.date_joined else None
 
     def dehydrate_has_education(self, obj: Profile):
-        return "✓" if obj.user.educations.exists() else "×"
+        return "✓" if getattr(obj, ProfileAnnotationNames.HAS_EDUCATION) else "×"
 
     def dehydrate_has_work_experience(self, obj: Profile):
-        return "✓" if obj.user.workexperiences.exists() else "×"
+        return "✓" if getattr(obj, ProfileAnnotationNames.HAS_WORK_EXPERIENCE) else "×"
 
     def dehydrate_has_language_certificate(self, obj: Profile):
-        return "✓" if obj.user.languagecertificates.exists() else "×"
+        return "✓" if getattr(obj, ProfileAnnotationNames.HAS_LANGUAGE_CERTIFICATE) else "×"
 
     def dehydrate_has_certificate_and_license(self, obj: Profile):
-        return "✓" if obj.user.certificateandlicenses.exists() else "×"
+        return "✓" if getattr(obj, ProfileAnnotationNames.HAS_CERTIFICATE) else "×"
 
     class Meta:
         model = Profile
@@ -153,6 +192,7 @@ class ProfileResource(ModelResource):
         widgets = {
             Profile.birth_date.field.name: {"format": "%Y-%m-%d"},
         }
+        chunk_size = 1000
 
 
 class EducationResource(ModelResource):
@@ -1,8 +1,10 @@
 import contextlib
 import json
+from functools import partial
 from typing import List
 
 from ai.assistants import Assistant
+from ai.extraction import FileDocument, cached_extraction
 from common.logging import get_logger
 from common.models import LanguageProficiencySkill, LanguageProficiencyTest
 from common.utils import fj
@@ -15,6 +17,7 @@ from django.contrib.postgres.expressions import ArraySubquery
 from django.db.models import F, OuterRef, Subquery
 from django.db.models.functions import JSONObject
 
+from .constants import DOCUMENT_CONTEXT_KEY
 from .typing.analysis import (
     VERIFICATION_METHOD_NAMES,
     AnalysisResponse,
@@ -34,8 +37,16 @@ class DocumentValidationAssistant(Assistant[IsValid]):
         self.verification_method_name = verification_method_name
         return self
 
+    def get_document(self) -> FileDocument | None:
+        return self.context.get(DOCUMENT_CONTEXT_KEY)
+
+    def get_file_part(self):
+        if document := self.get_document():
+            return document.get_part()
+        return self.service.get_file_part(self.file_model_id)
+
     def get_prompts(self):
-        file_part = self.service.get_file_part(self.file_model_id)
+        file_part = self.get_file_part()
         text_part = genai_types.Part.from_text(
             text=json.dumps({"verification_method_name": self.verification_method_name})
         )
@@ -59,7 +70,7 @@ class DocumentOcrAssistant(DocumentValidationAssistant, Assistant[OcrResponse]):
     assistant_slug = Assistants.OCR
 
     def get_prompts(self):
-        if not (file_part := self.service.get_file_part(self.file_model_id)):
+        if not (file_part := self.get_file_part()):
             return []
 
         return [
@@ -80,6 +91,18 @@ class DocumentOcrAssistant(DocumentValidationAssistant, Assistant[OcrResponse]):
     def should_pass(self, result):
         return len(result)
 
+    def execute(self, *, is_json_marked=True, old_results):
+        execute = partial(super().execute, is_json_marked=is_json_marked, old_results=old_results)
+        if not (document := self.get_document()):
+            return execute()
+
+        return cached_extraction(
+            f"{self.assistant_slug}:{self.service.instance.model_name}",
+            document.content_hash,
+            execute,
+            should_cache=lambda result: isinstance(result, dict) and bool(result.get("text_content")),
+        )
+
 
 class DocumentDataAnalysisAssistant(DocumentValidationAssistant, Assistant[AnalysisResponse]):
     assistant_slug = Assistants.DOCUMENT_DATA_ANALYSIS
@@ -94,7 +117,7 @@ class DocumentDataAnalysisAssistant(DocumentValidationAssistant, Assistant[Analy
                     text=json.dumps({"verification_method_name": self.verification_method_name} | ocr_response)
                 ),
             ]
-            results = self.service.generate_text_content(prompt)
+            results = self.service.generate_text_content(prompt, use_cache=self.cache_responses)
             return self.response_builder(results=results, old_results=old_results)
 
         return {}
@@ -157,7 +180,7 @@ class LanguageCertificateAnalysisAssistant(DocumentDataAnalysisAssistant, Assist
                 genai_types.Part.from_text(text=json.dumps(language_tests_data)),
             ]
 
-            results = self.service.generate_text_content(prompt)
+            results = self.service.generate_text_content(prompt, use_cache=self.cache_responses)
             return self.response_builder(results=results, old_results=old_results)
 
         return {}
@@ -81,6 +81,34 @@ STAGE_CHOICES = [
 ]
 
 
+class ProfileAnnotationGroups(NamedTuple):
+    ACTIVITY = "activity"
+    COMPLETION = "completion"
+    STAGES = "stages"
+
+
+PROFILE_ANNOTATION_GROUPS = {
+    ProfileAnnotationGroups.ACTIVITY: [
+        ProfileAnnotationNames.AGE,
+        ProfileAnnotationNames.LAST_LOGIN,
+        ProfileAnnotationNames.DATE_JOINED,
+    ],
+    ProfileAnnotationGroups.COMPLETION: [ProfileAnnotationNames.IS_ORGANIZATION_MEMBER, *STAGE_ANNOTATIONS],
+    ProfileAnnotationGroups.STAGES: [
+        ProfileAnnotationNames.COMPLETED_STAGES,
+        ProfileAnnotationNames.INCOMPLETE_STAGES,
+        ProfileAnnotationNames.HAS_INCOMPLETE_STAGES,
+    ],
+}
+
+PROFILE_ANNOTATION_DEPENDENCIES = {
+    ProfileAnnotationNames.STAGE_DATA: STAGE_ANNOTATIONS,
+    ProfileAnnotationNames.COMPLETED_STAGES: [ProfileAnnotationNames.STAGE_DATA],
+    ProfileAnnotationNames.INCOMPLETE_STAGES: [ProfileAnnotationNames.STAGE_DATA],
+    ProfileAnnotationNames.HAS_INCOMPLETE_STAGES: [ProfileAnnotationNames.INCOMPLETE_STAGES],
+}
+
+
 def get_extended_blocklist():
     extended_blocklist = blocklist
     if (blocklist_path := Path(settings.BASE_DIR / "fixtures" / "blocklist_domains.json")).exists():
@@ -122,6 +150,19 @@ class VectorStores:
     )
 
 
+SKILL_MATCH_TOP_K = 5
+SKILL_MATCH_MIN_SIMILARITY = 0.3
+SKILL_MATCH_AUTO_ACCEPT_SIMILARITY = 0.9
+SKILL_EMBEDDING_INDEX_TTL = 60 * 60
+
+DOCUMENT_CONTEXT_KEY = "document"
+
+SEARCH_DOCUMENT_BATCH_SIZE = 1000
+SCORE_BATCH_SIZE = 1000
+PROFILE_EXPORT_TIMEOUT_SECONDS = 30 * 60
+VECTOR_SEARCH_LIMIT = 100
+
+
 class EmailConstants(NamedTuple):
     CALLBACK_URL_VARIABLE = "email_callback_url"
     RECEIVER_USER_TYPE_VARIABLE = "email_receiver_user_type"
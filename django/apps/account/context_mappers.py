@@ -23,7 +23,7 @@ class LatestJobPosition(ContextMapper):
     help = _("Latest Published Job Position Object")
 
     @classmethod
-    def map(cls, instance: Profile):
+    def get_latest_job_position(cls):
         return (
             OrganizationJobPosition.objects.filter(
                 **{
@@ -34,6 +34,14 @@ class LatestJobPosition(ContextMapper):
             .last()
         )
 
+    @classmethod
+    def map(cls, instance: Profile):
+        return cls.get_latest_job_position()
+
+    @classmethod
+    def map_many(cls, instances):
+        return [cls.get_latest_job_position()] * len(instances) if instances else []
+
 
 @register(Profile)
 class UserLastName(ContextMapper):
@@ -61,6 +69,7 @@ class CompletedStages(ContextMapper):
     help = _("A list of user's completed stages. The stage names are: %(stage_names)s") % {
         "stage_names": STAGE_ANNOTATIONS
     }
+    annotations = [ProfileAnnotationNames.COMPLETED_STAGES]
 
     @classmethod
     def map(cls, instance: Profile):
@@ -73,6 +82,7 @@ class IncompleteStages(ContextMapper):
     help = _("A list of user's incomplete stages. The stage names are: %(stage_names)s") % {
         "stage_names": STAGE_ANNOTATIONS
     }
+    annotations = [ProfileAnnotationNames.INCOMPLETE_STAGES]
 
     @classmethod
     def map(cls, instance: Profile):
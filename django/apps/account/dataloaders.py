@@ -0,0 +1,52 @@
+from collections import defaultdict
+from typing import Dict, Hashable, List, Tuple
+
+from common.dataloaders import DataLoader, RelatedObjectsLoader
+from common.utils import fj
+
+from django.db.models import Count, QuerySet
+from django.db.models.lookups import In
+
+from .models import (
+    JobPositionAssignment,
+    OrganizationEmployeeCooperation,
+    OrganizationJobPosition,
+)
+
+
+class JobPositionAssignmentsLoader(RelatedObjectsLoader):
+    related_field = JobPositionAssignment.job_position.field.name
+
+    def get_queryset(self) -> QuerySet[JobPositionAssignment]:
+        return JobPositionAssignment.objects.select_related(
+            fj(JobPositionAssignment.job_position, OrganizationJobPosition.organization)
+        ).order_by(JobPositionAssignment._meta.pk.attname)
+
+
+class JobPositionStatusCountsLoader(DataLoader):
+    """Number of assignments per status of each job position."""
+
+    def get_default(self) -> List[Tuple[str, int]]:
+        return []
+
+    def batch_load(self, keys: List[Hashable]) -> Dict[Hashable, List[Tuple[str, int]]]:
+        status_counts = (
+            JobPositionAssignment.objects.filter(**{fj(JobPositionAssignment.job_position, In.lookup_name): keys})
+            .values(JobPositionAssignment.job_position.field.attname, JobPositionAssignment.status.field.name)
+            .annotate(count=Count(JobPositionAssignment._meta.pk.attname))
+            .order_by()
+        )
+
+        results = defaultdict(list)
+        for item in status_counts:
+            results[item[JobPositionAssignment.job_position.field.attname]].append(
+                (item[JobPositionAssignment.status.field.name], item["count"])
+            )
+        return results
+
+
+class OrganizationEmployeeCooperationsLoader(RelatedObjectsLoader):
+    related_field = OrganizationEmployeeCooperation.employee.field.name
+
+    def get_queryset(self) -> QuerySet[OrganizationEmployeeCooperation]:
+        return OrganizationEmployeeCooperation.objects.order_by(OrganizationEmployeeCooperation._meta.pk.attname)
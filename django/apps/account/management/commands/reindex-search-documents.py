@@ -0,0 +1,11 @@
+from account.models import UserSearchDocument
+
+from django.core.management import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Rebuild the search documents of all users"
+
+    def handle(self, *args, **options):
+        UserSearchDocument.update_all()
+        self.stdout.write("[+] Search documents reindexed.", style_func=self.style.SUCCESS)
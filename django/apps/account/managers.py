@@ -1,7 +1,7 @@
-from typing import Optional
+from typing import Iterable, List, Optional, Set
 
 from common.db_functions import ArrayDifference, DateTimeAge, GetKeysByValue
-from common.utils import fj
+from common.utils import LOOKUP_SEP, fj
 
 from django.contrib.auth.models import UserManager as BaseUserManager
 from django.contrib.postgres.fields.array import ArrayLenTransform
@@ -15,6 +15,8 @@ from django.utils.translation import gettext_lazy as _
 from .choices import DefaultRoles
 from .constants import (
     ORGANIZATION_INVITATION_EXPIRY_DELTA,
+    PROFILE_ANNOTATION_DEPENDENCIES,
+    PROFILE_ANNOTATION_GROUPS,
     STAGE_ANNOTATIONS,
     STAGE_CHOICES,
     ProfileAnnotationNames,
@@ -43,7 +45,14 @@ class ProfileManager(models.Manager):
         )
 
 
-class FlexReportProfileManager(models.Manager):
+class FlexReportProfileQuerySet(models.QuerySet):
+    """
+    Profile queryset of the reports, whose annotations are added only when they are referenced.
+
+    Filters, orderings and selected values add the annotations (and their dependencies) they use,
+    report columns and campaign context mappers opt in with ``with_annotations``.
+    """
+
     def get_annotations_dict(self):
         from .models import (
             CanadaVisa,
@@ -234,8 +243,87 @@ class FlexReportProfileManager(models.Manager):
             ),
         }
 
-    def get_queryset(self):
-        return super().get_queryset().annotate(**self.get_annotations_dict())
+    def resolve_annotation_names(self, names: Iterable[str]) -> List[str]:
+        """Expand annotation groups and dependencies of ``names``, dependencies first."""
+
+        annotations = self.get_annotations_dict()
+        resolved = []
+
+        def visit(name):
+            if name in PROFILE_ANNOTATION_GROUPS:
+                for member in PROFILE_ANNOTATION_GROUPS[name]:
+                    visit(member)
+                return
+
+            if name not in annotations or name in resolved:
+                return
+
+            for dependency in PROFILE_ANNOTATION_DEPENDENCIES.get(name, []):
+                visit(dependency)
+            resolved.append(name)
+
+        for name in names:
+            visit(name)
+        return resolved
+
+    def with_annotations(self, *names: str):
+        """Annotate the queryset with the given annotations or annotation groups, unknown names are ignored."""
+
+        if not (names := [name for name in self.resolve_annotation_names(names) if name not in self.query.annotations]):
+            return self
+
+        annotations = self.get_annotations_dict()
+        return self.annotate(**{name: annotations[name] for name in names})
+
+    def with_all_annotations(self):
+        return self.with_annotations(*self.get_annotations_dict())
+
+    @classmethod
+    def get_referenced_names(cls, *lookups) -> Set[str]:
+        names = set()
+        for lookup in lookups:
+            if isinstance(lookup, models.Q):
+                names |= cls.get_referenced_names(
+                    *(child[0] if isinstance(child, tuple) else child for child in lookup.children)
+                )
+            elif isinstance(lookup, models.F):
+                names.add(lookup.name.split(LOOKUP_SEP, 1)[0])
+            elif isinstance(lookup, str):
+                names.add(lookup.lstrip("-").split(LOOKUP_SEP, 1)[0])
+        return names
+
+    def with_referenced_annotations(self, *lookups):
+        return self.with_annotations(*self.get_referenced_names(*lookups))
+
+    def filter(self, *args, **kwargs):
+        return super(FlexReportProfileQuerySet, self.with_referenced_annotations(*args, *kwargs)).filter(
+            *args, **kwargs
+        )
+
+    def exclude(self, *args, **kwargs):
+        return super(FlexReportProfileQuerySet, self.with_referenced_annotations(*args, *kwargs)).exclude(
+            *args, **kwargs
+        )
+
+    def order_by(self, *field_names):
+        return super(FlexReportProfileQuerySet, self.with_referenced_annotations(*field_names)).order_by(*field_names)
+
+    def values(self, *fields, **expressions):
+        return super(FlexReportProfileQuerySet, self.with_referenced_annotations(*fields)).values(
+            *fields, **expressions
+        )
+
+    def values_list(self, *fields, **kwargs):
+        return super(FlexReportProfileQuerySet, self.with_referenced_annotations(*fields)).values_list(
+            *fields, **kwargs
+        )
+
+    def none(self):
+        # flex_report discovers the filterable annotations from the annotations of an empty queryset
+        return super(FlexReportProfileQuerySet, self.with_all_annotations()).none()
+
+
+FlexReportProfileManager = models.Manager.from_queryset(FlexReportProfileQuerySet)
 
 
 class CertificateAndLicenseQueryset(models.QuerySet):
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.6 on 2026-10-18 10:30
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_account', '0101_certificateandlicense_certificate_title_gin_trgm_ops_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSearchDocument',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='User')),
+                ('document', django.contrib.postgres.search.SearchVectorField(blank=True, null=True, verbose_name='Document')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+            ],
+            options={
+                'verbose_name': 'User Search Document',
+                'verbose_name_plural': 'User Search Documents',
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['document'], name='user_search_document_gin')],
+            },
+        ),
+    ]
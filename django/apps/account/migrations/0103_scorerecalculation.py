@@ -0,0 +1,29 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_account', '0102_usersearchdocument'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreRecalculation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.CharField(max_length=64, verbose_name='Score Slug')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='score_recalculations', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Score Recalculation',
+                'verbose_name_plural': 'Score Recalculations',
+                'constraints': [models.UniqueConstraint(fields=('user', 'slug'), name='unique_score_recalculation')],
+            },
+        ),
+    ]
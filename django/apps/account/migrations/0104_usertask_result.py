@@ -0,0 +1,19 @@
+# Generated by Django 5.1.6 on 2026-10-18 14:02
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_account', '0103_scorerecalculation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usertask',
+            name='result',
+            field=models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True, verbose_name='Result'),
+        ),
+    ]
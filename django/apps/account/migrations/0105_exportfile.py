@@ -0,0 +1,29 @@
+# Generated by Django 5.1.6 on 2026-10-18 15:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_account', '0104_usertask_result'),
+        ('flex_blob', '0002_filemodel_uploaded_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportFile',
+            fields=[
+                ('filemodel_ptr', models.OneToOneField(auto_created=True, on_delete=django.db.models.deletion.CASCADE, parent_link=True, primary_key=True, serialize=False, to='flex_blob.filemodel')),
+                ('uploaded_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='export_files', to=settings.AUTH_USER_MODEL, verbose_name='Uploaded By')),
+            ],
+            options={
+                'verbose_name': 'Export File',
+                'verbose_name_plural': 'Export Files',
+            },
+            bases=('flex_blob.filemodel',),
+        ),
+    ]
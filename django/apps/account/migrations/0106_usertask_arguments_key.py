@@ -0,0 +1,28 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_account', '0105_exportfile'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='usertask',
+            name='unique_user_task_name_scheduled_or_in_progress',
+        ),
+        migrations.AddField(
+            model_name='usertask',
+            name='arguments_key',
+            field=models.CharField(blank=True, default='', max_length=64, verbose_name='Arguments Key'),
+        ),
+        migrations.AddConstraint(
+            model_name='usertask',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['scheduled', 'in_progress'])), fields=('user', 'task_name', 'arguments_key'), name='unique_user_task_name_scheduled_or_in_progress'),
+        ),
+    ]
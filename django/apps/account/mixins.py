@@ -73,6 +73,23 @@ class AccessRequiredMixin:
 class ObjectTypeAccessRequiredMixin(AccessRequiredMixin):
     fields_access = {}
 
+    @classmethod
+    def has_item_access(cls, access_slug, *args, **kwargs):
+        from .accesses import RequestAccessCache
+
+        if not (access_cache := RequestAccessCache.from_context(getattr(cls.get_info(*args), "context", None))):
+            return super().has_item_access(access_slug, *args, **kwargs)
+
+        has_access_kwargs = cls.get_has_access_kwargs(access_slug, *args, **kwargs)
+        if not (user := has_access_kwargs.get("user")):
+            return
+
+        return access_cache.get_or_set(
+            (access_slug, user.pk, access_cache.get_instance_key(has_access_kwargs.get("instance"))),
+            lambda: access_cache.user_has_access(user, access_slug)
+            and test_rule(access_slug, {**has_access_kwargs, "access_cache": access_cache}),
+        )
+
     @classmethod
     def resolver_wrapper(cls, accesses) -> Callable:
         def wrapper(resolver: Callable):
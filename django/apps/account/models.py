@@ -5,8 +5,9 @@ import random
 import re
 import string
 import uuid
+from itertools import batched
 from operator import attrgetter
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
 
 import jwt
 from cities_light.models import City, Country
@@ -50,15 +51,20 @@ from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.aggregates import StringAgg
 from django.contrib.postgres.fields import ArrayField, IntegerRangeField
 from django.contrib.postgres.indexes import GinIndex
 from django.contrib.postgres.lookups import Overlap
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.core import checks
 from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.core.files.uploadedfile import InMemoryUploadedFile
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models, transaction
+from django.db.models import F, Func, OuterRef, Subquery, Value
 from django.db.models.constraints import UniqueConstraint
+from django.db.models.functions import Cast, Coalesce
 from django.db.models.lookups import (
     Contains,
     Exact,
@@ -88,6 +94,7 @@ from .constants import (
     EARLY_USERS_COUNT,
     ORGANIZATION_PHONE_OTP_CACHE_KEY,
     ORGANIZATION_PHONE_OTP_EXPIRY,
+    SEARCH_DOCUMENT_BATCH_SIZE,
     SUPPORT_RECIPIENT_LIST,
     SUPPORT_TICKET_SUBJECT_TEMPLATE,
     FileSlugs,
@@ -354,6 +361,23 @@ class User(AbstractUser):
             ).exists()
         )
 
+    def get_access_slugs(self) -> Set[str]:
+        """All access slugs granted to the user by their profile role and organization membership roles."""
+        return {
+            slug
+            for path in (
+                fj(Profile.user.field.related_query_name(), Profile.role, Role.accesses, Access.slug),
+                fj(
+                    OrganizationMembership.user.field.related_query_name(),
+                    OrganizationMembership.role,
+                    Role.accesses,
+                    Access.slug,
+                ),
+            )
+            for slug in User.objects.filter(pk=self.pk).values_list(path, flat=True)
+            if slug
+        }
+
     def get_contacts_by_type(self, contact_type: Contact.Type, *, include_organization: bool = False) -> List[Contact]:
         profile_contacts = Contact.objects.filter(
             **{
@@ -1614,6 +1638,110 @@ class Resume(models.Model):
         return self.user.email
 
 
+class UserSearchDocument(models.Model):
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="search_document",
+        verbose_name=_("User"),
+    )
+    document = SearchVectorField(verbose_name=_("Document"), null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated At"))
+
+    class Meta:
+        verbose_name = _("User Search Document")
+        verbose_name_plural = _("User Search Documents")
+        indexes = [GinIndex(fields=["document"], name="user_search_document_gin")]
+
+    def __str__(self):
+        return str(self.user_id)
+
+    @staticmethod
+    def get_text_subquery(model: models.Model, user_lookup: str, field: str):
+        return Coalesce(
+            Subquery(
+                model.objects.filter(**{user_lookup: OuterRef(User._meta.pk.attname)})
+                .values(user_lookup)
+                .annotate(text=StringAgg(Cast(field, models.TextField()), delimiter=" "))
+                .values("text")[:1]
+            ),
+            Value(""),
+        )
+
+    @classmethod
+    def get_document_expression(cls) -> SearchVector:
+        profile_user = Profile.user.field.related_query_name()
+        documents = [
+            (Job, fj(Profile.interested_jobs.field.related_query_name(), Profile.user), fj(Job.title)),
+            (Education, fj(Education.user), fj(Education.field, Field.name)),
+            (Education, fj(Education.user), fj(Education.degree)),
+            (WorkExperience, fj(WorkExperience.user), fj(WorkExperience.job_title)),
+            (WorkExperience, fj(WorkExperience.user), fj(WorkExperience.grade)),
+            (WorkExperience, fj(WorkExperience.user), fj(WorkExperience.industry, Industry.title)),
+            (WorkExperience, fj(WorkExperience.user), fj(WorkExperience.skills)),
+            (CertificateAndLicense, fj(CertificateAndLicense.user), fj(CertificateAndLicense.title)),
+            (CertificateAndLicense, fj(CertificateAndLicense.user), fj(CertificateAndLicense.certificate_text)),
+        ]
+
+        return SearchVector(
+            *(cls.get_text_subquery(*document) for document in documents),
+            Func(
+                F(fj(profile_user, Profile.raw_skills)),
+                Value(" "),
+                function="array_to_string",
+                output_field=models.TextField(),
+            ),
+            Cast(F(fj(Resume.user.field.related_query_name(), Resume.resume_json)), models.TextField()),
+            weight="A",
+        )
+
+    @classmethod
+    def update_for_users(cls, user_ids):
+        documents = User.objects.filter(**{fj(User._meta.pk.attname, In.lookup_name): user_ids}).values_list(
+            User._meta.pk.attname,
+            cls.get_document_expression(),
+        )
+        cls.objects.bulk_create(
+            [cls(**{cls.user.field.attname: user_id, fj(cls.document): document}) for user_id, document in documents],
+            update_conflicts=True,
+            unique_fields=[fj(cls.user)],
+            update_fields=[fj(cls.document), fj(cls.updated_at)],
+        )
+
+    @classmethod
+    def update_all(cls):
+        user_ids = User.objects.order_by(User._meta.pk.attname).values_list(User._meta.pk.attname, flat=True)
+        for batch in batched(user_ids.iterator(chunk_size=SEARCH_DOCUMENT_BATCH_SIZE), SEARCH_DOCUMENT_BATCH_SIZE):
+            cls.update_for_users(batch)
+
+
+class ScoreRecalculation(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="score_recalculations",
+        verbose_name=_("User"),
+    )
+    slug = models.CharField(max_length=64, verbose_name=_("Score Slug"))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created At"))
+
+    class Meta:
+        verbose_name = _("Score Recalculation")
+        verbose_name_plural = _("Score Recalculations")
+        constraints = [models.UniqueConstraint(fields=["user", "slug"], name="unique_score_recalculation")]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.slug}"
+
+    @classmethod
+    def enqueue(cls, items: Iterable[Tuple[int, str]]):
+        cls.objects.bulk_create(
+            [cls(**{cls.user.field.attname: user_id, fj(cls.slug): slug}) for user_id, slug in items],
+            ignore_conflicts=True,
+        )
+
+
 class Referral(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="referral")
     code = models.CharField(max_length=20, unique=True, default=generate_unique_referral_code)
@@ -1736,14 +1864,19 @@ class UserTask(TimeStampedModel):
     )
     status = models.CharField(max_length=50, choices=Status.choices, blank=True, null=True, verbose_name=_("Status"))
     status_description = models.TextField(verbose_name=_("Status Description"), blank=True, null=True)
+    result = models.JSONField(encoder=DjangoJSONEncoder, blank=True, null=True, verbose_name=_("Result"))
+    # Runs of a task with other arguments (another document, a newer skill list) are separate tasks
+    arguments_key = models.CharField(max_length=64, blank=True, default="", verbose_name=_("Arguments Key"))
 
-    def change_status(self, status: str, description: str = None):
+    def change_status(self, status: str, description: str = None, result=None):
         self.status = status
         self.status_description = description
+        self.result = result
         self.save(
             update_fields=[
                 UserTask.status.field.name,
                 UserTask.status_description.field.name,
+                UserTask.result.field.name,
             ]
         )
 
@@ -1755,7 +1888,7 @@ class UserTask(TimeStampedModel):
         verbose_name_plural = _("User Tasks")
         constraints = [
             UniqueConstraint(
-                fields=["user", "task_name"],
+                fields=["user", "task_name", "arguments_key"],
                 condition=models.Q(
                     status__in=[
                         UserTaskStatus.SCHEDULED,
@@ -1768,6 +1901,24 @@ class UserTask(TimeStampedModel):
         ordering = ["-created", "task_name"]
 
 
+class ExportFile(BaseFileModel):
+    """Admin export written by a background task, it is not one of the file types users upload."""
+
+    uploaded_by = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="export_files", verbose_name=_("Uploaded By")
+    )
+
+    def check_auth(self, request):
+        return request.user == self.uploaded_by
+
+    def get_upload_path(self, filename):
+        return f"exports/{self.uploaded_by_id}/{filename}"
+
+    class Meta:
+        verbose_name = _("Export File")
+        verbose_name_plural = _("Export Files")
+
+
 class OrganizationLogoFile(UserUploadedImageFile):
     SLUG = FileSlugs.ORGANIZATION_LOGO.value
 
@@ -114,9 +114,11 @@ from .models import (
     WorkExperience,
 )
 from .tasks import (
+    analyze_document_async,
     get_certificate_text,
     send_email_async,
-    set_user_resume_json,
+    set_user_resume_json_async,
+    set_user_skills_async,
     user_task_runner,
 )
 from .types import (
@@ -134,11 +136,12 @@ from .types import (
     OrganizationType,
     ProfileType,
     UserNode,
+    UserTaskType,
     WorkExperienceAIType,
     WorkExperienceNode,
     WorkExperienceVerificationMethodType,
 )
-from .utils import analyze_document, normalize_analyze_document_output_value, set_user_skills
+from .utils import analyze_document, normalize_analyze_document_output_value
 from .validators import EmailCallbackURLValidator
 from .views import GoogleOAuth2View, LinkedInOAuth2View
 
@@ -772,20 +775,23 @@ class UserSetSkillsMutation(graphene.Mutation):
         should_analyze = graphene.Boolean(default_value=True)
 
     user = graphene.Field(UserNode)
+    task = graphene.Field(UserTaskType)
 
     @staticmethod
     def mutate(root, info, input, should_analyze):
         user: User = info.context.user
         profile = user.profile
-        profile.raw_skills = (skills := list(set(input.get("skills") or [])))
+        profile.raw_skills = (skills := sorted(set(input.get("skills") or [])))
         profile.save(update_fields=[Profile.raw_skills.field.name])
 
+        task = None
         if skills:
-            should_analyze and set_user_skills(user_id=user.id, raw_skills=skills)
+            if should_analyze:
+                task = user_task_runner(set_user_skills_async, task_user_id=user.id, user_id=user.id, raw_skills=skills)
         else:
             profile.skills.clear()
 
-        return UserSetSkillsMutation(user=user)
+        return UserSetSkillsMutation(user=user, task=task)
 
 
 @login_required
@@ -913,13 +919,19 @@ class BaseAnalyseAndExtractDataMutation(graphene.Mutation):
     is_valid = graphene.Boolean()
     data = graphene.Field(graphene.ObjectType)
     verification_method_data = graphene.Field(graphene.ObjectType)
+    task = graphene.Field(UserTaskType)
 
     FILE_MODEL_MAPPING = {}
     FILE_SLUG = None
 
     @classmethod
     def Field(cls, *args, **kwargs):
-        cls._meta.arguments.update({"file_id": NotEmptyID(required=True)})
+        cls._meta.arguments.update(
+            {
+                "file_id": NotEmptyID(required=True),
+                "background": graphene.Boolean(default_value=False),
+            }
+        )
         return super().Field(*args, **kwargs)
 
     class Meta:
@@ -940,7 +952,7 @@ class BaseAnalyseAndExtractDataMutation(graphene.Mutation):
 
     @classmethod
     @ratelimit(key="user", rate="4/m")
-    def mutate(cls, root, info, file_id, verification_type=None):
+    def mutate(cls, root, info, file_id, verification_type=None, background=False):
         file_model = cls.get_file_model(verification_type)
 
         if not (file_model and (obj := file_model.objects.filter(pk=file_id).first())):
@@ -950,7 +962,17 @@ class BaseAnalyseAndExtractDataMutation(graphene.Mutation):
             raise GraphQLErrorBadRequest(_("Permission denied."))
 
         info.context.model = file_model
-        response = analyze_document(obj.pk, verification_type.value if verification_type else cls.FILE_SLUG)
+        verification_method_name = verification_type.value if verification_type else cls.FILE_SLUG
+        if background:
+            task = user_task_runner(
+                analyze_document_async,
+                task_user_id=info.context.user.pk,
+                file_model_id=obj.pk,
+                verification_method_name=verification_method_name,
+            )
+            return cls(task=task)
+
+        response = analyze_document(obj.pk, verification_method_name)
         return cls(**cls.normalize_response(response))
 
 
@@ -1697,7 +1719,7 @@ class ResumeCreateMutation(FilePermissionMixin, DocumentCUDMixin, CRUDWithoutIDM
 
     @classmethod
     def after_mutate(cls, root, info, id, input, obj, return_data):
-        set_user_resume_json(user_id=obj.user_id)
+        user_task_runner(set_user_resume_json_async, task_user_id=obj.user_id, user_id=obj.user_id)
 
         return super().after_mutate(root, info, id, input, obj, return_data)
 
@@ -1,12 +1,16 @@
-import contextlib
-from typing import Dict
+from typing import ClassVar, Dict, Iterable, List, Tuple, Type
 
 from academy.models import CourseResult
+from common.batching import OnCommitBatch
 from criteria.models import JobAssessmentResult
-from flex_observer.types import register_observer
-from score.types import ScoreObserver
+from criteria.timeouts import job_assessment_results_timed_out
+from flex_observer.types import FieldsObserver, register_observer
+from score.types import Score, ScoreObserver
 
+from django.conf import settings
 from django.db.models import Model
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 
 from .models import (
     CanadaVisa,
@@ -16,7 +20,9 @@ from .models import (
     LanguageCertificate,
     Profile,
     Resume,
+    ScoreRecalculation,
     User,
+    UserSearchDocument,
     WorkExperience,
 )
 from .scores import (
@@ -43,7 +49,20 @@ from .scores import (
     VisaStatusScore,
     WorkExperienceNewScore,
     WorkExperienceVerificationScore,
+    recalculate_pending_scores,
 )
+from .tasks import recalculate_scores
+
+
+def queue_score_recalculations(items: Iterable[Tuple[int, str]]):
+    ScoreRecalculation.enqueue(items)
+    if getattr(settings, "SCORE_RECALCULATION_SYNC", False):
+        recalculate_pending_scores()
+    else:
+        recalculate_scores.delay()
+
+
+score_recalculations = OnCommitBatch(queue_score_recalculations)
 
 
 class BaseObserver[T: Model]:
@@ -52,15 +71,11 @@ class BaseObserver[T: Model]:
         return {"user": instance.user}
 
     @classmethod
-    def scores_calculated(cls, instance: T, scores_dict: Dict[str, int]):
+    def scores_changed(cls, instance: T, scores: List[Type[Score]]):
         user: User = cls.get_calculate_params(instance).get("user")
-        if not (profile := getattr(user, "profile", None)):
+        if not (user and user.pk):
             return
-        profile.scores.update(scores_dict)
-        profile.score = sum(profile.scores.values())
-
-        with contextlib.suppress(ValueError):
-            profile.save(update_fields=["score", "scores"])
+        score_recalculations.extend((user.pk, score.slug) for score in scores)
 
 
 @register_observer
@@ -150,7 +165,87 @@ class JobAssesmentResultObserver(BaseObserver, ScoreObserver):
     scores = [AssessmentScore, OptionalAssessmentScore]
 
 
+@receiver(job_assessment_results_timed_out)
+def job_assessment_results_timed_out_scores_changed(sender, user_ids, **kwargs):
+    score_recalculations.extend(
+        (user_id, score.slug) for user_id in user_ids for score in JobAssesmentResultObserver.scores
+    )
+
+
 @register_observer
 class CourseObserver(BaseObserver, ScoreObserver):
     _observed_model = CourseResult
     scores = [CourseGeneralScore]
+
+
+search_document_updates = OnCommitBatch(UserSearchDocument.update_for_users)
+
+
+class SearchDocumentObserver[T: Model](FieldsObserver):
+    observed_fields: ClassVar[List[str]]
+
+    @classmethod
+    def test_func(cls, instance: T):
+        return True
+
+    @classmethod
+    def get_observed_fields(cls):
+        return cls.observed_fields
+
+    @classmethod
+    def get_user_id(cls, instance: T) -> int:
+        return instance.user_id
+
+    @classmethod
+    def fields_changed(cls, changed_fields: List[str], instance: T, *args, **kwargs):
+        if changed_fields:
+            search_document_updates.add(cls.get_user_id(instance))
+
+
+@register_observer
+class ProfileSearchDocumentObserver(SearchDocumentObserver):
+    _observed_model = Profile
+    observed_fields = [Profile.raw_skills.field.name, Profile.interested_jobs.field.name]
+
+
+@register_observer
+class EducationSearchDocumentObserver(SearchDocumentObserver):
+    _observed_model = Education
+    observed_fields = [Education.id.field.name, Education.field.field.name, Education.degree.field.name]
+
+
+@register_observer
+class WorkExperienceSearchDocumentObserver(SearchDocumentObserver):
+    _observed_model = WorkExperience
+    observed_fields = [
+        WorkExperience.id.field.name,
+        WorkExperience.job_title.field.name,
+        WorkExperience.grade.field.name,
+        WorkExperience.industry.field.name,
+        WorkExperience.skills.field.name,
+    ]
+
+
+@register_observer
+class CertificateAndLicenseSearchDocumentObserver(SearchDocumentObserver):
+    _observed_model = CertificateAndLicense
+    observed_fields = [
+        CertificateAndLicense.id.field.name,
+        CertificateAndLicense.title.field.name,
+        CertificateAndLicense.certificate_text.field.name,
+    ]
+
+
+@register_observer
+class ResumeSearchDocumentObserver(SearchDocumentObserver):
+    _observed_model = Resume
+    observed_fields = [Resume.id.field.name, Resume.resume_json.field.name]
+
+
+@receiver(post_delete, sender=Education)
+@receiver(post_delete, sender=WorkExperience)
+@receiver(post_delete, sender=CertificateAndLicense)
+@receiver(post_delete, sender=Resume)
+def search_document_source_deleted(sender, instance, **kwargs):
+    # Field observers only see saves, the removed text is dropped from the document here
+    search_document_updates.add(instance.user_id)
@@ -1,20 +1,32 @@
 import contextlib
 import datetime
 import math
-from typing import ClassVar
+from collections import defaultdict
+from itertools import batched
+from typing import ClassVar, Dict, List, Optional, Set, Tuple
 
 from academy.models import CourseResult
 from common.utils import fj
-from criteria.models import JobAssessment, JobAssessmentResult
+from criteria.models import JobAssessment, JobAssessmentJob, JobAssessmentResult
 from pydantic import BaseModel
-from score.types import ExistingScore, Score, ScorePack
+from score.types import ExistingScore, Score, ScorePack, ScoreRegistry
 from score.utils import register_pack, register_score
 
-from django.db.models import Case, Count, DurationField, ExpressionWrapper, F, Sum, When
+from django.db import transaction
+from django.db.models import (
+    Case,
+    Count,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    QuerySet,
+    Sum,
+    When,
+)
 from django.db.models.functions import Now
 from django.db.models.lookups import In, IsNull
 
-from .constants import EARLY_USERS_COUNT
+from .constants import EARLY_USERS_COUNT, SCORE_BATCH_SIZE
 from .models import (
     CanadaVisa,
     CertificateAndLicense,
@@ -24,6 +36,7 @@ from .models import (
     LanguageCertificate,
     Profile,
     Resume,
+    ScoreRecalculation,
     User,
     WorkExperience,
 )
@@ -66,6 +79,69 @@ JOB_ASSESSMENT_SCORES_PERCENTAGE = {
 }
 
 
+def existing_for_users(queryset: QuerySet, user_lookup: str, user_ids: List[int], value: int) -> Dict[int, int]:
+    existing = set(
+        queryset.filter(**{fj(user_lookup, In.lookup_name): user_ids}).values_list(user_lookup, flat=True).distinct()
+    )
+    return {user_id: value if user_id in existing else 0 for user_id in user_ids}
+
+
+def count_for_users(queryset: QuerySet, user_lookup: str, user_ids: List[int], value: int) -> Dict[int, int]:
+    counts = dict(
+        queryset.filter(**{fj(user_lookup, In.lookup_name): user_ids})
+        .order_by()
+        .values(user_lookup)
+        .annotate(count=Count(queryset.model._meta.pk.attname))
+        .values_list(user_lookup, "count")
+    )
+    return {user_id: counts.get(user_id, 0) * value for user_id in user_ids}
+
+
+def get_user_job_assessments(user_ids: List[int]) -> Dict[int, Tuple[Set[int], Set[int]]]:
+    """Map each user with interested jobs to the ids of their required and optional job assessments."""
+
+    interested_jobs = defaultdict(set)
+    for user_id, job_id in Profile.objects.filter(
+        **{
+            fj(Profile.user, In.lookup_name): user_ids,
+            fj(Profile.interested_jobs, IsNull.lookup_name): False,
+        }
+    ).values_list(fj(Profile.user), fj(Profile.interested_jobs)):
+        interested_jobs[user_id].add(job_id)
+
+    if not interested_jobs:
+        return {}
+
+    required_by_job = defaultdict(set)
+    for job_id, job_assessment_id in JobAssessmentJob.objects.filter(
+        **{fj(JobAssessmentJob.required): True}
+    ).values_list(fj(JobAssessmentJob.job), fj(JobAssessmentJob.job_assessment)):
+        required_by_job[job_id].add(job_assessment_id)
+
+    job_assessments = dict(
+        JobAssessment.objects.values_list(JobAssessment._meta.pk.attname, fj(JobAssessment.required))
+    )
+    always_required = {pk for pk, required in job_assessments.items() if required}
+
+    user_job_assessments = {}
+    for user_id, job_ids in interested_jobs.items():
+        required = always_required.union(*(required_by_job[job_id] for job_id in job_ids))
+        user_job_assessments[user_id] = (required, set(job_assessments) - required)
+    return user_job_assessments
+
+
+def get_completed_assessment_results(user_ids: List[int]) -> Dict[int, List[Tuple[int, Optional[str]]]]:
+    results = defaultdict(list)
+    for user_id, job_assessment_id, score in JobAssessmentResult.objects.filter(
+        **{
+            fj(JobAssessmentResult.user, In.lookup_name): user_ids,
+            fj(JobAssessmentResult.status): JobAssessmentResult.Status.COMPLETED,
+        }
+    ).values_list(fj(JobAssessmentResult.user), fj(JobAssessmentResult.job_assessment), fj(JobAssessmentResult.score)):
+        results[user_id].append((job_assessment_id, score))
+    return results
+
+
 class UserFieldExistingScore(ExistingScore):
     user_field: ClassVar[str]
     score = Scores.ID_INFORMATION.value
@@ -77,6 +153,13 @@ class UserFieldExistingScore(ExistingScore):
     def get_value(self, user):
         return getattr(user, self.user_field)
 
+    def get_values(self, user_ids):
+        return dict(
+            User.objects.filter(**{fj(User._meta.pk.attname, In.lookup_name): user_ids}).values_list(
+                User._meta.pk.attname, self.user_field
+            )
+        )
+
 
 class ProfileFieldScore(UserFieldExistingScore):
     profile_field: ClassVar[str]
@@ -88,6 +171,13 @@ class ProfileFieldScore(UserFieldExistingScore):
     def get_value(self, user):
         return getattr(user.profile, self.profile_field)
 
+    def get_values(self, user_ids):
+        return dict(
+            Profile.objects.filter(**{fj(Profile.user, In.lookup_name): user_ids}).values_list(
+                fj(Profile.user), self.profile_field
+            )
+        )
+
 
 @register_score
 class UploadResumeScore(Score):
@@ -98,6 +188,9 @@ class UploadResumeScore(Score):
     def calculate(self, user) -> int:
         return Scores.UPLOAD_RESUME.value if Resume.objects.filter(**{fj(Resume.user): user}).exists() else 0
 
+    def calculate_many(self, user_ids) -> Dict[int, int]:
+        return existing_for_users(Resume.objects.all(), fj(Resume.user), user_ids, Scores.UPLOAD_RESUME.value)
+
 
 @register_score
 class FirstNameScore(UserFieldExistingScore):
@@ -132,6 +225,9 @@ class EarlyUsersScore(Score):
     def calculate(self, user) -> int:
         return Scores.EARLY_USERS.value
 
+    def calculate_many(self, user_ids) -> Dict[int, int]:
+        return {user_id: Scores.EARLY_USERS.value for user_id in user_ids}
+
 
 @register_score
 class EmailScore(UserFieldExistingScore):
@@ -150,22 +246,23 @@ class MobileScore(Score):
         with contextlib.suppress(Contactable.DoesNotExist):
             return instance.type == Contact.Type.PHONE and hasattr(instance.contactable, "profile")
 
+    user_lookup: ClassVar[str] = fj(Contact.contactable, Profile.contactable.field.related_query_name(), Profile.user)
+
     def calculate(self, user) -> int:
         return (
             Scores.CONTACT_INFORMATION.value
-            if Contact.objects.filter(
-                **{
-                    fj(
-                        Contact.contactable,
-                        Profile.contactable.field.related_query_name(),
-                        Profile.user,
-                    ): user,
-                    fj(Contact.type): Contact.Type.PHONE,
-                }
-            ).exists()
+            if Contact.objects.filter(**{self.user_lookup: user, fj(Contact.type): Contact.Type.PHONE}).exists()
             else 0
         )
 
+    def calculate_many(self, user_ids) -> Dict[int, int]:
+        return existing_for_users(
+            Contact.objects.filter(**{fj(Contact.type): Contact.Type.PHONE}),
+            self.user_lookup,
+            user_ids,
+            Scores.CONTACT_INFORMATION.value,
+        )
+
 
 @register_score
 class GenderScore(ProfileFieldScore):
@@ -208,6 +305,9 @@ class EducationNewScore(Score):
     def calculate(self, user) -> int:
         return Scores.EDUCATION_ADD.value if Education.objects.filter(**{fj(Education.user): user}).exists() else 0
 
+    def calculate_many(self, user_ids) -> Dict[int, int]:
+        return existing_for_users(Education.objects.all(), fj(Education.user), user_ids, Scores.EDUCATION_ADD.value)
+
 
 @register_score
 class EducationVerificationScore(Score):
@@ -218,15 +318,21 @@ class EducationVerificationScore(Score):
     def test_func(cls, instance: Education):
         return instance.status in Education.get_verified_statuses()
 
+    def get_queryset(self):
+        return Education.objects.filter(**{fj(Education.status, In.lookup_name): Education.get_verified_statuses()})
+
     def calculate(self, user) -> int:
         return (
             Scores.EDUCATION_VERIFICATION.value
-            if Education.objects.filter(
-                **{fj(Education.user): user, fj(Education.status): Education.get_verified_statuses()}
-            ).exists()
+            if self.get_queryset().filter(**{fj(Education.user): user}).exists()
             else 0
         )
 
+    def calculate_many(self, user_ids) -> Dict[int, int]:
+        return existing_for_users(
+            self.get_queryset(), fj(Education.user), user_ids, Scores.EDUCATION_VERIFICATION.value
+        )
+
 
 @register_score
 class WorkExperienceNewScore(Score):
@@ -238,27 +344,45 @@ class WorkExperienceNewScore(Score):
     ]
     slug = "work_experience_new"
 
-    def calculate(self, user) -> int:
-        years = (
-            WorkExperience.objects.filter(**{fj(WorkExperience.user): user})
-            .annotate(
-                duration_years=ExpressionWrapper(
-                    (
-                        Case(
-                            When(**{fj(WorkExperience.end, IsNull.lookup_name): True}, then=Now()),
-                            default=F(WorkExperience.end.field.name),
-                        )
-                        - F(WorkExperience.start.field.name)
-                    ),
-                    output_field=DurationField(),
-                )
+    def get_queryset(self):
+        return WorkExperience.objects.annotate(
+            duration_years=ExpressionWrapper(
+                (
+                    Case(
+                        When(**{fj(WorkExperience.end, IsNull.lookup_name): True}, then=Now()),
+                        default=F(WorkExperience.end.field.name),
+                    )
+                    - F(WorkExperience.start.field.name)
+                ),
+                output_field=DurationField(),
             )
-            .aggregate(days=Sum(ExpressionWrapper(F("duration_years"), output_field=DurationField())))["days"]
-            or datetime.timedelta()
-        ).days / 365.25
+        )
 
+    def get_total_duration(self):
+        return Sum(ExpressionWrapper(F("duration_years"), output_field=DurationField()))
+
+    def get_value(self, duration: Optional[datetime.timedelta]) -> int:
+        years = (duration or datetime.timedelta()).days / 365.25
         return int(math.ceil(years * 2) / 2) * Scores.WORK_EXPERIENCE_ADD.value
 
+    def calculate(self, user) -> int:
+        return self.get_value(
+            self.get_queryset()
+            .filter(**{fj(WorkExperience.user): user})
+            .aggregate(days=self.get_total_duration())["days"]
+        )
+
+    def calculate_many(self, user_ids) -> Dict[int, int]:
+        durations = dict(
+            self.get_queryset()
+            .filter(**{fj(WorkExperience.user, In.lookup_name): user_ids})
+            .order_by()
+            .values(fj(WorkExperience.user))
+            .annotate(days=self.get_total_duration())
+            .values_list(fj(WorkExperience.user), "days")
+        )
+        return {user_id: self.get_value(durations.get(user_id)) for user_id in user_ids}
+
 
 @register_score
 class WorkExperienceVerificationScore(Score):
@@ -269,17 +393,22 @@ class WorkExperienceVerificationScore(Score):
     def test_func(self, instance: WorkExperience):
         return instance.status in WorkExperience.get_verified_statuses()
 
+    def get_queryset(self):
+        return WorkExperience.objects.filter(
+            **{fj(WorkExperience.status, In.lookup_name): WorkExperience.get_verified_statuses()}
+        )
+
     def calculate(self, user) -> int:
         return (
-            WorkExperience.objects.filter(
-                **{
-                    fj(WorkExperience.user): user,
-                    fj(WorkExperience.status, In.lookup_name): WorkExperience.get_verified_statuses(),
-                }
-            ).count()
+            self.get_queryset().filter(**{fj(WorkExperience.user): user}).count()
             * Scores.WORK_EXPERIENCE_VERIFICATION.value
         )
 
+    def calculate_many(self, user_ids) -> Dict[int, int]:
+        return count_for_users(
+            self.get_queryset(), fj(WorkExperience.user), user_ids, Scores.WORK_EXPERIENCE_VERIFICATION.value
+        )
+
 
 @register_score
 class LanguageScore(Score):
@@ -293,6 +422,11 @@ class LanguageScore(Score):
             else 0
         )
 
+    def calculate_many(self, user_ids) -> Dict[int, int]:
+        return existing_for_users(
+            LanguageCertificate.objects.all(), fj(LanguageCertificate.user), user_ids, Scores.LANGUAGE_ADD.value
+        )
+
 
 @register_score
 class CertificationScore(Score):
@@ -306,6 +440,14 @@ class CertificationScore(Score):
             else 0
         )
 
+    def calculate_many(self, user_ids) -> Dict[int, int]:
+        return existing_for_users(
+            CertificateAndLicense.objects.all(),
+            fj(CertificateAndLicense.user),
+            user_ids,
+            Scores.CERTIFICATION_ADD.value,
+        )
+
 
 @register_score
 class SkillScore(Score):
@@ -315,6 +457,14 @@ class SkillScore(Score):
     def calculate(self, user) -> int:
         return Scores.SKILL_ADD.value if user.profile.skills.exists() else 0
 
+    def calculate_many(self, user_ids) -> Dict[int, int]:
+        return existing_for_users(
+            Profile.objects.filter(**{fj(Profile.skills, IsNull.lookup_name): False}),
+            fj(Profile.user),
+            user_ids,
+            Scores.SKILL_ADD.value,
+        )
+
 
 @register_score
 class VisaStatusScore(Score):
@@ -324,6 +474,9 @@ class VisaStatusScore(Score):
     def calculate(self, user) -> int:
         return Scores.VISA_STATUS.value if CanadaVisa.objects.filter(**{fj(CanadaVisa.user): user}).exists() else 0
 
+    def calculate_many(self, user_ids) -> Dict[int, int]:
+        return existing_for_users(CanadaVisa.objects.all(), fj(CanadaVisa.user), user_ids, Scores.VISA_STATUS.value)
+
 
 @register_score
 class JobInterestScore(Score):
@@ -333,6 +486,14 @@ class JobInterestScore(Score):
     def calculate(self, user) -> int:
         return Scores.JOB_INTEREST.value if user.profile.interested_jobs.exists() else 0
 
+    def calculate_many(self, user_ids) -> Dict[int, int]:
+        return existing_for_users(
+            Profile.objects.filter(**{fj(Profile.interested_jobs, IsNull.lookup_name): False}),
+            fj(Profile.user),
+            user_ids,
+            Scores.JOB_INTEREST.value,
+        )
+
 
 @register_score
 class AssessmentScore(Score):
@@ -355,20 +516,38 @@ class AssessmentScore(Score):
             .annotate(count=Count(fj(JobAssessmentResult.job_assessment), distinct=True))
         )
 
-        if not scores:
+        return self.get_value({score[fj(JobAssessmentResult.score)]: score["count"] for score in scores})
+
+    def get_value(self, counts: Dict[Optional[str], int]) -> int:
+        if not counts:
             return 0
 
-        total_scores = Scores.ASSESSMENT.value / sum(score["count"] for score in scores)
+        total_scores = Scores.ASSESSMENT.value / sum(counts.values())
 
         return int(
             sum(
-                JOB_ASSESSMENT_SCORES_PERCENTAGE.get(score[fj(JobAssessmentResult.score)], 0)
-                * total_scores
-                * score["count"]
-                for score in scores
+                JOB_ASSESSMENT_SCORES_PERCENTAGE.get(score, 0) * total_scores * count for score, count in counts.items()
             )
         )
 
+    def calculate_many(self, user_ids) -> Dict[int, int]:
+        user_job_assessments = get_user_job_assessments(user_ids)
+        results = get_completed_assessment_results(list(user_job_assessments))
+
+        values = {}
+        for user_id in user_ids:
+            if user_id not in user_job_assessments:
+                values[user_id] = 0
+                continue
+
+            required, _ = user_job_assessments[user_id]
+            job_assessments = defaultdict(set)
+            for job_assessment_id, score in results[user_id]:
+                if job_assessment_id in required:
+                    job_assessments[score].add(job_assessment_id)
+            values[user_id] = self.get_value({score: len(ids) for score, ids in job_assessments.items()})
+        return values
+
 
 @register_score
 class OptionalAssessmentScore(Score):
@@ -391,6 +570,18 @@ class OptionalAssessmentScore(Score):
             * Scores.ASSESSMENT_ADD.value
         )
 
+    def calculate_many(self, user_ids) -> Dict[int, int]:
+        user_job_assessments = get_user_job_assessments(user_ids)
+        results = get_completed_assessment_results(list(user_job_assessments))
+
+        values = {user_id: 0 for user_id in user_ids}
+        for user_id, (_, optional) in user_job_assessments.items():
+            values[user_id] = (
+                sum(job_assessment_id in optional for job_assessment_id, _ in results[user_id])
+                * Scores.ASSESSMENT_ADD.value
+            )
+        return values
+
 
 @register_score
 class CourseGeneralScore(Score):
@@ -408,6 +599,14 @@ class CourseGeneralScore(Score):
             * Scores.COURSE_GENERAL.value
         )
 
+    def calculate_many(self, user_ids) -> Dict[int, int]:
+        return count_for_users(
+            CourseResult.objects.filter(**{fj(CourseResult.status): CourseResult.Status.COMPLETED}),
+            fj(CourseResult.user),
+            user_ids,
+            Scores.COURSE_GENERAL.value,
+        )
+
 
 @register_pack
 class UserScorePack(ScorePack):
@@ -436,3 +635,56 @@ class UserScorePack(ScorePack):
         OptionalAssessmentScore,
         CourseGeneralScore,
     ]
+
+    @classmethod
+    def update_profiles(cls, profiles: QuerySet[Profile]):
+        for batch in batched(profiles, SCORE_BATCH_SIZE):
+            scores = cls.calculate_many(profile.user_id for profile in batch)
+            for profile in batch:
+                profile.scores = scores[profile.user_id]
+                profile.score = sum(profile.scores.values())
+
+            Profile.objects.bulk_update(batch, fields=[Profile.scores.field.name, Profile.score.field.name])
+
+
+def update_profile_scores(user_ids_by_slug: Dict[str, Set[int]]):
+    """Recalculate only the given scores of the given users and merge them into their profiles."""
+
+    user_scores = defaultdict(dict)
+    for slug, user_ids in user_ids_by_slug.items():
+        if not (score := ScoreRegistry.scores.get(slug)):
+            continue
+        for user_id, value in score().calculate_many(list(user_ids)).items():
+            user_scores[user_id][slug] = value
+
+    profiles = list(Profile.objects.select_for_update().filter(**{fj(Profile.user, In.lookup_name): list(user_scores)}))
+    for profile in profiles:
+        profile.scores.update(user_scores[profile.user_id])
+        profile.score = sum(profile.scores.values())
+
+    Profile.objects.bulk_update(profiles, fields=[Profile.scores.field.name, Profile.score.field.name])
+
+
+def recalculate_pending_scores():
+    while True:
+        with transaction.atomic():
+            pending = list(
+                ScoreRecalculation.objects.select_for_update(skip_locked=True)
+                .order_by(ScoreRecalculation._meta.pk.attname)
+                .values_list(
+                    ScoreRecalculation._meta.pk.attname,
+                    fj(ScoreRecalculation.user),
+                    fj(ScoreRecalculation.slug),
+                )[:SCORE_BATCH_SIZE]
+            )
+            if not pending:
+                return
+
+            ScoreRecalculation.objects.filter(
+                **{fj(ScoreRecalculation._meta.pk.attname, In.lookup_name): [pk for pk, _, _ in pending]}
+            ).delete()
+
+            user_ids_by_slug = defaultdict(set)
+            for _, user_id, slug in pending:
+                user_ids_by_slug[slug].add(user_id)
+            update_profile_scores(user_ids_by_slug)
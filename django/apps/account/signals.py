@@ -8,6 +8,7 @@ from django.dispatch import receiver
 
 from .constants import VectorStores
 from .models import Contactable, Organization, Profile, Referral, SupportTicket, User
+from .skill_index import embedding_skill_index
 
 
 @receiver(post_save, sender=SupportTicket)
@@ -49,4 +50,14 @@ def skills_clear_cache(*args, **kwargs):
     cache.delete(VectorStores.SKILL.cache_key)
 
 
+@receiver(post_save, sender=Skill)
+def skills_update_embedding_index(instance, **kwargs):
+    embedding_skill_index.upsert(instance)
+
+
+@receiver(post_delete, sender=Skill)
+def skills_remove_from_embedding_index(instance, **kwargs):
+    embedding_skill_index.remove(instance)
+
+
 FieldsObserverRegistry.register_all()
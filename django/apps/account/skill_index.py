@@ -0,0 +1,191 @@
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from common.logging import get_logger
+from common.models import Skill
+from common.utils import fj
+from pydantic import BaseModel
+
+from django.conf import settings
+from django.contrib.postgres.lookups import TrigramSimilar
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db.models.lookups import GreaterThan
+
+from .constants import (
+    SKILL_EMBEDDING_INDEX_TTL,
+    SKILL_MATCH_MIN_SIMILARITY,
+    SKILL_MATCH_TOP_K,
+)
+
+logger = get_logger()
+
+
+class SkillCandidate(BaseModel):
+    pk: int
+    title: str
+    similarity: float
+
+
+class TrigramSkillIndex:
+    """Nearest existing skills by pg_trgm similarity, served by the skill title GIN index."""
+
+    @classmethod
+    def search(cls, raw_skill: str, top_k: int) -> List[SkillCandidate]:
+        skills = (
+            Skill.objects.filter(**{fj(Skill.title, TrigramSimilar.lookup_name): raw_skill})
+            .annotate(similarity=TrigramSimilarity(fj(Skill.title), raw_skill))
+            .order_by("-similarity")
+            .values_list(Skill._meta.pk.attname, fj(Skill.title), "similarity")[:top_k]
+        )
+        return [SkillCandidate(pk=pk, title=title, similarity=similarity) for pk, title, similarity in skills]
+
+
+class EmbeddingSkillIndex:
+    """
+    In-process embedding index over the skill titles.
+
+    The index is loaded lazily, kept up to date by the Skill signals of this process, picks up skills
+    inserted by other processes through their increasing primary keys and is fully rebuilt every
+    ``SKILL_EMBEDDING_INDEX_TTL`` seconds to catch remote edits and deletions.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.pks: List[int] = []
+        self.titles: List[str] = []
+        self.embeddings = None
+        self.built_at: Optional[float] = None
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return getattr(settings, "SKILL_EMBEDDING_INDEX_ENABLED", False)
+
+    @staticmethod
+    def get_model():
+        from ai.utils import load_skill_standardizer
+
+        return load_skill_standardizer()[1]
+
+    def encode(self, texts: List[str]):
+        import numpy as np
+
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        return self.get_model().encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+
+    def rebuild(self):
+        import numpy as np
+
+        with self.lock:
+            skills = list(
+                Skill.objects.order_by(Skill._meta.pk.attname).values_list(Skill._meta.pk.attname, fj(Skill.title))
+            )
+            self.pks = [pk for pk, _ in skills]
+            self.titles = [title for _, title in skills]
+            self.embeddings = self.encode(self.titles) if skills else np.zeros((0, 0), dtype=np.float32)
+            self.built_at = time.monotonic()
+            logger.info(f"Skill embedding index rebuilt with {len(self.pks)} skills.")
+
+    def sync(self):
+        import numpy as np
+
+        with self.lock:
+            if self.built_at is None or time.monotonic() - self.built_at > SKILL_EMBEDDING_INDEX_TTL:
+                return self.rebuild()
+
+            new_skills = list(
+                Skill.objects.filter(**{fj(Skill._meta.pk.attname, GreaterThan.lookup_name): max(self.pks, default=0)})
+                .order_by(Skill._meta.pk.attname)
+                .values_list(Skill._meta.pk.attname, fj(Skill.title))
+            )
+            if not new_skills:
+                return
+
+            new_embeddings = self.encode([title for _, title in new_skills])
+            self.embeddings = np.vstack([self.embeddings, new_embeddings]) if self.pks else new_embeddings
+            self.pks.extend(pk for pk, _ in new_skills)
+            self.titles.extend(title for _, title in new_skills)
+
+    def upsert(self, skill: Skill):
+        import numpy as np
+
+        with self.lock:
+            if self.built_at is None:
+                return
+
+            embedding = self.encode([skill.title])
+            if skill.pk in self.pks:
+                index = self.pks.index(skill.pk)
+                self.titles[index] = skill.title
+                self.embeddings[index] = embedding[0]
+                return
+
+            self.embeddings = np.vstack([self.embeddings, embedding]) if self.pks else embedding
+            self.pks.append(skill.pk)
+            self.titles.append(skill.title)
+
+    def remove(self, skill: Skill):
+        import numpy as np
+
+        with self.lock:
+            if self.built_at is None or skill.pk not in self.pks:
+                return
+
+            index = self.pks.index(skill.pk)
+            self.embeddings = np.delete(self.embeddings, index, axis=0)
+            del self.pks[index]
+            del self.titles[index]
+
+    def search_many(self, raw_skills: List[str], top_k: int) -> Dict[str, List[SkillCandidate]]:
+        import numpy as np
+
+        with self.lock:
+            self.sync()
+            if not (self.pks and raw_skills):
+                return {}
+
+            similarities = self.encode(raw_skills) @ self.embeddings.T
+            top_k = min(top_k, len(self.pks))
+            top_indices = np.argsort(-similarities, axis=1)[:, :top_k]
+
+            return {
+                raw_skill: [
+                    SkillCandidate(pk=self.pks[index], title=self.titles[index], similarity=float(row[index]))
+                    for index in indices
+                    if row[index] >= SKILL_MATCH_MIN_SIMILARITY
+                ]
+                for raw_skill, row, indices in zip(raw_skills, similarities, top_indices)
+            }
+
+
+embedding_skill_index = EmbeddingSkillIndex()
+
+
+def find_skill_candidates(raw_skills: List[str], top_k: int = SKILL_MATCH_TOP_K) -> Dict[str, List[SkillCandidate]]:
+    """Return the ``top_k`` nearest existing skills for each raw skill, best match first."""
+
+    candidates: Dict[str, Dict[int, SkillCandidate]] = defaultdict(dict)
+
+    for raw_skill in raw_skills:
+        for candidate in TrigramSkillIndex.search(raw_skill, top_k):
+            candidates[raw_skill][candidate.pk] = candidate
+
+    if EmbeddingSkillIndex.is_enabled():
+        try:
+            embedding_candidates = embedding_skill_index.search_many(raw_skills, top_k)
+        except Exception as e:
+            logger.warning(f"Skill embedding index search failed: {e}")
+            embedding_candidates = {}
+
+        for raw_skill, skill_candidates in embedding_candidates.items():
+            for candidate in skill_candidates:
+                current = candidates[raw_skill].get(candidate.pk)
+                if not current or current.similarity < candidate.similarity:
+                    candidates[raw_skill][candidate.pk] = candidate
+
+    return {
+        raw_skill: sorted(candidates[raw_skill].values(), key=lambda candidate: -candidate.similarity)[:top_k]
+        for raw_skill in raw_skills
+    }
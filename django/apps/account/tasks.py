@@ -1,9 +1,13 @@
+import hashlib
+import json
 import os
+import tempfile
 import traceback
 from datetime import timedelta
 from functools import wraps
-from typing import Any, Callable, Dict, List, Protocol, Tuple
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple
 
+from common.exports import write_xlsx
 from common.logging import get_logger
 from common.utils import fj
 from config.settings.subscriptions import AccountSubscription
@@ -17,16 +21,21 @@ from notification.senders import NotificationContext, send_notifications
 
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
+from django.core.files import File
 from django.core.mail import EmailMessage
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db.models.lookups import In, IsNull, LessThanOrEqual
 from django.utils import timezone
 
+from .constants import PROFILE_EXPORT_TIMEOUT_SECONDS
 from .typing import ResumeJson
 from .utils import (
+    analyze_document,
     extract_certificate_text_content,
     extract_resume_json,
     set_contacts_from_resume_json,
     set_profile_from_resume_json,
+    set_user_skills,
 )
 
 logger = get_logger()
@@ -63,11 +72,29 @@ def clean_revoked_tokens():
     ).delete()
 
 
+@register_task([AccountSubscription.DAILY_EXECUTION], schedule={"schedule": "0 3 * * *"})
+def reindex_search_documents():
+    from .models import UserSearchDocument
+
+    UserSearchDocument.update_all()
+
+
+@register_task([AccountSubscription.SCORES])
+def recalculate_scores():
+    from .scores import recalculate_pending_scores
+
+    recalculate_pending_scores()
+
+
 class Task(Protocol):
     @classmethod
     def delay(cls, *args: Tuple[Any], **kwargs: Dict[str, Any]): ...
 
 
+def get_task_arguments_key(args: Tuple[Any], kwargs: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps([args, kwargs], sort_keys=True, cls=DjangoJSONEncoder).encode()).hexdigest()
+
+
 def user_task_decorator(timeout_seconds: int) -> Callable:
     def wrapper(func: Callable):
         task_name = func.__name__
@@ -77,11 +104,16 @@ def user_task_decorator(timeout_seconds: int) -> Callable:
             from .models import User, UserTask
 
             task_user_id = kwargs.pop("task_user_id", None)
+            arguments_key = get_task_arguments_key(args, kwargs)
             if not (user := get_user_model().objects.filter(**{User._meta.pk.attname: task_user_id}).first()):
                 logger.info(f"Running task {task_name}: user {task_user_id} not found.")
                 (
                     user_task := UserTask.objects.filter(
-                        **{UserTask.user.field.attname: task_user_id, fj(UserTask.task_name): task_name}
+                        **{
+                            UserTask.user.field.attname: task_user_id,
+                            fj(UserTask.task_name): task_name,
+                            fj(UserTask.arguments_key): arguments_key,
+                        }
                     ).latest(UserTask.created)
                 ) and user_task.change_status(UserTask.Status.FAILED, "User not found.")
                 return
@@ -93,7 +125,7 @@ def user_task_decorator(timeout_seconds: int) -> Callable:
                         UserTask.Status.SCHEDULED,
                     ]
                 }
-            ).get_or_create(user=user, task_name=task_name)[0]
+            ).get_or_create(user=user, task_name=task_name, arguments_key=arguments_key)[0]
             if user_task.status == UserTask.Status.IN_PROGRESS:
                 logger.info(f"Running task {task_name}: task {user_task.pk} is already in progress.")
                 return
@@ -101,8 +133,8 @@ def user_task_decorator(timeout_seconds: int) -> Callable:
             user_task.change_status(UserTask.Status.IN_PROGRESS)
 
             try:
-                func_timeout(timeout_seconds, func, args=args, kwargs=kwargs)
-                user_task.change_status(UserTask.Status.COMPLETED)
+                result = func_timeout(timeout_seconds, func, args=args, kwargs=kwargs)
+                user_task.change_status(UserTask.Status.COMPLETED, result=result)
 
             except FunctionTimedOut:
                 user_task.change_status(
@@ -125,6 +157,7 @@ def user_task_runner(task: Task, task_user_id: int, *args, **kwargs):
     from .models import UserTask
 
     task_name = task.name
+    arguments_key = get_task_arguments_key(args, kwargs)
     user_task, *_ = UserTask.objects.filter(
         **{
             fj(UserTask.status, In.lookup_name): [
@@ -135,16 +168,19 @@ def user_task_runner(task: Task, task_user_id: int, *args, **kwargs):
     ).get_or_create(
         user_id=task_user_id,
         task_name=task_name,
+        arguments_key=arguments_key,
     )
 
-    if cache.get(cache_key := f"task_{task_name}_{task_user_id}_scheduled"):
-        return
+    if cache.get(cache_key := f"task_{task_name}_{task_user_id}_{arguments_key}_scheduled"):
+        return user_task
 
     if user_task.status not in [UserTask.Status.IN_PROGRESS, UserTask.Status.SCHEDULED]:
         cache.set(cache_key, (task, task_user_id, args, kwargs), timeout=5)
         task.delay(*args, task_user_id=task_user_id, **kwargs)
         user_task.change_status(UserTask.Status.SCHEDULED)
 
+    return user_task
+
 
 @register_task([AccountSubscription.ASSISTANTS])
 @user_task_decorator(timeout_seconds=120)
@@ -187,6 +223,52 @@ def set_user_resume_json(user_id: str) -> bool:
     return True
 
 
+@register_task([AccountSubscription.ASSISTANTS])
+@user_task_decorator(timeout_seconds=120)
+def set_user_resume_json_async(user_id: int) -> bool:
+    return set_user_resume_json(user_id=user_id)
+
+
+@register_task([AccountSubscription.ASSISTANTS])
+@user_task_decorator(timeout_seconds=120)
+def set_user_skills_async(user_id: int, raw_skills: List[str]) -> bool:
+    from .models import Profile
+
+    if not Profile.objects.filter(**{Profile.user.field.attname: user_id, fj(Profile.raw_skills): raw_skills}).exists():
+        # The skills were edited again, the task of the latest edit sets them
+        return False
+    return set_user_skills(user_id=user_id, raw_skills=raw_skills)
+
+
+@register_task([AccountSubscription.ASSISTANTS])
+@user_task_decorator(timeout_seconds=120)
+def analyze_document_async(file_model_id: int, verification_method_name: str) -> dict:
+    return analyze_document(file_model_id, verification_method_name).model_dump(mode="json")
+
+
+@register_task([AccountSubscription.EXPORTS])
+@user_task_decorator(timeout_seconds=PROFILE_EXPORT_TIMEOUT_SECONDS)
+def export_profiles_async(user_id: int, profile_ids: List[int], export_fields: Optional[List[str]] = None) -> dict:
+    from .admin.resources import ProfileResource
+    from .models import ExportFile, Profile
+
+    queryset = Profile.objects.filter(**{fj(Profile._meta.pk.attname, In.lookup_name): profile_ids}).order_by(
+        Profile._meta.pk.attname
+    )
+    rows = ProfileResource().iter_export_rows(queryset, export_fields, force_native_type=True)
+
+    with tempfile.TemporaryFile() as file:
+        write_xlsx(rows, file)
+        export_file = ExportFile.objects.create(
+            **{
+                ExportFile.uploaded_by.field.attname: user_id,
+                fj(ExportFile.file): File(file, name=f"profiles-{timezone.now():%Y-%m-%d-%H%M%S}.xlsx"),
+            }
+        )
+
+    return {"file_id": export_file.pk, "url": export_file.file.url}
+
+
 @register_task([AccountSubscription.EMAILING])
 def send_email_async_non_existing_user(recipient_list, from_email, subject, content, file_model_ids: List[int] = []):
     email = EmailMessage(
@@ -1,6 +1,49 @@
+import json
+import time
+from datetime import date
+from unittest import mock
+
+from common.models import Skill
+from config.settings.constants import Assistants
 from graphene_django.utils.testing import GraphQLTestCase
+from graphql_jwt.testcases import JSONWebTokenTestCase
 
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchQuery
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from .accesses import JobPositionContainer
+from .admin.resources import ProfileResource
+from .assistant_test import KeywordClueWord, vector_search
+from .constants import (
+    SKILL_MATCH_TOP_K,
+    ProfileAnnotationGroups,
+    ProfileAnnotationNames,
+)
+from .models import (
+    Access,
+    CanadaVisa,
+    CertificateAndLicense,
+    Contact,
+    Contactable,
+    Education,
+    JobPositionAssignment,
+    Organization,
+    OrganizationJobPosition,
+    OrganizationMembership,
+    Profile,
+    Role,
+    ScoreRecalculation,
+    User,
+    UserSearchDocument,
+    UserTask,
+    WorkExperience,
+)
+from .scores import Scores, UserScorePack, update_profile_scores
+from .tasks import set_user_skills_async
+from .utils import extract_or_create_skills
 
 
 class AuthTestCase(GraphQLTestCase):
@@ -239,3 +282,479 @@ class AccountTestCase(GraphQLTestCase):
         self.assertEqual(
             response["data"]["account"]["profile"]["update"]["profile"]["fullBodyImage"], variables["fullBodyImage"]
         )
+
+
+class ExtractOrCreateSkillsTestCase(TestCase):
+    def setUp(self):
+        self.python = Skill.objects.create(title="Python")
+        self.django = Skill.objects.create(title="Django")
+        Skill.objects.bulk_create([Skill(title=f"Unrelated Skill {index}") for index in range(100)])
+
+    def run_extraction(self, related_skills, skill_response=None):
+        messages = {
+            Assistants.FIND_RELATIVE_SKILLS: json.dumps(related_skills),
+            Assistants.SKILL: json.dumps(skill_response or {"matched_skills": [], "new_skills": []}),
+        }
+        prompts = {}
+
+        def google_services(slug):
+            service = mock.Mock()
+
+            def generate_text_content(contents):
+                prompts[slug] = [part.text for part in contents]
+                return messages[slug]
+
+            service.generate_text_content.side_effect = generate_text_content
+            return service
+
+        with mock.patch("account.utils.GoogleServices") as services_mock:
+            services_mock.side_effect = google_services
+            services_mock.message_to_json.side_effect = json.loads
+            skills = extract_or_create_skills(["raw"], {})
+
+        return skills, prompts
+
+    def test_confident_matches_skip_llm(self):
+        skills, prompts = self.run_extraction(["python", "Django"])
+
+        self.assertNotIn(Assistants.SKILL, prompts)
+        self.assertSetEqual(set(skills), {self.python, self.django})
+
+    def test_llm_receives_only_shortlist(self):
+        skills, prompts = self.run_extraction(
+            ["Pythonn"],
+            {"matched_skills": [{"pk": self.python.pk, "title": self.python.title}], "new_skills": ["Rust"]},
+        )
+
+        shortlist = json.loads(prompts[Assistants.SKILL][1])
+        self.assertLessEqual(len(shortlist), SKILL_MATCH_TOP_K)
+        self.assertIn(self.python.pk, [skill["id"] for skill in shortlist])
+        self.assertSetEqual({skill.title for skill in skills}, {"Python", "Rust"})
+
+
+class UserScorePackTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        users = User.objects.bulk_create(
+            [
+                User(
+                    email=f"user{index}@example.com",
+                    username=f"user{index}",
+                    first_name="First" if index % 2 else "",
+                    last_name="Last" if index % 3 else "",
+                )
+                for index in range(1000)
+            ]
+        )
+        Profile.objects.bulk_create(
+            [
+                Profile(user=user, gender=Profile.Gender.MALE if index % 5 == 0 else None)
+                for index, user in enumerate(users)
+            ]
+        )
+        cls.user_ids = [user.pk for user in users]
+
+    def test_calculate_many_uses_constant_queries(self):
+        with CaptureQueriesContext(connection) as single_user:
+            UserScorePack.calculate_many(self.user_ids[:1])
+
+        with CaptureQueriesContext(connection) as all_users:
+            UserScorePack.calculate_many(self.user_ids)
+
+        self.assertEqual(len(single_user), len(all_users))
+
+    def test_calculate_many_matches_calculate(self):
+        user_ids = self.user_ids[:30]
+        scores = UserScorePack.calculate_many(user_ids)
+
+        for user in User.objects.filter(pk__in=user_ids):
+            self.assertDictEqual(scores[user.pk], UserScorePack.calculate(user))
+
+    def test_update_profiles(self):
+        UserScorePack.update_profiles(Profile.objects.filter(user_id__in=self.user_ids[:10]))
+
+        for profile in Profile.objects.filter(user_id__in=self.user_ids[:10]).select_related("user"):
+            self.assertDictEqual(profile.scores, UserScorePack.calculate(profile.user))
+            self.assertEqual(profile.score, sum(profile.scores.values()))
+
+
+class FlexReportProfileQuerySetTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        users = User.objects.bulk_create(
+            [User(email=f"report{index}@example.com", username=f"report{index}") for index in range(10)]
+        )
+        Profile.objects.bulk_create(
+            [Profile(user=user, gender=Profile.Gender.MALE if index % 2 else None) for index, user in enumerate(users)]
+        )
+
+    def test_filter_only_computes_referenced_annotations(self):
+        queryset = Profile.flex_report_custom_manager.filter(**{ProfileAnnotationNames.HAS_PROFILE_INFORMATION: True})
+        plan = queryset.explain()
+
+        for model in (Education, WorkExperience, CertificateAndLicense, CanadaVisa, OrganizationMembership):
+            self.assertNotIn(model._meta.db_table, plan)
+        self.assertListEqual(list(queryset.query.annotations), [ProfileAnnotationNames.HAS_PROFILE_INFORMATION])
+        self.assertEqual(queryset.count(), 5)
+
+    def test_unfiltered_queryset_has_no_annotations(self):
+        queryset = Profile.flex_report_custom_manager.all()
+
+        self.assertDictEqual(queryset.query.annotations, {})
+        self.assertNotIn(Education._meta.db_table, queryset.explain())
+
+    def test_dependencies_are_annotated(self):
+        queryset = Profile.flex_report_custom_manager.filter(**{ProfileAnnotationNames.HAS_INCOMPLETE_STAGES: True})
+
+        self.assertListEqual(
+            list(queryset.query.annotations)[-4:],
+            [
+                ProfileAnnotationNames.HAS_INTERESTED_JOBS,
+                ProfileAnnotationNames.STAGE_DATA,
+                ProfileAnnotationNames.INCOMPLETE_STAGES,
+                ProfileAnnotationNames.HAS_INCOMPLETE_STAGES,
+            ],
+        )
+        self.assertIn(Education._meta.db_table, queryset.explain())
+        self.assertEqual(queryset.count(), 10)
+
+    def test_with_annotations(self):
+        profile = (
+            Profile.flex_report_custom_manager.with_annotations(ProfileAnnotationGroups.STAGES)
+            .filter(gender=Profile.Gender.MALE)
+            .first()
+        )
+
+        self.assertIn(ProfileAnnotationNames.HAS_PROFILE_INFORMATION, profile.completed_stages)
+        self.assertIn(ProfileAnnotationNames.HAS_EDUCATION, profile.incomplete_stages)
+        self.assertFalse(hasattr(profile, ProfileAnnotationNames.AGE))
+
+    def test_none_exposes_all_annotations(self):
+        self.assertSetEqual(
+            set(Profile.flex_report_custom_manager.none().query.annotations),
+            set(Profile.flex_report_custom_manager.get_annotations_dict()),
+        )
+
+
+class ProfileExportTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        users = User.objects.bulk_create(
+            [User(email=f"export{index}@example.com", username=f"export{index}") for index in range(40)]
+        )
+        contactables = Contactable.objects.bulk_create([Contactable() for _ in users])
+        Contact.objects.bulk_create(
+            [
+                Contact(contactable=contactable, type=Contact.Type.PHONE, value="+14155552671")
+                for contactable in contactables
+            ]
+        )
+        profiles = Profile.objects.bulk_create(
+            [Profile(user=user, contactable=contactable) for user, contactable in zip(users, contactables)]
+        )
+        cls.profile_ids = sorted(profile.pk for profile in profiles)
+
+    def count_export_queries(self, count):
+        with CaptureQueriesContext(connection) as queries:
+            ProfileResource().export(Profile.objects.filter(pk__in=self.profile_ids[:count]))
+        return len(queries)
+
+    def test_export_queries_are_constant_per_chunk(self):
+        with mock.patch.object(ProfileResource, "get_chunk_size", return_value=10):
+            one_chunk = self.count_export_queries(10)
+            two_chunks = self.count_export_queries(20)
+            four_chunks = self.count_export_queries(40)
+
+        self.assertEqual(self.count_export_queries(1), self.count_export_queries(40))
+        self.assertEqual(four_chunks - one_chunk, 3 * (two_chunks - one_chunk))
+
+    def test_iter_export_rows(self):
+        rows = list(
+            ProfileResource().iter_export_rows(
+                Profile.objects.filter(pk__in=self.profile_ids).order_by("pk"),
+                ["email", "phone_number", "has_education"],
+            )
+        )
+
+        self.assertListEqual(rows[0], ["Email", "Phone Number", "Has Education"])
+        self.assertEqual(len(rows), 41)
+        self.assertListEqual(rows[1], ["export0@example.com", "+14155552671", "×"])
+
+
+@override_settings(SCORE_RECALCULATION_SYNC=True)
+class ScoreRecalculationTestCase(TestCase):
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user = get_user_model().objects.create_user(
+                email="scores@example.com", username="scores", first_name="", last_name=""
+            )
+
+    def test_scores_are_recalculated_once_per_transaction(self):
+        with (
+            mock.patch("account.scores.update_profile_scores", wraps=update_profile_scores) as update_mock,
+            CaptureQueriesContext(connection) as queries,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            self.user.first_name = "First"
+            self.user.save()
+            self.user.last_name = "Last"
+            self.user.save()
+            profile = Profile.objects.get(user=self.user)
+            profile.gender = Profile.Gender.MALE
+            profile.save()
+
+        self.assertEqual(update_mock.call_count, 1)
+        self.assertSetEqual(set().union(*update_mock.call_args.args[0].values()), {self.user.pk})
+
+        score_updates = [
+            query
+            for query in queries
+            if query["sql"].startswith(f'UPDATE "{Profile._meta.db_table}"') and "CASE WHEN" in query["sql"]
+        ]
+        self.assertEqual(len(score_updates), 1)
+
+        profile.refresh_from_db()
+        self.assertEqual(profile.scores["first_name"], Scores.ID_INFORMATION.value)
+        self.assertEqual(profile.scores["last_name"], Scores.ID_INFORMATION.value)
+        self.assertEqual(profile.scores["gender"], Scores.ID_INFORMATION.value)
+        self.assertFalse(ScoreRecalculation.objects.exists())
+
+
+class UserSearchDocumentTestCase(TestCase):
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.users = [
+                get_user_model().objects.create_user(
+                    email=f"search{index}@example.com", username=f"search{index}", first_name="", last_name=""
+                )
+                for index in range(3)
+            ]
+
+    def set_raw_skills(self, user: User, raw_skills: list):
+        profile = Profile.objects.get(user=user)
+        profile.raw_skills = raw_skills
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.save()
+
+    def matches(self, user: User, term: str) -> bool:
+        return UserSearchDocument.objects.filter(user=user, document=SearchQuery(term)).exists()
+
+    def test_documents_follow_saves_and_deletes(self):
+        user = self.users[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            certificate = CertificateAndLicense.objects.create(
+                user=user, title="Kubernetes Administrator", certifier="CNCF", issued_at=date(2024, 1, 1)
+            )
+        self.assertTrue(self.matches(user, "kubernetes"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            certificate.delete()
+        self.assertFalse(self.matches(user, "kubernetes"))
+
+    def test_update_all_indexes_every_user(self):
+        self.set_raw_skills(self.users[1], ["Haskell"])
+        UserSearchDocument.objects.all().delete()
+
+        UserSearchDocument.update_all()
+
+        self.assertEqual(UserSearchDocument.objects.count(), User.objects.count())
+        self.assertTrue(self.matches(self.users[1], "haskell"))
+
+    def test_vector_search_ranks_users_by_matched_terms(self):
+        self.set_raw_skills(self.users[0], ["Python"])
+        self.set_raw_skills(self.users[1], ["Python", "Django"])
+        self.set_raw_skills(self.users[2], ["Django"])
+
+        users = vector_search(KeywordClueWord(keywords=[["python"]], clue_words=["django"]))
+
+        self.assertListEqual(list(users), [self.users[1], self.users[0]])
+
+
+class BackgroundAssistantTasksTestCase(JSONWebTokenTestCase):
+    llm_latency = 1
+    set_skills_mutation = """
+    mutation SetSkills($skills: [String]!) {
+        account {
+            profile {
+                setSkills(input: {skills: $skills}) {
+                    task {
+                        id
+                    }
+                }
+            }
+        }
+    }
+    """
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="tasks@example.com", username="tasks", first_name="", last_name=""
+        )
+        self.client.authenticate(self.user)
+        self.python = Skill.objects.create(title="Python")
+        self.queue = []
+
+        for patcher in (
+            mock.patch.object(set_user_skills_async, "delay", side_effect=self.publish(set_user_skills_async)),
+            mock.patch(
+                "account.tasks.func_timeout", side_effect=lambda timeout, func, args, kwargs: func(*args, **kwargs)
+            ),
+            mock.patch("account.utils.extract_or_create_skills", side_effect=self.extract_or_create_skills),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def publish(self, task):
+        return lambda *args, **kwargs: self.queue.append((task, args, kwargs))
+
+    def extract_or_create_skills(self, *args, **kwargs):
+        time.sleep(self.llm_latency)
+        return [self.python]
+
+    def run_queue(self):
+        while self.queue:
+            task, args, kwargs = self.queue.pop(0)
+            task(*args, **kwargs)
+
+    def test_set_skills_returns_before_the_assistants_run(self):
+        started = time.perf_counter()
+        response = self.client.execute(self.set_skills_mutation, {"skills": ["python"]})
+        elapsed = time.perf_counter() - started
+
+        self.assertIsNone(response.errors)
+        self.assertLess(elapsed, self.llm_latency)
+        user_task = UserTask.objects.get(user=self.user, task_name=set_user_skills_async.__name__)
+        self.assertEqual(user_task.status, UserTask.Status.SCHEDULED)
+        self.assertEqual(response.data["account"]["profile"]["setSkills"]["task"]["id"], str(user_task.pk))
+        self.assertFalse(self.user.profile.skills.exists())
+
+        self.run_queue()
+
+        user_task.refresh_from_db()
+        self.assertEqual(user_task.status, UserTask.Status.COMPLETED)
+        self.assertEqual(list(self.user.profile.skills.all()), [self.python])
+
+    def test_set_skills_again_schedules_the_latest_skills(self):
+        self.client.execute(self.set_skills_mutation, {"skills": ["python"]})
+        self.client.execute(self.set_skills_mutation, {"skills": ["python"]})
+        self.client.execute(self.set_skills_mutation, {"skills": ["python", "django"]})
+
+        first_task, latest_task = UserTask.objects.filter(
+            user=self.user, task_name=set_user_skills_async.__name__
+        ).order_by(UserTask._meta.pk.attname)
+        self.assertEqual(len(self.queue), 2)
+
+        with mock.patch("account.utils.extract_or_create_skills", side_effect=self.extract_or_create_skills) as extract:
+            self.run_queue()
+
+        first_task.refresh_from_db()
+        latest_task.refresh_from_db()
+        self.assertEqual((first_task.status, first_task.result), (UserTask.Status.COMPLETED, False))
+        self.assertEqual((latest_task.status, latest_task.result), (UserTask.Status.COMPLETED, True))
+        self.assertEqual(extract.call_args.args[0], ["django", "python"])
+
+
+class OrganizationJobPositionQueryTestCase(JSONWebTokenTestCase):
+    job_positions_query = """
+    query JobPositions($first: Int) {
+        organization {
+            jobPosition {
+                list(first: $first) {
+                    edges {
+                        node {
+                            title
+                            status
+                            vaccancy
+                            startAt
+                            validityDate
+                            description
+                            contractType
+                            locationType
+                            paymentTerm
+                            jobRestrictions
+                        }
+                    }
+                }
+            }
+        }
+    }
+    """
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="organization@example.com", username="organization", first_name="", last_name=""
+        )
+        role = Role.objects.create(slug="test-job-position-admin")
+        role.accesses.set(
+            [Access.objects.get_or_create(slug=access.slug)[0] for access in JobPositionContainer.get_accesses()]
+        )
+        self.organization = Organization.objects.create(
+            name="Organization", user=self.user, status=Organization.get_verified_statuses()[0]
+        )
+        OrganizationMembership.objects.create(user=self.user, organization=self.organization, role=role)
+        OrganizationJobPosition.objects.bulk_create(
+            [OrganizationJobPosition(organization=self.organization, title=f"Job {index}") for index in range(20)]
+        )
+        self.client.authenticate(self.user)
+
+    job_positions_with_assignments_query = """
+    query JobPositions($first: Int) {
+        organization {
+            jobPosition {
+                list(first: $first) {
+                    edges {
+                        node {
+                            title
+                            report {
+                                assignmentStatusCounts {
+                                    status
+                                    count
+                                }
+                            }
+                            assignments {
+                                status
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+    """
+
+    def count_queries(self, query, first):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.execute(query, {"first": first})
+
+        self.assertIsNone(response.errors)
+        self.assertEqual(len(response.data["organization"]["jobPosition"]["list"]["edges"]), first)
+        return len(queries), response.data
+
+    def assertQueryCountIndependentOfPageSize(self, query):
+        self.assertEqual(self.count_queries(query, 2)[0], self.count_queries(query, 20)[0])
+
+    def test_access_checks_do_not_scale_with_page_size(self):
+        self.assertQueryCountIndependentOfPageSize(self.job_positions_query)
+
+    def test_assignments_are_loaded_in_batches(self):
+        job_seekers = User.objects.bulk_create(
+            [User(email=f"seeker{index}@example.com", username=f"seeker{index}") for index in range(3)]
+        )
+        statuses = [JobPositionAssignment.Status.NOT_REVIEWED, JobPositionAssignment.Status.ACCEPTED]
+        JobPositionAssignment.objects.bulk_create(
+            [
+                JobPositionAssignment(job_position=job_position, job_seeker=job_seeker, status=statuses[index % 2])
+                for job_position in OrganizationJobPosition.objects.all()
+                for index, job_seeker in enumerate(job_seekers)
+            ]
+        )
+
+        self.assertQueryCountIndependentOfPageSize(self.job_positions_with_assignments_query)
+
+        _, data = self.count_queries(self.job_positions_with_assignments_query, 1)
+        node = data["organization"]["jobPosition"]["list"]["edges"][0]["node"]
+        self.assertCountEqual(
+            node["report"]["assignmentStatusCounts"],
+            [{"status": "NOT_REVIEWED", "count": 2}, {"status": "ACCEPTED", "count": 1}],
+        )
+        self.assertEqual(len(node["assignments"]), 3)
@@ -4,6 +4,7 @@ from operator import itemgetter
 import graphene
 from academy.mixins import CourseUserContextMixin
 from academy.types import CourseNode, CourseResultType
+from common.dataloaders import BatchLoadedConnection
 from common.decorators import login_required
 from common.mixins import ArrayChoiceTypeMixin
 from common.models import (
@@ -42,7 +43,6 @@ from notification.models import InAppNotification
 from django.contrib.contenttypes.models import ContentType
 from django.db.models import (
     Case,
-    Count,
     IntegerField,
     OuterRef,
     Q,
@@ -60,6 +60,11 @@ from django.db.models.lookups import (
 )
 
 from .accesses import JobPositionContainer, OrganizationMembershipContainer
+from .dataloaders import (
+    JobPositionAssignmentsLoader,
+    JobPositionStatusCountsLoader,
+    OrganizationEmployeeCooperationsLoader,
+)
 from .filterset import JobPositionAssignmentFilterset, OrganizationEmployeeFilterset
 from .mixins import (
     CooperationContextMixin,
@@ -899,8 +904,10 @@ class UserTaskType(DjangoObjectType):
     class Meta:
         model = UserTask
         fields = (
+            UserTask._meta.pk.attname,
             UserTask.task_name.field.name,
             UserTask.status.field.name,
+            UserTask.result.field.name,
         )
 
 
@@ -1042,17 +1049,9 @@ class OrganizationJobPositionReportType(graphene.ObjectType):
     assignment_status_counts = graphene.List(JobPositionAssignmentStatusCountType)
 
     def resolve_assignment_status_counts(self, info, **kwargs):
-        status_counts = (
-            JobPositionAssignment.objects.filter(**{fj(JobPositionAssignment.job_position): self})
-            .values(
-                JobPositionAssignment.status.field.name,
-            )
-            .annotate(count=Count(JobPositionAssignment.status.field.name))
-        )
-
         return [
-            JobPositionAssignmentStatusCountType(status=item["status"].upper(), count=item["count"])
-            for item in status_counts
+            JobPositionAssignmentStatusCountType(status=status.upper(), count=count)
+            for status, count in JobPositionStatusCountsLoader.for_context(info.context).load(self.pk)
         ]
 
 
@@ -1110,6 +1109,7 @@ class OrganizationJobPositionNode(ObjectTypeAccessRequiredMixin, ArrayChoiceType
     fields_access = {
         "__all__": JobPositionContainer.get_accesses(),
     }
+    batch_loaders = (JobPositionAssignmentsLoader, JobPositionStatusCountsLoader)
     age_range = graphene.List(graphene.Int)
     salary_range = graphene.List(graphene.Int)
     work_experience_years_range = graphene.List(graphene.Int)
@@ -1132,7 +1132,7 @@ class OrganizationJobPositionNode(ObjectTypeAccessRequiredMixin, ArrayChoiceType
     class Meta:
         model = OrganizationJobPosition
         use_connection = True
-        connection_class = CountableConnection
+        connection_class = BatchLoadedConnection
         fields = (
             OrganizationJobPosition.id.field.name,
             OrganizationJobPosition.title.field.name,
@@ -1200,20 +1200,24 @@ class OrganizationJobPositionNode(ObjectTypeAccessRequiredMixin, ArrayChoiceType
         return self.is_editable
 
     def resolve_assignments(self, info):
-        return self.assignments.all()
+        return JobPositionAssignmentsLoader.for_context(info.context).load(self.pk)
 
     @classmethod
     def get_queryset(cls, queryset: QuerySet[OrganizationJobPosition], info):
         user = info.context.user
-        return queryset.filter(
-            **{
-                fj(
-                    OrganizationJobPosition.organization,
-                    OrganizationMembership.organization.field.related_query_name(),
-                    OrganizationMembership.user,
-                ): user
-            }
-        ).order_by("-id")
+        return (
+            queryset.filter(
+                **{
+                    fj(
+                        OrganizationJobPosition.organization,
+                        OrganizationMembership.organization.field.related_query_name(),
+                        OrganizationMembership.user,
+                    ): user
+                }
+            )
+            .select_related(OrganizationJobPosition.organization.field.name)
+            .order_by("-id")
+        )
 
 
 class JobSeekerJobPositionType(DjangoObjectType):
@@ -1499,9 +1503,12 @@ class OrganizationEmployeeNode(ArrayChoiceTypeMixin, DjangoObjectType):
     employee = graphene.Field(EmployeeType)
     cooperations = graphene.List(OrganizationEmployeeCooperationType)
 
+    batch_loaders = (OrganizationEmployeeCooperationsLoader,)
+
     class Meta:
         model = OrganizationEmployee
         use_connection = True
+        connection_class = BatchLoadedConnection
         fields = (OrganizationEmployee.id.field.name,)
         filterset_class = OrganizationEmployeeFilterset
 
@@ -1509,13 +1516,14 @@ class OrganizationEmployeeNode(ArrayChoiceTypeMixin, DjangoObjectType):
         return self.user
 
     def resolve_cooperations(self, info):
-        return self.cooperations.all()
+        return OrganizationEmployeeCooperationsLoader.for_context(info.context).load(self.pk)
 
     @classmethod
     def get_queryset(cls, queryset: QuerySet[OrganizationEmployee], info):
         user = info.context.user
         return (
-            queryset.filter(
+            queryset.select_related(OrganizationEmployee.user.field.name)
+            .filter(
                 **{
                     fj(
                         OrganizationEmployee.organization,
@@ -8,6 +8,7 @@ from typing import List, Literal, Optional
 
 import pydantic
 from ai.assistants import AssistantPipeline
+from ai.extraction import FileDocument
 from ai.google import GoogleServices
 from cities_light.models import City, Country
 from common.models import LanguageProficiencyTest, Skill, University
@@ -28,7 +29,12 @@ from .assistants import (
     DocumentValidationAssistant,
     LanguageCertificateAnalysisAssistant,
 )
-from .constants import FileSlugs, VectorStores
+from .constants import (
+    DOCUMENT_CONTEXT_KEY,
+    SKILL_MATCH_AUTO_ACCEPT_SIMILARITY,
+    FileSlugs,
+)
+from .skill_index import find_skill_candidates
 from .typing import (
     AnalysisResponse,
     ResumeJson,
@@ -130,7 +136,8 @@ def analyze_document(
     else:
         assistants.append(DocumentDataAnalysisAssistant().build(verification_method_name=verification_method_name))
 
-    results = AssistantPipeline(*assistants).run()
+    context = {DOCUMENT_CONTEXT_KEY: FileDocument.from_file_model(file_model_id)}
+    results = AssistantPipeline(*assistants, context=context).run()
 
     with contextlib.suppress(pydantic.ValidationError):
         return AnalysisResponse.model_validate(defaultdict(list, results))
@@ -309,33 +316,48 @@ def extract_or_create_skills(raw_skills: List[str], resume_json, **additional_in
     )
 
     if related_skills_message and (related_skills := GoogleServices.message_to_json(related_skills_message)):
-        get_or_create_skills_message = GoogleServices(Assistants.SKILL).generate_text_content(
-            [
-                types.Part.from_text(text=json.dumps(related_skills)),
-                types.Part.from_text(text=json.dumps(VectorStores.SKILL.data_fn())),
-            ]
-        )
-
-        if get_or_create_skills_message:
-            get_or_create_skills = GoogleServices.message_to_json(get_or_create_skills_message)
-            existing_skill_matches, new_skill_matches = (
-                get_or_create_skills.get("matched_skills", []),
-                get_or_create_skills.get("new_skills", []),
+        skill_candidates = find_skill_candidates(related_skills)
+
+        existing_skill_ids, unmatched_skills = [], []
+        for raw_skill in related_skills:
+            candidates = skill_candidates.get(raw_skill)
+            if candidates and candidates[0].similarity >= SKILL_MATCH_AUTO_ACCEPT_SIMILARITY:
+                existing_skill_ids.append(candidates[0].pk)
+            else:
+                unmatched_skills.append(raw_skill)
+
+        new_skill_matches = []
+        if unmatched_skills:
+            shortlist = {
+                candidate.pk: {Skill._meta.pk.attname: candidate.pk, fj(Skill.title): candidate.title}
+                for raw_skill in unmatched_skills
+                for candidate in skill_candidates.get(raw_skill, [])
+            }
+            get_or_create_skills_message = GoogleServices(Assistants.SKILL).generate_text_content(
+                [
+                    types.Part.from_text(text=json.dumps(unmatched_skills)),
+                    types.Part.from_text(text=json.dumps(list(shortlist.values()))),
+                ]
             )
 
-            existing_skill_ids = [match.get("pk") for match in existing_skill_matches]
-            new_skill_ids = [
-                Skill.objects.get_or_create(
-                    **{fj(Skill.title): skill_name},
-                    defaults={fj(Skill.insert_type): Skill.InsertType.AI},
-                )[0].pk
-                for skill_name in new_skill_matches
-            ]
-
-            all_skill_ids = existing_skill_ids + new_skill_ids
-            skills = Skill.objects.filter(**{fj(Skill._meta.pk.attname, In.lookup_name): all_skill_ids}).distinct()
+            if get_or_create_skills_message:
+                get_or_create_skills = GoogleServices.message_to_json(get_or_create_skills_message)
+                existing_skill_matches, new_skill_matches = (
+                    get_or_create_skills.get("matched_skills", []),
+                    get_or_create_skills.get("new_skills", []),
+                )
+                existing_skill_ids.extend(match.get("pk") for match in existing_skill_matches)
+
+        new_skill_ids = [
+            Skill.objects.get_or_create(
+                **{fj(Skill.title): skill_name},
+                defaults={fj(Skill.insert_type): Skill.InsertType.AI},
+            )[0].pk
+            for skill_name in new_skill_matches
+        ]
 
-            return skills
+        all_skill_ids = existing_skill_ids + new_skill_ids
+        return Skill.objects.filter(**{fj(Skill._meta.pk.attname, In.lookup_name): all_skill_ids}).distinct()
 
     return Skill.objects.none()
 
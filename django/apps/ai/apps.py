@@ -7,3 +7,10 @@ class AiConfig(AppConfig):
 
     def ready(self):
         from . import populators  # noqa
+        from . import signals  # noqa
+        from . import settings as ai_settings
+
+        if ai_settings.AI_PRELOAD_MODELS_ON_READY:
+            from .model_registry import preload_models
+
+            preload_models()
@@ -1,6 +1,6 @@
 import contextlib
 from collections import deque
-from typing import ClassVar, List
+from typing import Any, ClassVar, Dict, List, Optional
 
 from google.genai.types import ContentListUnion
 from pydantic import BaseModel, ValidationError
@@ -10,9 +10,11 @@ from .google import GoogleServices
 
 class Assistant[ResponseT: BaseModel]:
     assistant_slug: ClassVar[str]
+    cache_responses: ClassVar[bool] = True
 
     def __init__(self):
         self.service = self.get_service()
+        self.context: Dict[str, Any] = {}
 
     def get_prompts(self, *args, **kwargs) -> ContentListUnion:
         raise NotImplementedError("This method should be overridden by subclasses.")
@@ -27,18 +29,20 @@ class Assistant[ResponseT: BaseModel]:
         return self.service.message_to_json(results)
 
     def execute(self, *, is_json_marked=True, old_results: List) -> ResponseT | None:
-        results = self.service.generate_text_content(self.get_prompts())
+        results = self.service.generate_text_content(self.get_prompts(), use_cache=self.cache_responses)
 
         return self.response_builder(results=results, old_results=old_results)
 
 
 class AssistantPipeline:
-    def __init__(self, *assistants: Assistant):
+    def __init__(self, *assistants: Assistant, context: Optional[Dict[str, Any]] = None):
         self.assistants = assistants
+        self.context = context or {}
 
     def run(self):
         results = deque()
         for assistant in self.assistants:
+            assistant.context = self.context
             with contextlib.suppress(ValidationError):
                 result = assistant.execute(old_results=results.copy())
                 results.append(result)
@@ -147,8 +147,12 @@ OCR_CONFIGURATION = {
     "language_hints": ["en", "fr", "es", "de", "zh"],  # Languages to hint for OCR
     "enhance_contrast": True,  # Whether to enhance contrast for better OCR results
     "timeout_seconds": 120,  # Maximum time allowed for OCR processing
+    "max_pdf_pages": 30,  # Pages of a scanned PDF beyond this limit are not processed
 }
 
+# Bump whenever an extractor changes its output, so cached text extraction results are ignored
+TEXT_EXTRACTION_VERSION = 1
+
 # Performance Metrics
 # ==================
 
@@ -0,0 +1,58 @@
+import hashlib
+from functools import cached_property
+from typing import Any, Callable, Optional
+
+from common.utils import get_file_model_mimetype
+from flex_blob.models import FileModel
+from google.genai import types as genai_types
+
+from django.core.cache import cache
+
+from . import settings as ai_settings
+from .constants import TEXT_EXTRACTION_VERSION
+
+
+def get_content_hash(file_bytes: bytes) -> str:
+    return hashlib.sha256(file_bytes).hexdigest()
+
+
+def cached_extraction(
+    extractor: str,
+    content_hash: str,
+    extract: Callable[[], Any],
+    should_cache: Callable[[Any], bool] = bool,
+):
+    """Return the result of ``extractor`` for the given file content, running ``extract`` only on a cache miss."""
+
+    key = f"text-extraction:{TEXT_EXTRACTION_VERSION}:{extractor}:{content_hash}"
+    if (result := cache.get(key)) is not None:
+        return result
+
+    result = extract()
+    if should_cache(result):
+        cache.set(key, result, ai_settings.TEXT_EXTRACTION_CACHE_TIMEOUT)
+    return result
+
+
+class FileDocument:
+    """The content of a file, read once and shared by every step of an analysis."""
+
+    def __init__(self, file_bytes: bytes, mime_type: str):
+        self.file_bytes = file_bytes
+        self.mime_type = mime_type
+
+    @cached_property
+    def content_hash(self) -> str:
+        return get_content_hash(self.file_bytes)
+
+    def get_part(self) -> genai_types.Part:
+        return genai_types.Part.from_bytes(data=self.file_bytes, mime_type=self.mime_type)
+
+    @classmethod
+    def from_file_model(cls, file_model_id: int) -> Optional["FileDocument"]:
+        if not (file_model := FileModel.objects.filter(pk=file_model_id).first()):
+            return None
+
+        mime_type = get_file_model_mimetype(file_model)
+        with file_model.file.open("rb") as file:
+            return cls(file.read(), mime_type)
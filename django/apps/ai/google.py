@@ -1,46 +1,117 @@
-from typing import Optional, Union
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 
 import magic
-from common.utils import get_file_model_mimetype
-from flex_blob.models import FileModel
 from google import genai
 from google.cloud import vision
 from google.genai import types as genai_types
+from pydantic import BaseModel
 
 from django.conf import settings
+from django.core.cache import cache
 
+from . import settings as ai_settings
 from .constants import FILE_TYPE_MAPPING, FileType
+from .extraction import FileDocument, cached_extraction, get_content_hash
 from .models import VertexAIModel
 from .types import FileToTextResult
 from .utils import parse_json_markdown
 
 
+def create_genai_client() -> genai.Client:
+    return genai.Client(
+        project=settings.GOOGLE_CLOUD_PROJECT,
+        location=settings.GOOGLE_CLOUD_LOCATION,
+        vertexai=True,
+    )
+
+
+def create_vision_client() -> vision.ImageAnnotatorClient:
+    return vision.ImageAnnotatorClient()
+
+
+class GoogleClientRegistry:
+    """
+    Per-process registry of Google clients and Vertex AI model configs.
+
+    Clients are thread-safe and are built once per process, then shared by all worker threads.
+    Model configs are cached until a model is saved or deleted in this process, and at most
+    ``VERTEX_AI_MODEL_CACHE_TTL`` seconds to pick up changes made by other processes.
+    """
+
+    def __init__(
+        self,
+        genai_client_factory: Callable[[], genai.Client] = create_genai_client,
+        vision_client_factory: Callable[[], vision.ImageAnnotatorClient] = create_vision_client,
+    ):
+        self.factories: Dict[str, Callable[[], Any]] = {
+            "genai": genai_client_factory,
+            "vision": vision_client_factory,
+        }
+        self.lock = threading.Lock()
+        self.clients: Dict[str, Any] = {}
+        self.models: Dict[str, Tuple[VertexAIModel, float]] = {}
+
+    def get_client(self, name: str):
+        if (client := self.clients.get(name)) is None:
+            with self.lock:
+                if (client := self.clients.get(name)) is None:
+                    client = self.clients[name] = self.factories[name]()
+        return client
+
+    def get_genai_client(self) -> genai.Client:
+        return self.get_client("genai")
+
+    def get_vision_client(self) -> vision.ImageAnnotatorClient:
+        return self.get_client("vision")
+
+    def get_model(self, model_slug: str) -> Optional[VertexAIModel]:
+        cached = self.models.get(model_slug)
+        if cached and time.monotonic() - cached[1] < ai_settings.VERTEX_AI_MODEL_CACHE_TTL:
+            return cached[0]
+
+        if instance := VertexAIModel.objects.filter(**{VertexAIModel.slug.field.name: model_slug}).first():
+            self.models[model_slug] = (instance, time.monotonic())
+        return instance
+
+    def invalidate_models(self):
+        self.models.clear()
+
+
+google_clients = GoogleClientRegistry()
+
+
+def get_contents_fingerprint(*values: Any) -> str:
+    """Hash the given values, with file contents hashed on their own instead of being serialized."""
+
+    def serialize(value):
+        if isinstance(value, bytes):
+            return get_content_hash(value)
+        if isinstance(value, BaseModel):
+            return value.model_dump(exclude_none=True)
+        raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+    return hashlib.sha256(json.dumps(values, default=serialize, sort_keys=True).encode()).hexdigest()
+
+
 class GoogleServices:
     client: genai.Client
 
     def __init__(self, model_slug: str):
-        if not (instance := VertexAIModel.objects.filter(**{VertexAIModel.slug.field.name: model_slug}).first()):
+        if not (instance := google_clients.get_model(model_slug)):
             raise ValueError("Model not found")
 
         self.instance = instance
-        self.client = genai.Client(
-            project=settings.GOOGLE_CLOUD_PROJECT,
-            location=settings.GOOGLE_CLOUD_LOCATION,
-            vertexai=True,
-        )
+        self.client = google_clients.get_genai_client()
 
     def get_file_part(self, file_model_id: int) -> genai_types.ContentUnion:
-        if not (file_model := FileModel.objects.filter(pk=file_model_id).first()):
+        if not (document := FileDocument.from_file_model(file_model_id)):
             return []
 
-        mime_type = get_file_model_mimetype(file_model)
-        with file_model.file.open("rb") as file:
-            file_bytes = file.read()
-
-        return genai_types.Part.from_bytes(
-            data=file_bytes,
-            mime_type=mime_type,
-        )
+        return document.get_part()
 
     def generate_content(self, contents: genai_types.ContentListUnion):
         return self.client.models.generate_content(
@@ -53,8 +124,35 @@ class GoogleServices:
             ),
         )
 
-    def generate_text_content(self, contents: genai_types.ContentListUnion) -> str:
-        return self.generate_content(contents).text
+    def get_response_cache_key(self, contents: genai_types.ContentListUnion) -> str:
+        fingerprint = get_contents_fingerprint(
+            self.instance.slug,
+            self.instance.model_name,
+            self.instance.instruction,
+            self.instance.temperature,
+            self.instance.max_tokens,
+            contents,
+        )
+        return f"llm-response:{fingerprint}"
+
+    def generate_text_content(self, contents: genai_types.ContentListUnion, *, use_cache: bool = True) -> str:
+        """
+        Generate the text response of the model, reusing the cached response of identical requests.
+
+        Pass ``use_cache=False`` where a fresh response is expected for the same input.
+        """
+
+        if not (use_cache and ai_settings.LLM_RESPONSE_CACHE_TIMEOUT):
+            return self.generate_content(contents).text
+
+        key = self.get_response_cache_key(contents)
+        if (text := cache.get(key)) is not None:
+            return text
+
+        text = self.generate_content(contents).text
+        if text and len(text) <= ai_settings.LLM_RESPONSE_CACHE_MAX_SIZE:
+            cache.set(key, text, ai_settings.LLM_RESPONSE_CACHE_TIMEOUT)
+        return text
 
     @staticmethod
     def message_to_json(results: str):
@@ -62,7 +160,7 @@ class GoogleServices:
 
     @classmethod
     def get_vision_client(cls) -> vision.ImageAnnotatorClient:
-        return vision.ImageAnnotatorClient()
+        return google_clients.get_vision_client()
 
     @classmethod
     def file_vision(
@@ -93,13 +191,19 @@ class GoogleServices:
     def file_to_text(cls, file_bytes: bytes) -> Optional[FileToTextResult]:
         if not (file_type := cls.detect_file_type(file_bytes)):
             raise ValueError("Invalid file type")
-        response = cls.file_vision(file_bytes, file_type)
-        if not response:
+
+        responses = []
+
+        def extract_text() -> Optional[str]:
+            if not (response := cls.file_vision(file_bytes, file_type)):
+                return None
+            responses.append(response)
+            match file_type:
+                case FileType.IMAGE:
+                    return response.text_annotations[0].description
+                case FileType.PDF:
+                    return "\n".join([page.full_text_annotation.text for page in response.responses])
+
+        if (text := cached_extraction("vision", get_content_hash(file_bytes), extract_text)) is None:
             return None
-        text = None
-        match file_type:
-            case FileType.IMAGE:
-                text = response.text_annotations[0].description
-            case FileType.PDF:
-                text = "\n".join([page.full_text_annotation.text for page in response.responses])
-        return FileToTextResult(text=text, file_type=file_type, response=response)
+        return FileToTextResult(text=text, file_type=file_type, response=next(iter(responses), None))
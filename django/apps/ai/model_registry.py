@@ -0,0 +1,60 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable
+
+logger = logging.getLogger(__name__)
+
+
+class ModelRegistry:
+    """
+    Named loaders of the local NLP models, so a process can load them up front.
+
+    The loaders cache the models themselves; the registry only runs them once per process and
+    records how long every load took.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.loaders: Dict[str, Callable[[], Any]] = {}
+        self.load_times: Dict[str, float] = {}
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        self.loaders[name] = loader
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self.load_times
+
+    def load(self, name: str):
+        with self.lock:
+            if self.is_loaded(name):
+                return
+
+            started = time.perf_counter()
+            self.loaders[name]()
+            self.load_times[name] = time.perf_counter() - started
+
+        logger.info(f"Preloaded model {name} in {self.load_times[name]:.2f}s.")
+
+    def preload(self, names: Iterable[str]):
+        for name in names:
+            if name not in self.loaders:
+                logger.warning(f"Unknown model {name} skipped from preloading.")
+                continue
+
+            try:
+                self.load(name)
+            except Exception as e:
+                logger.error(f"Error preloading model {name}: {e}")
+
+
+model_registry = ModelRegistry()
+
+
+def preload_models():
+    """Load the models listed in the ``AI_PRELOAD_MODELS`` setting into the current process."""
+
+    from . import settings as ai_settings
+    from . import utils  # noqa: registers the model loaders
+
+    model_registry.preload(ai_settings.AI_PRELOAD_MODELS)
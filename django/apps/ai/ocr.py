@@ -0,0 +1,126 @@
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+from concurrent.futures import Executor, ProcessPoolExecutor, wait
+from multiprocessing.queues import Queue
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import pytesseract
+from pdf2image import convert_from_path, pdfinfo_from_path
+
+logger = logging.getLogger(__name__)
+
+mp_context = multiprocessing.get_context("forkserver")
+mp_context.set_forkserver_preload([__name__])
+
+
+def ocr_pdf_page(file_path: Union[str, Path], page_number: int, dpi: int, lang: str) -> str:
+    """
+    Rasterize a single PDF page and extract its text with tesseract.
+
+    Runs in a worker process, so only one page image is held in memory per worker.
+    """
+    images = convert_from_path(file_path, dpi=dpi, first_page=page_number, last_page=page_number)
+    return "\n".join(
+        pytesseract.image_to_string(image, lang=lang, config="--psm 1").strip()  # Auto page segmentation with OSD
+        for image in images
+    )
+
+
+def init_ocr_worker(pids: Queue):
+    # Leading its own process group, the worker is killed together with its pdftoppm and tesseract processes
+    os.setpgrp()
+    pids.put(os.getpid())
+
+
+class OcrWorkerPool:
+    """
+    Worker processes reading the pages of a single document.
+
+    Workers are forked from the long-lived forkserver, which has this module preloaded, so they start
+    cheaply and never inherit the threads and loaded models of the task worker. Every document has
+    its own workers, so a document that passes its deadline kills only the workers of its pages.
+    """
+
+    # Seconds to wait for a worker that has not reported its pid yet
+    start_timeout = 5
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self.pids = mp_context.Queue()
+        self.executor = self.create_executor(max_workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def create_executor(self, max_workers: int) -> Executor:
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=mp_context,
+            initializer=init_ocr_worker,
+            initargs=(self.pids,),
+        )
+
+    def terminate(self):
+        """Kill the workers with the pages they are reading."""
+
+        # Every page is submitted before the deadline, so all the workers of the executor are started
+        for _ in range(self.max_workers):
+            try:
+                os.killpg(self.pids.get(timeout=self.start_timeout), signal.SIGKILL)
+            except queue.Empty:
+                break
+            except ProcessLookupError:
+                pass
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def ocr_pdf(
+    file_path: Union[str, Path],
+    dpi: int,
+    lang: str,
+    max_pages: int,
+    timeout: float,
+    max_workers: Optional[int] = None,
+) -> str:
+    """
+    OCR the pages of a PDF in parallel worker processes.
+
+    Pages are rasterized lazily by the workers, at most ``max_pages`` pages are read and pages that
+    are not done after ``timeout`` seconds are dropped, so a large scan returns the pages it could
+    process in time instead of holding the request. The workers of the document that are still
+    reading a page at the deadline are killed.
+
+    Returns:
+        The text of the processed pages in page order
+    """
+    page_count = min(pdfinfo_from_path(file_path)["Pages"], max_pages)
+    if page_count <= 0:
+        return ""
+
+    with OcrWorkerPool(min(max_workers or os.cpu_count() or 1, page_count)) as pool:
+        futures = {
+            pool.executor.submit(ocr_pdf_page, file_path, page_number, dpi, lang): page_number
+            for page_number in range(1, page_count + 1)
+        }
+        done, not_done = wait(futures, timeout=timeout)
+        if not_done:
+            logger.warning(f"OCR deadline reached for {file_path}, {len(not_done)} of {page_count} pages skipped.")
+            if not all([future.cancel() for future in not_done]):
+                # Pages already being read cannot be cancelled
+                pool.terminate()
+
+    pages: Dict[int, str] = {}
+    for future in done:
+        if future.exception():
+            logger.warning(f"Error processing page {futures[future]} of {file_path} with OCR: {future.exception()}")
+            continue
+        pages[futures[future]] = future.result()
+
+    return "\n".join(pages[page_number] for page_number in sorted(pages))
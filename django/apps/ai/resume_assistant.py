@@ -2,6 +2,7 @@ import json
 import logging
 from typing import List, Optional, Dict, Any, Union
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 from google.genai.types import ContentListUnion, Content
 from django.conf import settings
@@ -139,7 +140,7 @@ class ResumeAnalysisAssistant(Assistant[ResumeAnalysisResult]):
                 )
             ]
             
-            response = self.service.generate_text_content(prompts)
+            response = self.service.generate_text_content(prompts, use_cache=self.cache_responses)
             # Extract language code - assuming response is just the language code
             language_code = response.strip().lower()
             self.document_language = language_code
@@ -189,7 +190,7 @@ class ResumeAnalysisAssistant(Assistant[ResumeAnalysisResult]):
                 )
             ]
             
-            response = self.service.generate_text_content(prompts)
+            response = self.service.generate_text_content(prompts, use_cache=self.cache_responses)
             
             # Extract JSON from the response
             json_match = re.search(r'```json\s*(.*?)\s*```', response, re.DOTALL)
@@ -219,6 +220,57 @@ class ResumeAnalysisAssistant(Assistant[ResumeAnalysisResult]):
             logger.error(f"Error during resume segmentation: {str(e)}")
             return {}
             
+    def extract_section_entities(self, section_name: str, section_text: str) -> Dict[str, Any]:
+        """
+        Extract structured entities from a single resume section.
+
+        Args:
+            section_name: Name of the section
+            section_text: Content of the section
+
+        Returns:
+            Dictionary of extracted entities, empty on failure
+        """
+        logger.debug(f"Processing section: {section_name}")
+
+        try:
+            # Use the Google service to extract entities for the section
+            prompts = [
+                Content(
+                    parts=[{
+                        "text": f"""Extract structured information from the following {section_name} section of a resume.
+                        Return the result as a JSON object with appropriate fields based on the section type.
+                        
+                        Section type: {section_name}
+                        Section content:
+                        {section_text}
+                        """
+                    }],
+                    role="user"
+                )
+            ]
+
+            response = self.service.generate_text_content(prompts, use_cache=self.cache_responses)
+
+            # Extract JSON from the response
+            json_match = re.search(r'```json\s*(.*?)\s*```', response, re.DOTALL)
+            if json_match:
+                json_str = json_match.group(1)
+            else:
+                json_str = response
+
+            try:
+                section_entities = json.loads(json_str)
+                logger.debug(f"Successfully extracted entities from {section_name}")
+                return section_entities
+            except json.JSONDecodeError:
+                logger.error(f"Failed to parse entities JSON for {section_name}", extra={"response": response[:100] + "..."})
+                return {}
+
+        except Exception as e:
+            logger.error(f"Error extracting entities from {section_name}: {str(e)}")
+            return {}
+
     def extract_entities(self, sections: Dict[str, str]) -> Dict[str, Any]:
         """
         Extract named entities from each resume section using NER.
@@ -230,52 +282,16 @@ class ResumeAnalysisAssistant(Assistant[ResumeAnalysisResult]):
             Dictionary of extracted entities for each section
         """
         logger.debug("Extracting entities from resume sections")
-        results = {}
-        
-        for section_name, section_text in sections.items():
-            if not section_text:
-                continue
-                
-            logger.debug(f"Processing section: {section_name}")
-                
-            try:
-                # Use the Google service to extract entities for each section
-                prompts = [
-                    Content(
-                        parts=[{
-                            "text": f"""Extract structured information from the following {section_name} section of a resume.
-                            Return the result as a JSON object with appropriate fields based on the section type.
-                            
-                            Section type: {section_name}
-                            Section content:
-                            {section_text}
-                            """
-                        }],
-                        role="user"
-                    )
-                ]
-                
-                response = self.service.generate_text_content(prompts)
-                
-                # Extract JSON from the response
-                json_match = re.search(r'```json\s*(.*?)\s*```', response, re.DOTALL)
-                if json_match:
-                    json_str = json_match.group(1)
-                else:
-                    json_str = response
-                    
-                try:
-                    section_entities = json.loads(json_str)
-                    results[section_name] = section_entities
-                    logger.debug(f"Successfully extracted entities from {section_name}")
-                except json.JSONDecodeError:
-                    logger.error(f"Failed to parse entities JSON for {section_name}", extra={"response": response[:100] + "..."})
-                    results[section_name] = {}
-            
-            except Exception as e:
-                logger.error(f"Error extracting entities from {section_name}: {str(e)}")
-                results[section_name] = {}
-                
+
+        pending_sections = [(name, text) for name, text in sections.items() if text]
+
+        # Sections are independent, so their requests are sent concurrently.
+        # executor.map yields results in submission order, preserving section order.
+        max_workers = max(1, min(len(pending_sections), resume_settings.MAX_CONCURRENT_SECTION_REQUESTS))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="resume-section") as executor:
+            section_results = executor.map(lambda section: self.extract_section_entities(*section), pending_sections)
+            results = {name: entities for (name, _), entities in zip(pending_sections, section_results)}
+
         self.ner_results = results
         
         logger.debug(
@@ -321,7 +337,7 @@ class ResumeAnalysisAssistant(Assistant[ResumeAnalysisResult]):
                 )
             ]
             
-            response = self.service.generate_text_content(prompts)
+            response = self.service.generate_text_content(prompts, use_cache=self.cache_responses)
             
             # Extract JSON from the response
             json_match = re.search(r'```json\s*(.*?)\s*```', response, re.DOTALL)
@@ -385,7 +401,7 @@ class ResumeAnalysisAssistant(Assistant[ResumeAnalysisResult]):
                 )
             ]
             
-            response = self.service.generate_text_content(prompts)
+            response = self.service.generate_text_content(prompts, use_cache=self.cache_responses)
             
             # Extract JSON from the response
             json_match = re.search(r'```json\s*(.*?)\s*```', response, re.DOTALL)
@@ -449,7 +465,7 @@ class ResumeAnalysisAssistant(Assistant[ResumeAnalysisResult]):
                 )
             ]
             
-            response = self.service.generate_text_content(prompts)
+            response = self.service.generate_text_content(prompts, use_cache=self.cache_responses)
             
             # Extract JSON from the response
             json_match = re.search(r'```json\s*(.*?)\s*```', response, re.DOTALL)
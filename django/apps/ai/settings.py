@@ -50,4 +50,32 @@ LANGUAGE_MAPPING = getattr(settings, 'LANGUAGE_MAPPING', {
     'hi': 'Hindi',
     'pt': 'Portuguese',
     'it': 'Italian'
-}) 
\ No newline at end of file
+})
+
+# Maximum number of per-section extraction requests sent to the model concurrently
+MAX_CONCURRENT_SECTION_REQUESTS = getattr(settings, 'MAX_CONCURRENT_SECTION_REQUESTS', 8)
+
+# Seconds a Vertex AI model config stays cached in a process before it is read from the database again
+VERTEX_AI_MODEL_CACHE_TTL = getattr(settings, 'VERTEX_AI_MODEL_CACHE_TTL', 300)
+
+# Seconds an extracted text or OCR result stays cached for the same file content (default 30 days)
+TEXT_EXTRACTION_CACHE_TIMEOUT = getattr(settings, 'TEXT_EXTRACTION_CACHE_TIMEOUT', 30 * 24 * 60 * 60)
+
+# Maximum number of paragraphs classified in one forward pass of the section classifier
+SECTION_CLASSIFIER_BATCH_SIZE = getattr(settings, 'SECTION_CLASSIFIER_BATCH_SIZE', 32)
+
+# Number of worker processes used to OCR the pages of a scanned PDF (default: CPU count)
+OCR_MAX_WORKERS = getattr(settings, 'OCR_MAX_WORKERS', None)
+
+# Local models loaded when a worker process starts instead of on the first resume
+# (any of "section_classifier", "ner", "skill_standardizer")
+AI_PRELOAD_MODELS = getattr(settings, 'AI_PRELOAD_MODELS', [])
+
+# Whether the models are preloaded when the apps are ready, for processes without a server hook (e.g. pubsub)
+AI_PRELOAD_MODELS_ON_READY = getattr(settings, 'AI_PRELOAD_MODELS_ON_READY', False)
+
+# Seconds a model response stays cached for an identical request (0 disables the cache, default 1 day)
+LLM_RESPONSE_CACHE_TIMEOUT = getattr(settings, 'LLM_RESPONSE_CACHE_TIMEOUT', 24 * 60 * 60)
+
+# Responses longer than this many characters are not cached
+LLM_RESPONSE_CACHE_MAX_SIZE = getattr(settings, 'LLM_RESPONSE_CACHE_MAX_SIZE', 256 * 1024)
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .google import google_clients
+from .models import VertexAIModel
+
+
+@receiver(post_save, sender=VertexAIModel)
+@receiver(post_delete, sender=VertexAIModel)
+def vertex_ai_model_invalidate_cache(sender, instance: VertexAIModel, **kwargs):
+    google_clients.invalidate_models()
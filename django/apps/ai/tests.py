@@ -0,0 +1,394 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+
+import torch
+from google.genai import types as genai_types
+from sentence_transformers import util
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+
+from .constants import (
+    SKILL_MAPPING_CONFIDENCE,
+    SKILL_STANDARDIZATION_EXAMPLES,
+    FileType,
+)
+from .google import GoogleClientRegistry, GoogleServices
+from .model_registry import ModelRegistry
+from .models import VertexAIModel
+from .ocr import OcrWorkerPool, ocr_pdf
+from .resume_assistant import ResumeAnalysisAssistant
+from .types import Entity, EntityType, ResumeSection
+from .utils import (
+    load_section_classifier,
+    segment_many_with_model,
+    segment_resume_into_sections,
+    segment_with_model,
+    standardize_skills,
+)
+
+
+class FakeGoogleServices:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def generate_text_content(self, contents, use_cache=True) -> str:
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        time.sleep(self.latency)
+        section_type = contents[0].parts[0].text.split("Section type: ")[1].split("\n")[0].strip()
+
+        with self.lock:
+            self.in_flight -= 1
+
+        return f"```json\n{json.dumps({'section': section_type})}\n```"
+
+
+class ResumeAnalysisAssistantTestCase(SimpleTestCase):
+    latency = 0.2
+
+    def setUp(self):
+        self.service = FakeGoogleServices(self.latency)
+        with mock.patch.object(ResumeAnalysisAssistant, "get_service", return_value=self.service):
+            self.assistant = ResumeAnalysisAssistant(resume_text="resume")
+
+        self.sections = {f"section_{index}": f"content {index}" for index in range(10)}
+
+    def test_extract_entities_runs_sections_concurrently(self):
+        started = time.perf_counter()
+        results = self.assistant.extract_entities(self.sections)
+        elapsed = time.perf_counter() - started
+
+        self.assertLess(elapsed, self.latency * 3)
+        self.assertGreater(self.service.max_in_flight, 1)
+        self.assertEqual(list(results.keys()), list(self.sections.keys()))
+        self.assertEqual(results, {name: {"section": name} for name in self.sections})
+
+    def test_extract_entities_limits_in_flight_requests(self):
+        with mock.patch("ai.resume_assistant.resume_settings.MAX_CONCURRENT_SECTION_REQUESTS", 2):
+            self.assistant.extract_entities(self.sections)
+
+        self.assertEqual(self.service.max_in_flight, 2)
+
+    def test_extract_entities_skips_empty_sections(self):
+        results = self.assistant.extract_entities({"summary": "", "skills": "python"})
+
+        self.assertEqual(results, {"skills": {"section": "skills"}})
+
+
+class GoogleServicesTestCase(TestCase):
+    def setUp(self):
+        self.model = VertexAIModel.objects.create(slug="test-model", model_name="test-model-name")
+        self.client_factory = mock.Mock(side_effect=object)
+        self.registry = GoogleClientRegistry(genai_client_factory=self.client_factory)
+
+        patcher = mock.patch("ai.google.google_clients", self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_clients_and_models_are_reused(self):
+        service = GoogleServices("test-model")
+
+        with self.assertNumQueries(0):
+            services = [GoogleServices("test-model") for _ in range(1000)]
+
+        self.client_factory.assert_called_once()
+        self.assertTrue(all(other.client is service.client for other in services))
+
+    def test_model_save_invalidates_cache(self):
+        GoogleServices("test-model")
+
+        with mock.patch("ai.signals.google_clients", self.registry):
+            self.model.temperature = 0.5
+            self.model.save()
+
+        self.assertEqual(GoogleServices("test-model").instance.temperature, 0.5)
+
+    def test_missing_model(self):
+        with self.assertRaises(ValueError):
+            GoogleServices("missing-model")
+
+
+class CountingGenaiClient:
+    def __init__(self):
+        self.calls = 0
+        self.models = self
+
+    def generate_content(self, model, contents, config):
+        self.calls += 1
+        return mock.Mock(text=f"```json\n{json.dumps({'model': model, 'call': self.calls})}\n```")
+
+
+class LlmResponseCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        VertexAIModel.objects.create(slug=ResumeAnalysisAssistant.assistant_slug, model_name="test-model-name")
+        self.client = CountingGenaiClient()
+        patcher = mock.patch("ai.google.google_clients", GoogleClientRegistry(genai_client_factory=lambda: self.client))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.sections = {"skills": "python", "education": "university"}
+
+    def test_repeat_analyses_hit_the_cache(self):
+        first = ResumeAnalysisAssistant(resume_text="resume").extract_entities(self.sections)
+        second = ResumeAnalysisAssistant(resume_text="resume").extract_entities(self.sections)
+
+        self.assertEqual(self.client.calls, len(self.sections))
+        self.assertEqual(first, second)
+
+    def test_changed_input_is_not_cached(self):
+        service = GoogleServices(ResumeAnalysisAssistant.assistant_slug)
+        service.generate_text_content([genai_types.Part.from_bytes(data=b"resume", mime_type="application/pdf")])
+        service.generate_text_content([genai_types.Part.from_bytes(data=b"other", mime_type="application/pdf")])
+        service.generate_text_content([genai_types.Part.from_bytes(data=b"resume", mime_type="application/pdf")])
+
+        self.assertEqual(self.client.calls, 2)
+
+    def test_opt_out(self):
+        service = GoogleServices(ResumeAnalysisAssistant.assistant_slug)
+        service.generate_text_content("prompt", use_cache=False)
+        service.generate_text_content("prompt", use_cache=False)
+
+        self.assertEqual(self.client.calls, 2)
+
+
+class FileToTextCacheTestCase(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        self.vision_client = mock.Mock()
+        self.vision_client.text_detection.return_value = mock.Mock(
+            text_annotations=[mock.Mock(description="extracted text")]
+        )
+        registry = GoogleClientRegistry(vision_client_factory=lambda: self.vision_client)
+
+        for patcher in (
+            mock.patch("ai.google.google_clients", registry),
+            mock.patch.object(GoogleServices, "detect_file_type", return_value=FileType.IMAGE),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_unchanged_file_is_not_processed_again(self):
+        first = GoogleServices.file_to_text(b"image")
+        second = GoogleServices.file_to_text(b"image")
+
+        self.assertEqual(first.text, "extracted text")
+        self.assertEqual(second.text, "extracted text")
+        self.vision_client.text_detection.assert_called_once()
+
+    def test_changed_file_is_processed(self):
+        GoogleServices.file_to_text(b"image")
+        GoogleServices.file_to_text(b"other image")
+
+        self.assertEqual(self.vision_client.text_detection.call_count, 2)
+
+
+class FakeTokenizer:
+    def __call__(self, texts, **kwargs):
+        return {"lengths": torch.tensor([len(text) for text in texts])}
+
+
+class FakeSectionClassifier:
+    def __init__(self):
+        self.batch_sizes = []
+
+    def __call__(self, lengths):
+        self.batch_sizes.append(len(lengths))
+        return mock.Mock(logits=torch.nn.functional.one_hot(lengths % len(ResumeSection), len(ResumeSection)).float())
+
+
+class SegmentWithModelTestCase(SimpleTestCase):
+    def setUp(self):
+        self.model = FakeSectionClassifier()
+        self.classifier = (FakeTokenizer(), self.model)
+        self.paragraphs = [f"paragraph {'x' * index}" for index in range(10)]
+
+    def get_expected_sections(self, paragraphs):
+        sections = {}
+        for paragraph in paragraphs:
+            section = list(ResumeSection)[len(paragraph) % len(ResumeSection)]
+            sections[section] = f"{sections[section]}\n\n{paragraph}" if section in sections else paragraph
+        return sections
+
+    def test_paragraphs_are_classified_in_batches(self):
+        with mock.patch("ai.utils.ai_settings.SECTION_CLASSIFIER_BATCH_SIZE", 4):
+            sections = segment_with_model("\n\n".join(self.paragraphs + ["", "ab"]), self.classifier, "en")
+
+        self.assertEqual(self.model.batch_sizes, [4, 4, 2])
+        self.assertEqual(sections, self.get_expected_sections(self.paragraphs))
+
+    def test_several_resumes_share_batches(self):
+        texts = ["\n\n".join(self.paragraphs[:5]), "\n\n".join(self.paragraphs[5:])]
+
+        results = segment_many_with_model(texts, self.classifier, "en")
+
+        self.assertEqual(self.model.batch_sizes, [10])
+        self.assertEqual(
+            results, [self.get_expected_sections(self.paragraphs[:5]), self.get_expected_sections(self.paragraphs[5:])]
+        )
+
+
+class FakeEmbeddingModel:
+    def __init__(self):
+        self.encoded_texts = 0
+
+    def embed(self, text: str) -> torch.Tensor:
+        return torch.tensor([text.count(letter) for letter in "abcdefghijklmnopqrstuvwxyz "], dtype=torch.float) + 0.1
+
+    def encode(self, texts, convert_to_tensor=True, normalize_embeddings=False):
+        if isinstance(texts, str):
+            self.encoded_texts += 1
+            return self.embed(texts)
+
+        self.encoded_texts += len(texts)
+        embeddings = torch.stack([self.embed(text) for text in texts])
+        return torch.nn.functional.normalize(embeddings, dim=1) if normalize_embeddings else embeddings
+
+
+class StandardizeSkillsTestCase(SimpleTestCase):
+    skills = ["python scripting", "project planning", "data analyst", "neural nets", "pottery", "Python"]
+
+    def get_entities(self):
+        return [Entity(text=skill, entity_type=EntityType.SKILL, confidence=1.0) for skill in self.skills]
+
+    def standardize_with_loop(self, entities, skill_map, model):
+        for entity in entities:
+            if (skill_text := entity.text.lower()) in skill_map:
+                entity.normalized_value = skill_map[skill_text]
+                continue
+
+            max_similarity, best_match = -1, None
+            for standard_skill in SKILL_STANDARDIZATION_EXAMPLES:
+                similarity = util.pytorch_cos_sim(model.encode(skill_text), model.encode(standard_skill)).item()
+                if similarity > max_similarity and similarity > SKILL_MAPPING_CONFIDENCE:
+                    max_similarity, best_match = similarity, standard_skill
+
+            entity.normalized_value = best_match or entity.text
+            if best_match:
+                entity.confidence *= max_similarity
+        return entities
+
+    def test_matches_per_skill_loop(self):
+        model = FakeEmbeddingModel()
+        skill_map = {"python": "python"}
+
+        with mock.patch("ai.utils.load_skill_standardizer", return_value=(skill_map, model)):
+            entities = standardize_skills(self.get_entities())
+
+        expected = self.standardize_with_loop(self.get_entities(), skill_map, FakeEmbeddingModel())
+        self.assertEqual([entity.normalized_value for entity in entities], [e.normalized_value for e in expected])
+        for entity, expected_entity in zip(entities, expected):
+            self.assertAlmostEqual(entity.confidence, expected_entity.confidence, places=5)
+
+    def test_standard_skills_are_encoded_once(self):
+        model = FakeEmbeddingModel()
+
+        with mock.patch("ai.utils.load_skill_standardizer", return_value=({}, model)):
+            standardize_skills(self.get_entities())
+            standardize_skills(self.get_entities())
+
+        self.assertEqual(model.encoded_texts, len(SKILL_STANDARDIZATION_EXAMPLES) + 2 * len(self.skills))
+
+
+class OcrPdfTestCase(SimpleTestCase):
+    def setUp(self):
+        self.ocr_pdf_page = mock.Mock(side_effect=self.read_page)
+        self.create_executor = mock.Mock(side_effect=ThreadPoolExecutor)
+        for patcher in (
+            mock.patch.object(OcrWorkerPool, "create_executor", self.create_executor),
+            mock.patch("ai.ocr.pdfinfo_from_path", return_value={"Pages": 6}),
+            mock.patch("ai.ocr.ocr_pdf_page", self.ocr_pdf_page),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def read_page(self, file_path, page_number, dpi, lang):
+        time.sleep(0.3 if page_number == 1 else 0.01 * (6 - page_number))
+        return f"page {page_number}"
+
+    def ocr(self, **kwargs):
+        return ocr_pdf("resume.pdf", **{"dpi": 300, "lang": "eng", "max_pages": 30, "timeout": 5, **kwargs})
+
+    def test_pages_are_joined_in_order(self):
+        self.assertEqual(self.ocr(max_workers=6), "\n".join(f"page {page}" for page in range(1, 7)))
+        self.create_executor.assert_called_once_with(6)
+
+    def test_page_cap(self):
+        self.assertEqual(self.ocr(max_workers=6, max_pages=2), "page 1\npage 2")
+        self.assertEqual(self.ocr_pdf_page.call_count, 2)
+        self.create_executor.assert_called_once_with(2)
+
+    def test_deadline_skips_unfinished_pages(self):
+        with mock.patch.object(OcrWorkerPool, "terminate", autospec=True) as terminate:
+            self.assertEqual(self.ocr(max_workers=6, timeout=0.2), "\n".join(f"page {page}" for page in range(2, 7)))
+
+        terminate.assert_called_once()
+
+    def test_failed_page_is_skipped(self):
+        self.ocr_pdf_page.side_effect = lambda file_path, page_number, *args: (
+            f"page {page_number}" if page_number % 2 else 1 / 0
+        )
+
+        self.assertEqual(self.ocr(), "page 1\npage 3\npage 5")
+
+
+class OcrWorkerPoolTestCase(SimpleTestCase):
+    def test_terminate_kills_only_the_workers_of_its_document(self):
+        with OcrWorkerPool(max_workers=1) as expired, OcrWorkerPool(max_workers=1) as other:
+            running = expired.executor.submit(time.sleep, 60)
+            other_page = other.executor.submit(time.sleep, 1)
+            while not (running.running() and other_page.running()):
+                time.sleep(0.01)
+
+            started = time.perf_counter()
+            expired.terminate()
+
+            self.assertIsInstance(running.exception(timeout=10), BrokenProcessPool)
+            self.assertLess(time.perf_counter() - started, 10)
+            self.assertIsNone(other_page.result(timeout=10))
+
+
+class ModelRegistryTestCase(SimpleTestCase):
+    def setUp(self):
+        self.registry = ModelRegistry()
+        self.registry.register("section_classifier", load_section_classifier)
+        self.tokenizer_loader = mock.Mock(return_value=FakeTokenizer())
+        self.model_loader = mock.Mock(return_value=FakeSectionClassifier())
+
+        for patcher in (
+            mock.patch("ai.utils._SECTION_CLASSIFIER", None),
+            mock.patch("ai.utils.AutoTokenizer.from_pretrained", self.tokenizer_loader),
+            mock.patch("ai.utils.AutoModelForSequenceClassification.from_pretrained", self.model_loader),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_first_request_after_preload_does_not_load(self):
+        self.registry.preload(["section_classifier", "unknown"])
+        self.model_loader.assert_called_once()
+
+        segment_resume_into_sections("paragraph\n\nother paragraph")
+
+        self.model_loader.assert_called_once()
+        self.tokenizer_loader.assert_called_once()
+        self.assertIn("section_classifier", self.registry.load_times)
+
+    def test_models_are_loaded_once(self):
+        self.registry.preload(["section_classifier"])
+        self.registry.preload(["section_classifier"])
+
+        self.model_loader.assert_called_once()
@@ -87,7 +87,7 @@ class FileToTextResult(BaseModel):
 
     text: str
     file_type: FileType
-    response: Union[vision.AnnotateImageResponse, vision.AnnotateFileResponse]
+    response: Optional[Union[vision.AnnotateImageResponse, vision.AnnotateFileResponse]] = None
 
 
 class ResumeAnalysisResult(BaseModel):
@@ -4,6 +4,7 @@ import datetime
 import logging
 from typing import Dict, List, Optional, Set, Tuple, Union
 import time
+from functools import lru_cache
 from pathlib import Path
 
 # AI and ML libraries
@@ -19,16 +20,17 @@ from transformers import (
     GPT2LMHeadModel,
     pipeline
 )
-from sentence_transformers import SentenceTransformer, util
+from sentence_transformers import SentenceTransformer
 import torch
 import langdetect
 import dateparser
 import pytesseract
-from pdf2image import convert_from_path, convert_from_bytes
+from pdf2image import convert_from_bytes
 from docx import Document
 import textract
 from sklearn.metrics import accuracy_score, precision_recall_fscore_support
 
+from . import settings as ai_settings
 from .constants import (
     CURRENT_DATE_TERMS,
     DATE_FORMAT_PATTERNS,
@@ -45,6 +47,9 @@ from .constants import (
     SUPPORTED_LANGUAGES,
     TARGET_ACCURACY,
 )
+from .extraction import cached_extraction, get_content_hash
+from .model_registry import model_registry
+from .ocr import ocr_pdf
 from .types import (
     AccuracyMetric,
     Entity,
@@ -141,6 +146,26 @@ def process_resume(file_path: Union[str, Path], file_mime_type: str) -> ResumeAn
 # ================================================================
 
 def extract_text_from_file(file_path: Union[str, Path], file_mime_type: str) -> FileToTextResult:
+    """
+    Extract text from various file formats, reusing the cached result for unchanged file content.
+    
+    Args:
+        file_path: Path to the file
+        file_mime_type: MIME type of the file
+        
+    Returns:
+        FileToTextResult with extracted text and metadata
+    """
+    content_hash = get_content_hash(Path(file_path).read_bytes())
+    return cached_extraction(
+        f"file:{file_mime_type}",
+        content_hash,
+        lambda: run_text_extraction(file_path, file_mime_type),
+        should_cache=lambda result: bool(result.text),
+    )
+
+
+def run_text_extraction(file_path: Union[str, Path], file_mime_type: str) -> FileToTextResult:
     """
     Extract text from various file formats (PDF, DOCX, images, etc.)
     
@@ -223,11 +248,9 @@ def extract_text_from_pdf(file_path: Union[str, Path]) -> str:
     # Try PDF text extraction first (using PyPDF2 or pdfminer)
     try:
         import PyPDF2
-        text = ""
         with open(file_path, 'rb') as file:
             reader = PyPDF2.PdfReader(file)
-            for page_num in range(len(reader.pages)):
-                text += reader.pages[page_num].extract_text() or ""
+            text = "".join(page.extract_text() or "" for page in reader.pages)
                 
         # If text extraction yields very little text, use OCR as fallback
         if len(text.strip()) < 100:
@@ -244,7 +267,7 @@ def extract_text_from_pdf(file_path: Union[str, Path]) -> str:
 
 def process_pdf_with_ocr(file_path: Union[str, Path]) -> Tuple[str, Optional[Dict]]:
     """
-    Process PDF with OCR by converting to images first.
+    Process PDF with OCR, rasterizing and reading the pages in parallel worker processes.
     
     Args:
         file_path: Path to the PDF file
@@ -252,24 +275,16 @@ def process_pdf_with_ocr(file_path: Union[str, Path]) -> Tuple[str, Optional[Dic
     Returns:
         Tuple of (extracted text, OCR response)
     """
-    # Convert PDF to images
     try:
-        images = convert_from_path(
+        text = ocr_pdf(
             file_path,
-            dpi=OCR_CONFIGURATION["dpi"]
+            dpi=OCR_CONFIGURATION["dpi"],
+            lang="+".join(OCR_CONFIGURATION["language_hints"]),
+            max_pages=OCR_CONFIGURATION["max_pdf_pages"],
+            timeout=OCR_CONFIGURATION["timeout_seconds"],
+            max_workers=ai_settings.OCR_MAX_WORKERS,
         )
-        
-        full_text = ""
-        for i, image in enumerate(images):
-            # Process each page with OCR
-            text = pytesseract.image_to_string(
-                image, 
-                lang="+".join(OCR_CONFIGURATION["language_hints"]),
-                config='--psm 1'  # Page segmentation mode 1: Auto page segmentation with OSD
-            )
-            full_text += f"\n{text.strip()}"
-            
-        return full_text.strip(), None
+        return text.strip(), None
         
     except Exception as e:
         logger.error(f"Error processing PDF with OCR: {e}")
@@ -366,6 +381,9 @@ def load_section_classifier():
     return _SECTION_CLASSIFIER
 
 
+model_registry.register("section_classifier", load_section_classifier)
+
+
 def segment_resume_into_sections(text: str, language: str = "en") -> Dict[ResumeSection, str]:
     """
     Segment a resume into different sections using NLP techniques.
@@ -391,50 +409,93 @@ def segment_resume_into_sections(text: str, language: str = "en") -> Dict[Resume
     return segment_with_rules(text, language)
 
 
-def segment_with_model(text: str, classifier_tuple: Tuple, language: str) -> Dict[ResumeSection, str]:
+def classify_paragraphs(paragraphs: List[str], classifier_tuple: Tuple) -> List[int]:
     """
-    Segment resume using the trained section classifier model.
+    Predict the section class index of every paragraph with the section classifier.
+    
+    Paragraphs are sorted by length and classified in padded batches of at most
+    SECTION_CLASSIFIER_BATCH_SIZE, so each forward pass carries little padding.
     
     Args:
-        text: The resume text
+        paragraphs: Paragraphs to classify
         classifier_tuple: Tuple containing (tokenizer, model)
-        language: Language code
         
     Returns:
-        Dictionary mapping sections to their text content
+        Predicted class indexes, in the order of the given paragraphs
     """
     tokenizer, model = classifier_tuple
-    sections = {}
+    batch_size = ai_settings.SECTION_CLASSIFIER_BATCH_SIZE
+    order = sorted(range(len(paragraphs)), key=lambda index: len(paragraphs[index]))
+    predictions = [0] * len(paragraphs)
+    
+    with torch.inference_mode():
+        for start in range(0, len(order), batch_size):
+            indexes = order[start:start + batch_size]
+            inputs = tokenizer(
+                [paragraphs[index] for index in indexes],
+                return_tensors="pt",
+                truncation=True,
+                max_length=512,
+                padding=True,
+            )
+            predicted_classes = model(**inputs).logits.argmax(-1).tolist()
+            for index, predicted_class in zip(indexes, predicted_classes):
+                predictions[index] = predicted_class
     
-    # Split text into paragraphs
-    paragraphs = [p for p in text.split('\n\n') if p.strip()]
+    return predictions
+
+
+def segment_many_with_model(texts: List[str], classifier_tuple: Tuple, language: str) -> List[Dict[ResumeSection, str]]:
+    """
+    Segment several resumes at once, classifying the paragraphs of all of them together.
     
-    # Process each paragraph to determine its section
-    for paragraph in paragraphs:
-        if len(paragraph.strip()) < 3:  # Skip very short paragraphs
+    Args:
+        texts: The resume texts
+        classifier_tuple: Tuple containing (tokenizer, model)
+        language: Language code
+        
+    Returns:
+        One dictionary mapping sections to their text content per resume
+    """
+    # Split texts into paragraphs, skipping very short ones
+    paragraphs = [
+        (text_index, paragraph)
+        for text_index, text in enumerate(texts)
+        for paragraph in text.split('\n\n')
+        if len(paragraph.strip()) >= 3
+    ]
+    predictions = classify_paragraphs([paragraph for _, paragraph in paragraphs], classifier_tuple)
+    
+    section_keys = list(ResumeSection)
+    results = [{} for _ in texts]
+    for (text_index, paragraph), predicted_class in zip(paragraphs, predictions):
+        if predicted_class >= len(section_keys):
             continue
-            
-        # Tokenize the paragraph
-        inputs = tokenizer(paragraph, return_tensors="pt", truncation=True, max_length=512)
-        
-        # Get model predictions
-        with torch.no_grad():
-            outputs = model(**inputs)
-            logits = outputs.logits
-            predicted_class = logits.argmax(-1).item()
-        
-        # Map class index to section
-        section_keys = list(ResumeSection)
-        if predicted_class < len(section_keys):
-            section = section_keys[predicted_class]
-            
-            # Append to existing section or create new
-            if section in sections:
-                sections[section] += "\n\n" + paragraph
-            else:
-                sections[section] = paragraph
+        
+        # Append to existing section or create new
+        sections = results[text_index]
+        section = section_keys[predicted_class]
+        if section in sections:
+            sections[section] += "\n\n" + paragraph
+        else:
+            sections[section] = paragraph
     
-    return sections
+    return results
+
+
+def segment_with_model(text: str, classifier_tuple: Tuple, language: str) -> Dict[ResumeSection, str]:
+    """
+    Segment resume using the trained section classifier model.
+    
+    Args:
+        text: The resume text
+        classifier_tuple: Tuple containing (tokenizer, model)
+        language: Language code
+        
+    Returns:
+        Dictionary mapping sections to their text content
+    """
+    return segment_many_with_model([text], classifier_tuple, language)[0]
 
 
 def segment_with_rules(text: str, language: str) -> Dict[ResumeSection, str]:
@@ -557,6 +618,9 @@ def load_ner_model(language: str = "en"):
             return _LANGUAGE_MODELS["en"]
 
 
+model_registry.register("ner", load_ner_model)
+
+
 def extract_entities(text: str, sections: Dict[ResumeSection, str], language: str = "en") -> List[Entity]:
     """
     Extract entities from resume text using NER.
@@ -908,6 +972,56 @@ def load_skill_standardizer():
     return _SKILL_STANDARDIZER, _EMBEDDING_MODEL
 
 
+@lru_cache(maxsize=1)
+def get_standard_skill_embeddings(embedding_model) -> Tuple[List[str], torch.Tensor]:
+    """
+    Encode the standard skill terms once per embedding model.
+    
+    Args:
+        embedding_model: The sentence transformer used for skill standardization
+        
+    Returns:
+        Tuple of (standard skill terms, their normalized embeddings)
+    """
+    standard_skills = list(SKILL_STANDARDIZATION_EXAMPLES.keys())
+    embeddings = embedding_model.encode(standard_skills, convert_to_tensor=True, normalize_embeddings=True)
+    return standard_skills, embeddings
+
+
+def warm_up_skill_standardizer():
+    """Load the skill standardizer and encode the standard skill terms."""
+    _, embedding_model = load_skill_standardizer()
+    if embedding_model is not None:
+        get_standard_skill_embeddings(embedding_model)
+
+
+model_registry.register("skill_standardizer", warm_up_skill_standardizer)
+
+
+def match_standard_skills(skill_texts: List[str], embedding_model) -> List[Tuple[Optional[str], float]]:
+    """
+    Find the most similar standard skill term of every skill text.
+    
+    All skill texts are encoded in one batch and compared to the standard skill embeddings
+    with a single matrix multiplication.
+    
+    Args:
+        skill_texts: Skill texts that are not in the skill mapping dictionary
+        embedding_model: The sentence transformer used for skill standardization
+        
+    Returns:
+        (best match, similarity) per skill text, with no match below SKILL_MAPPING_CONFIDENCE
+    """
+    standard_skills, standard_embeddings = get_standard_skill_embeddings(embedding_model)
+    skill_embeddings = embedding_model.encode(skill_texts, convert_to_tensor=True, normalize_embeddings=True)
+    similarities, best_indexes = (skill_embeddings @ standard_embeddings.T).max(dim=1)
+    
+    return [
+        (standard_skills[index], similarity) if similarity > SKILL_MAPPING_CONFIDENCE else (None, similarity)
+        for similarity, index in zip(similarities.tolist(), best_indexes.tolist())
+    ]
+
+
 def standardize_skills(entities: List[Entity], language: str = "en") -> List[Entity]:
     """
     Standardize skill entities to normalized terms.
@@ -922,50 +1036,36 @@ def standardize_skills(entities: List[Entity], language: str = "en") -> List[Ent
     # Load skill standardizer
     skill_map, embedding_model = load_skill_standardizer()
     
+    unmatched_entities = []
     for entity in entities:
-        if entity.entity_type == EntityType.SKILL:
-            skill_text = entity.text.lower()
-            
-            # First check if the skill is in our mapping dictionary
-            if skill_text in skill_map:
-                entity.normalized_value = skill_map[skill_text]
-                continue
-                
-            # If not found in the dictionary, use semantic similarity
-            if embedding_model is not None:
-                try:
-                    # Get embedding for the skill text
-                    skill_embedding = embedding_model.encode(skill_text, convert_to_tensor=True)
-                    
-                    # Find most similar standard skill term
-                    max_similarity = -1
-                    best_match = None
-                    
-                    for standard_skill in SKILL_STANDARDIZATION_EXAMPLES.keys():
-                        # Get embedding for standard skill
-                        standard_embedding = embedding_model.encode(standard_skill, convert_to_tensor=True)
-                        
-                        # Calculate cosine similarity
-                        similarity = util.pytorch_cos_sim(skill_embedding, standard_embedding).item()
-                        
-                        if similarity > max_similarity and similarity > SKILL_MAPPING_CONFIDENCE:
-                            max_similarity = similarity
-                            best_match = standard_skill
-                    
-                    if best_match:
-                        entity.normalized_value = best_match
-                        # Also update confidence based on similarity
-                        entity.confidence *= max_similarity
-                    else:
-                        # Keep original if no good match found
-                        entity.normalized_value = entity.text
-                        
-                except Exception as e:
-                    logger.warning(f"Skill standardization with embedding model failed: {e}")
-                    entity.normalized_value = entity.text
-            else:
-                # Fallback if embedding model not available
-                entity.normalized_value = entity.text
+        if entity.entity_type != EntityType.SKILL:
+            continue
+        
+        # First check if the skill is in our mapping dictionary
+        if (skill_text := entity.text.lower()) in skill_map:
+            entity.normalized_value = skill_map[skill_text]
+        else:
+            unmatched_entities.append(entity)
+    
+    # Keep original text if no good match is found
+    for entity in unmatched_entities:
+        entity.normalized_value = entity.text
+    
+    # If not found in the dictionary, use semantic similarity
+    if embedding_model is None or not unmatched_entities:
+        return entities
+    
+    try:
+        matches = match_standard_skills([entity.text.lower() for entity in unmatched_entities], embedding_model)
+    except Exception as e:
+        logger.warning(f"Skill standardization with embedding model failed: {e}")
+        return entities
+    
+    for entity, (best_match, similarity) in zip(unmatched_entities, matches):
+        if best_match:
+            entity.normalized_value = best_match
+            # Also update confidence based on similarity
+            entity.confidence *= similarity
     
     return entities
 
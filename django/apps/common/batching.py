@@ -0,0 +1,59 @@
+import threading
+from functools import partial
+from typing import Callable, Dict, Hashable, Iterable, Set, Tuple
+
+from django.db import transaction
+
+
+class OnCommitBatch:
+    """
+    Collects items during a transaction and hands them to ``flush`` once, after the commit.
+
+    Items are kept per thread and per atomic block, so concurrent requests never flush each other's
+    items. The first item added in a block registers an ``on_commit`` callback that owns the block's
+    set; when the block is rolled back, Django drops the callback and its items are never flushed.
+    """
+
+    def __init__(self, flush: Callable[[Set[Hashable]], None]):
+        self.flush = flush
+        self.local = threading.local()
+
+    @property
+    def pending(self) -> Dict[Tuple[str, ...], Tuple[Callable, Set[Hashable]]]:
+        """Callback and items of the blocks of the current transaction, by savepoint ids."""
+
+        if not hasattr(self.local, "batches"):
+            self.local.batches = {}
+        return self.local.batches
+
+    def add(self, *items: Hashable):
+        self.extend(items)
+
+    def extend(self, items: Iterable[Hashable]):
+        connection = transaction.get_connection()
+        if not connection.in_atomic_block:
+            if items := set(items):
+                self.flush(items)
+            return
+
+        registered = [func for _, func, _ in connection.run_on_commit]
+        callback, batch = self.pending.get(block := tuple(connection.savepoint_ids), (None, None))
+        if not any(func is callback for func in registered):
+            # Batches whose callback is gone were rolled back
+            self.local.batches = {
+                key: entry
+                for key, entry in self.pending.items()
+                if any(entry[0] is registered_func for registered_func in registered)
+            }
+            batch = set()
+            callback = partial(self.run, batch)
+            self.pending[block] = (callback, batch)
+            transaction.on_commit(callback)
+
+        batch.update(items)
+
+    def run(self, batch: Set[Hashable]):
+        # The transaction is over, its other batches are either rolled back or flushed by their own callbacks
+        self.pending.clear()
+        if batch:
+            self.flush(set(batch))
@@ -0,0 +1,87 @@
+from collections import defaultdict
+from typing import Any, ClassVar, Dict, Hashable, Iterable, List, Set
+
+from graphql_auth.queries import CountableConnection
+
+from django.db.models import Model, QuerySet
+from django.db.models.lookups import In
+
+from .utils import fj
+
+
+class DataLoader:
+    """
+    Request-scoped, batching loader of values by key.
+
+    GraphQL resolvers run synchronously and depth-first, so a loader cannot wait for sibling
+    nodes to ask for their keys. Instead, keys are primed with the ids of a whole page of nodes
+    (see ``BatchLoadedConnection``) and the first ``load`` fetches all primed keys at once.
+    Keys that were not primed are loaded alone, which keeps the loader correct outside connections.
+    """
+
+    CONTEXT_ATTRIBUTE = "dataloaders"
+
+    def __init__(self):
+        self.cache: Dict[Hashable, Any] = {}
+        self.pending: Set[Hashable] = set()
+
+    @classmethod
+    def for_context(cls, context) -> "DataLoader":
+        if (loaders := getattr(context, cls.CONTEXT_ATTRIBUTE, None)) is None:
+            loaders = {}
+            setattr(context, cls.CONTEXT_ATTRIBUTE, loaders)
+
+        if (loader := loaders.get(cls)) is None:
+            loader = loaders[cls] = cls()
+        return loader
+
+    def batch_load(self, keys: List[Hashable]) -> Dict[Hashable, Any]:
+        raise NotImplementedError("This method should be overridden by subclasses.")
+
+    def get_default(self) -> Any:
+        return None
+
+    def prime(self, keys: Iterable[Hashable]):
+        self.pending.update(key for key in keys if key not in self.cache)
+
+    def load(self, key: Hashable) -> Any:
+        if key not in self.cache:
+            keys, self.pending = list(self.pending | {key}), set()
+            results = self.batch_load(keys)
+            self.cache.update({key: results.get(key, self.get_default()) for key in keys})
+
+        return self.cache[key]
+
+
+class RelatedObjectsLoader(DataLoader):
+    """Loads the objects of ``queryset`` grouped by the value of ``related_field`` (e.g. a reverse foreign key)."""
+
+    related_field: ClassVar[str]
+
+    def get_queryset(self) -> QuerySet:
+        raise NotImplementedError("This method should be overridden by subclasses.")
+
+    def get_default(self) -> List[Model]:
+        return []
+
+    def batch_load(self, keys: List[Hashable]) -> Dict[Hashable, List[Model]]:
+        attname = self.get_queryset().model._meta.get_field(self.related_field).attname
+        results = defaultdict(list)
+        for obj in self.get_queryset().filter(**{fj(self.related_field, In.lookup_name): keys}):
+            results[getattr(obj, attname)].append(obj)
+        return results
+
+
+class BatchLoadedConnection(CountableConnection):
+    """Connection that primes the ``batch_loaders`` of its node type with the ids of the page's nodes."""
+
+    class Meta:
+        abstract = True
+
+    def resolve_edges(self, info):
+        node_type = type(self)._meta.node
+        keys = [edge.node.pk for edge in self.edges]
+        for loader_class in getattr(node_type, "batch_loaders", ()):
+            loader_class.for_context(info.context).prime(keys)
+
+        return self.edges
@@ -0,0 +1,223 @@
+import asyncio
+import os
+import random
+import threading
+import time
+import weakref
+from typing import Any, ClassVar, Dict, NoReturn, Optional, Type
+
+import httpx
+
+from .logging import get_logger
+
+logger = get_logger()
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+# Errors raised before the request was sent, the provider has not seen it
+UNSENT_REQUEST_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the provider while its circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Fails fast after ``failure_threshold`` consecutive failures of a provider.
+
+    Once ``recovery_timeout`` seconds passed, a single trial request is let through: its success
+    closes the circuit and its failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, recovery_timeout: float, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def allow_request(self) -> bool:
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+
+            if self.state == self.OPEN and self.clock() - self.opened_at >= self.recovery_timeout:
+                self.state = self.HALF_OPEN
+                return True
+
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+
+
+class HttpClientConfig:
+    timeout: float = 10.0
+    # Timeouts of the slower endpoints, by endpoint path
+    endpoint_timeouts: Dict[str, float] = {}
+    max_retries: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 8.0
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    failure_threshold: int = 5
+    recovery_timeout: float = 30.0
+
+    @classmethod
+    def get_client_kwargs(cls) -> Optional[Dict[str, Any]]:
+        """Keyword arguments of the ``httpx`` clients (e.g. ``base_url`` and ``headers``), ``None`` if not configured."""
+
+        raise NotImplementedError("This method should be overridden by subclasses.")
+
+
+class BaseHttpClient:
+    """
+    Core of the integration clients.
+
+    The ``httpx`` clients and their connection pools live as long as the process (and are rebuilt
+    after a fork). Transport errors, 429 and 5xx responses of idempotent requests are retried with
+    exponential backoff and jitter, and a circuit breaker makes calls fail fast while the provider is down.
+    Other requests (e.g. a POST creating an order) are only retried when the call passes
+    ``retry_unsent=True``, and then only if they could not be sent at all.
+    """
+
+    config: ClassVar[Type[HttpClientConfig]]
+    request_exception: ClassVar[Type[Exception]] = Exception
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.breaker = CircuitBreaker(self.config.failure_threshold, self.config.recovery_timeout)
+        self.pid = None
+        self._client = None
+        self._async_clients = weakref.WeakKeyDictionary()
+
+    def get_client_kwargs(self) -> Optional[Dict[str, Any]]:
+        if (client_kwargs := self.config.get_client_kwargs()) is None:
+            return None
+
+        return {
+            "timeout": self.config.timeout,
+            "limits": httpx.Limits(
+                max_connections=self.config.max_connections,
+                max_keepalive_connections=self.config.max_keepalive_connections,
+            ),
+            **client_kwargs,
+        }
+
+    def reset_after_fork(self):
+        if self.pid != os.getpid():
+            self.pid = os.getpid()
+            self._client = None
+            self._async_clients = weakref.WeakKeyDictionary()
+
+    @property
+    def client(self) -> Optional[httpx.Client]:
+        with self.lock:
+            self.reset_after_fork()
+            if self._client is None and (client_kwargs := self.get_client_kwargs()) is not None:
+                self._client = httpx.Client(**client_kwargs)
+            return self._client
+
+    @property
+    def async_client(self) -> Optional[httpx.AsyncClient]:
+        # Async connections are bound to the event loop that opened them
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            self.reset_after_fork()
+            if loop not in self._async_clients and (client_kwargs := self.get_client_kwargs()) is not None:
+                self._async_clients[loop] = httpx.AsyncClient(**client_kwargs)
+            return self._async_clients.get(loop)
+
+    def get_timeout(self, endpoint: str) -> float:
+        return self.config.endpoint_timeouts.get(endpoint.split("?", 1)[0], self.config.timeout)
+
+    def get_retry_delay(self, attempt: int, error: Exception) -> float:
+        delay = random.uniform(0, self.config.backoff_base * 2**attempt)
+        if (
+            isinstance(error, httpx.HTTPStatusError)
+            and (retry_after := error.response.headers.get("Retry-After", "")).isdigit()
+        ):
+            delay = max(delay, float(retry_after))
+        return min(delay, self.config.backoff_max)
+
+    def is_provider_failure(self, error: Exception) -> bool:
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code in RETRYABLE_STATUS_CODES
+        return isinstance(error, httpx.TransportError)
+
+    def is_retryable(self, method: str, error: Exception, retry_unsent: bool = False) -> bool:
+        if method.upper() in IDEMPOTENT_METHODS:
+            return self.is_provider_failure(error)
+        # The provider may have handled the request already, sending it again could e.g. create a second order
+        return retry_unsent and isinstance(error, UNSENT_REQUEST_ERRORS)
+
+    def raise_request_exception(self, endpoint: str, error: Exception) -> NoReturn:
+        raise self.request_exception(f"Request to {endpoint} failed") from error
+
+    def check_request(self, endpoint: str, client: Optional[httpx.Client | httpx.AsyncClient]):
+        if client is None:
+            raise self.request_exception(f"{type(self).__name__} is not configured")
+
+        if not self.breaker.allow_request():
+            self.raise_request_exception(
+                endpoint, CircuitOpenError(f"Circuit breaker of {type(self).__name__} is open")
+            )
+
+    def handle_error(self, method: str, endpoint: str, attempt: int, error: Exception, retry_unsent: bool) -> float:
+        """Record the failed attempt and return the delay before the next one, raise if it should not be retried."""
+
+        if not self.is_provider_failure(error):
+            # The provider answered, the request itself is wrong
+            self.breaker.record_success()
+            self.raise_request_exception(endpoint, error)
+
+        self.breaker.record_failure()
+        if not self.is_retryable(method, error, retry_unsent) or attempt + 1 >= self.config.max_retries:
+            self.raise_request_exception(endpoint, error)
+
+        delay = self.get_retry_delay(attempt, error)
+        logger.warning(
+            f"Retrying request to {endpoint} in {delay:.2f}s due to {error!r}, "
+            f"attempt {attempt + 1}/{self.config.max_retries}"
+        )
+        return delay
+
+    def send_request(self, method: str, endpoint: str, retry_unsent: bool = False, **kwargs) -> httpx.Response:
+        for attempt in range(self.config.max_retries):
+            self.check_request(endpoint, client := self.client)
+            try:
+                response = client.request(method, endpoint, timeout=self.get_timeout(endpoint), **kwargs)
+                response.raise_for_status()
+            except (httpx.RequestError, httpx.HTTPStatusError) as e:
+                time.sleep(self.handle_error(method, endpoint, attempt, e, retry_unsent))
+            else:
+                self.breaker.record_success()
+                return response
+
+    async def asend_request(self, method: str, endpoint: str, retry_unsent: bool = False, **kwargs) -> httpx.Response:
+        for attempt in range(self.config.max_retries):
+            self.check_request(endpoint, client := self.async_client)
+            try:
+                response = await client.request(method, endpoint, timeout=self.get_timeout(endpoint), **kwargs)
+                response.raise_for_status()
+            except (httpx.RequestError, httpx.HTTPStatusError) as e:
+                await asyncio.sleep(self.handle_error(method, endpoint, attempt, e, retry_unsent))
+            else:
+                self.breaker.record_success()
+                return response
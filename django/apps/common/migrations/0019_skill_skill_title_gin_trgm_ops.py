@@ -0,0 +1,19 @@
+# Generated by Django 5.1.6 on 2026-10-18 10:00
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("common", "0018_field_field_name_gin_trgm_ops_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="skill",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["title"], name="skill_title_gin_trgm_ops", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+    ]
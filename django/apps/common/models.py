@@ -123,6 +123,7 @@ class Skill(models.Model):
     class Meta:
         verbose_name = _("Skill")
         verbose_name_plural = _("Skills")
+        indexes = [GinIndex(fields=["title"], name="skill_title_gin_trgm_ops", opclasses=["gin_trgm_ops"])]
 
     def __str__(self):
         return self.title
@@ -0,0 +1,207 @@
+import asyncio
+import threading
+import time
+from unittest import mock
+
+import httpx
+
+from django.db import transaction
+from django.test import SimpleTestCase, TransactionTestCase
+
+from .batching import OnCommitBatch
+from .http_client import (
+    BaseHttpClient,
+    CircuitBreaker,
+    CircuitOpenError,
+    HttpClientConfig,
+)
+
+
+class ProviderException(Exception):
+    pass
+
+
+class StandInProvider:
+    """Stand-in provider behind an ``httpx.MockTransport``, answering with the queued responses."""
+
+    def __init__(self, *responses, latency: float = 0.0):
+        self.responses = list(responses)
+        self.latency = latency
+        self.calls = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        threading.Event().wait(self.latency)
+        response = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def get_stand_in_client(provider: StandInProvider, **config) -> BaseHttpClient:
+    class StandInConfig(HttpClientConfig):
+        @classmethod
+        def get_client_kwargs(cls):
+            return {"base_url": "https://provider.test/", "transport": httpx.MockTransport(provider)}
+
+    for name, value in config.items():
+        setattr(StandInConfig, name, value)
+
+    class StandInClient(BaseHttpClient):
+        request_exception = ProviderException
+
+    StandInClient.config = StandInConfig
+    return StandInClient()
+
+
+@mock.patch("common.http_client.time.sleep")
+class BaseHttpClientTestCase(SimpleTestCase):
+    def test_retries_server_errors_with_backoff(self, sleep_mock):
+        provider = StandInProvider(httpx.Response(503), httpx.Response(502), httpx.Response(200, json={}))
+        client = get_stand_in_client(provider, backoff_base=1.0, backoff_max=3.0)
+
+        self.assertEqual(client.send_request("GET", "status").status_code, 200)
+        self.assertEqual(provider.calls, 3)
+        delays = [call.args[0] for call in sleep_mock.call_args_list]
+        self.assertEqual(len(delays), 2)
+        self.assertTrue(0 <= delays[0] <= 1.0 and 0 <= delays[1] <= 2.0)
+
+    def test_retries_connection_errors_and_rate_limits(self, sleep_mock):
+        provider = StandInProvider(
+            httpx.ConnectError("Connection refused"),
+            httpx.Response(429, headers={"Retry-After": "2"}),
+            httpx.Response(200, json={}),
+        )
+        client = get_stand_in_client(provider, max_retries=3)
+
+        self.assertEqual(client.send_request("GET", "status").status_code, 200)
+        self.assertGreaterEqual(sleep_mock.call_args_list[1].args[0], 2)
+
+    def test_client_errors_are_not_retried(self, sleep_mock):
+        provider = StandInProvider(httpx.Response(400))
+        client = get_stand_in_client(provider)
+
+        with self.assertRaises(ProviderException):
+            client.send_request("POST", "order")
+        self.assertEqual(provider.calls, 1)
+        self.assertEqual(client.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_non_idempotent_requests_are_not_retried(self, sleep_mock):
+        provider = StandInProvider(httpx.Response(503), httpx.Response(200, json={}))
+        client = get_stand_in_client(provider, failure_threshold=1)
+
+        with self.assertRaises(ProviderException):
+            client.send_request("POST", "order")
+        self.assertEqual(provider.calls, 1)
+        self.assertEqual(client.breaker.state, CircuitBreaker.OPEN)
+
+    def test_unsent_requests_are_retried_on_demand(self, sleep_mock):
+        provider = StandInProvider(httpx.ConnectError("Connection refused"), httpx.Response(200, json={}))
+        client = get_stand_in_client(provider)
+
+        self.assertEqual(client.send_request("POST", "order", retry_unsent=True).status_code, 200)
+        self.assertEqual(provider.calls, 2)
+
+        for error in (httpx.ReadTimeout("Timed out"), httpx.Response(502)):
+            provider = StandInProvider(error, httpx.Response(200, json={}))
+            client = get_stand_in_client(provider)
+            with self.assertRaises(ProviderException):
+                client.send_request("POST", "order", retry_unsent=True)
+            self.assertEqual(provider.calls, 1)
+
+    def test_endpoint_timeouts(self, sleep_mock):
+        timeouts = []
+
+        def provider(request):
+            timeouts.append(request.extensions["timeout"]["read"])
+            return httpx.Response(200, json={})
+
+        client = get_stand_in_client(provider, timeout=5.0, endpoint_timeouts={"order": 30.0})
+        client.send_request("GET", "status?orderId=1")
+        client.send_request("POST", "order")
+
+        self.assertListEqual(timeouts, [5.0, 30.0])
+
+    def test_connection_pool_is_reused(self, sleep_mock):
+        client = get_stand_in_client(StandInProvider(httpx.Response(200, json={})))
+        pool = client.client
+
+        self.assertIs(client.client, pool)
+        with mock.patch("common.http_client.os.getpid", return_value=-1):
+            self.assertIsNot(client.client, pool)
+
+    def test_breaker_fails_fast_during_outage(self, sleep_mock):
+        provider = StandInProvider(httpx.ConnectError("Connection refused"), latency=0.05)
+        client = get_stand_in_client(provider, max_retries=2, failure_threshold=4, recovery_timeout=60.0)
+
+        for _ in range(2):
+            with self.assertRaises(ProviderException):
+                client.send_request("GET", "status")
+        self.assertEqual(client.breaker.state, CircuitBreaker.OPEN)
+        calls = provider.calls
+
+        durations = []
+        for _ in range(50):
+            started = time.perf_counter()
+            with self.assertRaises(ProviderException) as context:
+                client.send_request("GET", "status")
+            durations.append(time.perf_counter() - started)
+            self.assertIsInstance(context.exception.__cause__, CircuitOpenError)
+
+        self.assertEqual(provider.calls, calls)
+        self.assertLess(max(durations), provider.latency / 5)
+
+    def test_breaker_recovers_after_timeout(self, sleep_mock):
+        provider = StandInProvider(httpx.Response(503), httpx.Response(200, json={}))
+        client = get_stand_in_client(provider, max_retries=1, failure_threshold=1, recovery_timeout=30.0)
+        clock = mock.Mock(return_value=100.0)
+        client.breaker.clock = clock
+
+        with self.assertRaises(ProviderException):
+            client.send_request("GET", "status")
+        with self.assertRaises(ProviderException):
+            client.send_request("GET", "status")
+        self.assertEqual(provider.calls, 1)
+
+        clock.return_value = 130.0
+        self.assertEqual(client.send_request("GET", "status").status_code, 200)
+        self.assertEqual(client.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_async_requests(self, sleep_mock):
+        provider = StandInProvider(httpx.Response(500), httpx.Response(200, json={"ok": True}))
+        client = get_stand_in_client(provider)
+
+        with mock.patch("common.http_client.asyncio.sleep", new=mock.AsyncMock()) as async_sleep_mock:
+            response = asyncio.run(client.asend_request("GET", "status"))
+
+        self.assertDictEqual(response.json(), {"ok": True})
+        self.assertEqual(async_sleep_mock.await_count, 1)
+
+
+class OnCommitBatchTestCase(TransactionTestCase):
+    def setUp(self):
+        self.flushed = []
+        self.batch = OnCommitBatch(self.flushed.append)
+
+    def test_items_are_flushed_once_after_commit(self):
+        with transaction.atomic():
+            self.batch.add(1, 2)
+            self.batch.extend([2, 3])
+            self.assertListEqual(self.flushed, [])
+
+        self.assertListEqual(self.flushed, [{1, 2, 3}])
+
+    def test_rolled_back_items_are_not_flushed(self):
+        with self.assertRaises(ValueError), transaction.atomic():
+            self.batch.add(1)
+            raise ValueError
+
+        with transaction.atomic():
+            self.batch.add(2)
+            with self.assertRaises(ValueError), transaction.atomic():
+                self.batch.add(3)
+                raise ValueError
+            self.batch.add(4)
+
+        self.assertListEqual(self.flushed, [{2, 4}])
+        self.assertDictEqual(self.batch.pending, {})
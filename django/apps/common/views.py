@@ -71,6 +71,13 @@ class TemplateReportView(FlexAdminBaseView, BaseReportView):
     def get_admin_title(self):
         return self.get_template().title
 
+    def get_report_qs(self):
+        report_qs = super().get_report_qs()
+        if hasattr(report_qs, "with_annotations"):
+            # Annotations are computed only for the columns of the template
+            report_qs = report_qs.with_annotations(*(column.title for column in self.template_columns))
+        return report_qs
+
 
 class TemplateCreateInitView(FlexAdminBaseView, BaseTemplateCreateInitView):
     admin_title = _("Template Wizard")
@@ -8,7 +8,7 @@ from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 
 from .models import JobAssessment, JobAssessmentResult, JobAssessmentResultReportFile
-from .tasks import download_report_file_task
+from .tasks import create_assessment_order_task, download_report_file_task
 
 
 class JobAssessmentInline(admin.TabularInline):
@@ -39,6 +39,15 @@ class JobAssessmentResultAdmin(admin.ModelAdmin):
 
         self.message_user(request, _("Report file download task has been scheduled."))
 
+    @admin.action(description=_("Create Pending Orders"))
+    def create_pending_orders(self, request, queryset: QuerySet[JobAssessmentResult]):
+        for job_assessment_result_id in queryset.filter(
+            **{fj(JobAssessmentResult.order_status): JobAssessmentResult.OrderStatus.PENDING}
+        ).values_list(JobAssessmentResult._meta.pk.attname, flat=True):
+            create_assessment_order_task.delay(job_assessment_result_id)
+
+        self.message_user(request, _("Order creation task has been scheduled."))
+
     @admin.display(description=_("Report URL"))
     def report_url_tag(self, obj):
         report_url = obj.report_url
@@ -62,10 +71,11 @@ class JobAssessmentResultAdmin(admin.ModelAdmin):
         JobAssessmentResult.score.field.name,
         JobAssessmentResult.raw_status.field.name,
         JobAssessmentResult.status.field.name,
+        JobAssessmentResult.order_status.field.name,
         JobAssessmentResult.created_at.field.name,
         JobAssessmentResult.updated_at.field.name,
     )
-    actions = [download_report_files.__name__]
+    actions = [download_report_files.__name__, create_pending_orders.__name__]
     search_fields = (
         fj(JobAssessmentResult.user, User.email),
         fj(JobAssessmentResult.job_assessment, JobAssessment.title),
@@ -73,6 +83,7 @@ class JobAssessmentResultAdmin(admin.ModelAdmin):
     )
     list_filter = (
         JobAssessmentResult.status.field.name,
+        JobAssessmentResult.order_status.field.name,
         JobAssessmentResult.created_at.field.name,
         JobAssessmentResult.updated_at.field.name,
     )
@@ -80,6 +91,7 @@ class JobAssessmentResultAdmin(admin.ModelAdmin):
         JobAssessmentResult.score.field.name,
         JobAssessmentResult.status.field.name,
         JobAssessmentResult.order_id.field.name,
+        JobAssessmentResult.order_status.field.name,
         report_url_tag.__name__,
         report_file_tag.__name__,
     )
@@ -20,7 +20,11 @@ class CriteriaClient(BaseCriteriaClient):
 
     def create_order(self, order_data: CreateOrderRequest) -> CreateOrderResponse:
         return self._make_request(
-            "POST", "order", model=CreateOrderResponse, json=order_data.model_dump(exclude_unset=True)
+            "POST",
+            "order",
+            model=CreateOrderResponse,
+            json=order_data.model_dump(exclude_unset=True),
+            retry_unsent=True,
         )
 
     def get_status(self, order_id: GetStatusRequest) -> GetStatusResponse:
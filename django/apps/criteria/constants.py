@@ -1 +1,13 @@
 CRITERIA_REPORT_FILE_DOWNLOAD_RETRY_ATTEMPTS = 5
+CRITERIA_REPORT_BROWSER_POOL_SIZE = 2
+CRITERIA_REPORT_PAGE_TIMEOUT = 60
+CRITERIA_REPORT_DOWNLOAD_TIMEOUT = 30
+# Longest wait for a busy browser session, a little over one page load and download
+CRITERIA_REPORT_BROWSER_ACQUIRE_TIMEOUT = 2 * CRITERIA_REPORT_PAGE_TIMEOUT
+# Longest expected order creation (retries included), older claims of a pending order are taken over
+CRITERIA_ORDER_CLAIM_TIMEOUT = 5 * 60
+CRITERIA_WEBHOOK_INBOX_BATCH_SIZE = 500
+CRITERIA_WEBHOOK_INBOX_SCHEDULED_CACHE_KEY = "criteria-webhook-inbox-scheduled"
+# Upper bound of a lost processing task, the next callback schedules a new one afterwards
+CRITERIA_WEBHOOK_INBOX_SCHEDULED_TIMEOUT = 5 * 60
+CRITERIA_RESULT_TIMEOUT_BATCH_SIZE = 1000
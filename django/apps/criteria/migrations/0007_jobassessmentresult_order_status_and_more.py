@@ -0,0 +1,33 @@
+# Generated by Django 5.1.6 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('criteria', '0006_jobassessmentresultreportfile_created_and_more'),
+    ]
+
+    operations = [
+        # Orders of the existing results were created synchronously
+        migrations.AddField(
+            model_name='jobassessmentresult',
+            name='order_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('created', 'Created'), ('failed', 'Failed')], default='created', max_length=16, verbose_name='Order Status'),
+        ),
+        migrations.AlterField(
+            model_name='jobassessmentresult',
+            name='order_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('created', 'Created'), ('failed', 'Failed')], default='pending', max_length=16, verbose_name='Order Status'),
+        ),
+        migrations.AddField(
+            model_name='jobassessmentresult',
+            name='assessment_access_url',
+            field=models.URLField(blank=True, editable=False, max_length=2048, null=True, verbose_name='Assessment Access URL'),
+        ),
+        migrations.AddConstraint(
+            model_name='jobassessmentresult',
+            constraint=models.UniqueConstraint(condition=models.Q(('order_status', 'pending')), fields=('user', 'job_assessment'), name='unique_job_assessment_result_pending_order'),
+        ),
+    ]
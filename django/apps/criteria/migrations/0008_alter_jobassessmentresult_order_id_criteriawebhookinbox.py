@@ -0,0 +1,34 @@
+# Generated by Django 5.1.6 on 2026-10-18 10:41
+
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('criteria', '0007_jobassessmentresult_order_status_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='jobassessmentresult',
+            name='order_id',
+            field=models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, verbose_name='Order ID'),
+        ),
+        migrations.CreateModel(
+            name='CriteriaWebhookInbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event', models.CharField(choices=[('scores_update', 'Scores Update'), ('status_update', 'Status Update')], max_length=32, verbose_name='Event')),
+                ('order_id', models.UUIDField(verbose_name='Order ID')),
+                ('payload', models.JSONField(verbose_name='Payload')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+            ],
+            options={
+                'verbose_name': 'Criteria Webhook Inbox',
+                'verbose_name_plural': 'Criteria Webhook Inbox',
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.6 on 2026-10-18 11:58
+
+from django.db import migrations, models
+from django.db.models import DateTimeField, ExpressionWrapper, F, OuterRef, Subquery
+
+
+def set_deadlines(apps, schema_editor):
+    JobAssessment = apps.get_model('criteria', 'JobAssessment')
+    JobAssessmentResult = apps.get_model('criteria', 'JobAssessmentResult')
+    JobAssessmentResult.objects.update(
+        deadline=ExpressionWrapper(
+            F('created_at')
+            + Subquery(JobAssessment.objects.filter(pk=OuterRef('job_assessment_id')).values('time_limit')[:1]),
+            output_field=DateTimeField(),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('criteria', '0008_alter_jobassessmentresult_order_id_criteriawebhookinbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobassessmentresult',
+            name='deadline',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Deadline'),
+        ),
+        migrations.RunPython(set_deadlines, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='jobassessmentresult',
+            index=models.Index(condition=models.Q(('status__in', ['not_started', 'in_progress'])), fields=['deadline'], name='criteria_result_deadline_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('criteria', '0009_jobassessmentresult_deadline_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobassessmentresult',
+            name='order_claimed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Order Claimed At'),
+        ),
+        migrations.AddIndex(
+            model_name='jobassessmentresult',
+            index=models.Index(condition=models.Q(('order_status', 'pending')), fields=['order_claimed_at'], name='criteria_result_pending_order_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-18 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('criteria', '0010_jobassessmentresult_order_claimed_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='criteriawebhookinbox',
+            name='error',
+            field=models.TextField(blank=True, default='', verbose_name='Error'),
+        ),
+        migrations.AddField(
+            model_name='criteriawebhookinbox',
+            name='failed_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Failed At'),
+        ),
+    ]
@@ -93,7 +93,9 @@ class JobAssessment(models.Model):
         return self.title
 
     def can_start(self, user) -> tuple[bool, str]:
-        results = self.results.filter(**{fj(JobAssessmentResult.user): user})
+        results = self.results.filter(**{fj(JobAssessmentResult.user): user}).exclude(
+            **{fj(JobAssessmentResult.order_status): JobAssessmentResult.OrderStatus.FAILED}
+        )
         if results.exists():
             if results.count() >= self.count_limit:
                 return False, _("You have reached the limit of assessments.")
@@ -129,6 +131,12 @@ class JobAssessmentJob(models.Model):
         return f"{self.job_assessment.title} - {self.job.title}"
 
 
+class JobAssessmentOrderStatus(models.TextChoices):
+    PENDING = "pending", _("Pending")
+    CREATED = "created", _("Created")
+    FAILED = "failed", _("Failed")
+
+
 class JobAssessmentResult(ComputedFieldsModel):
     class Status(models.TextChoices):
         NOT_STARTED = "not_started", _("Not Started")
@@ -142,6 +150,8 @@ class JobAssessmentResult(ComputedFieldsModel):
         GREAT = "great", _("Great")
         EXCEPTIONAL = "exceptional", _("Exceptional")
 
+    OrderStatus = JobAssessmentOrderStatus
+
     user = models.ForeignKey(
         User, on_delete=models.CASCADE, verbose_name=_("User"), related_name="job_assessment_results"
     )
@@ -152,8 +162,16 @@ class JobAssessmentResult(ComputedFieldsModel):
     raw_score = models.JSONField(verbose_name=_("Raw Score"), null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created At"))
     updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated At"))
-    order_id = models.UUIDField(editable=False, default=uuid.uuid4, verbose_name=_("Order ID"))
+    order_id = models.UUIDField(editable=False, default=uuid.uuid4, db_index=True, verbose_name=_("Order ID"))
     report_url = models.URLField(verbose_name=_("Report URL"), null=True, blank=True, editable=False)
+    order_status = models.CharField(
+        max_length=16, choices=OrderStatus.choices, default=OrderStatus.PENDING, verbose_name=_("Order Status")
+    )
+    assessment_access_url = models.URLField(
+        max_length=2048, verbose_name=_("Assessment Access URL"), null=True, blank=True, editable=False
+    )
+    # Set by the worker creating the order, a claim older than CRITERIA_ORDER_CLAIM_TIMEOUT belongs to a lost worker
+    order_claimed_at = models.DateTimeField(null=True, blank=True, editable=False, verbose_name=_("Order Claimed At"))
 
     @computed(
         models.CharField(max_length=32, choices=UserScore.choices, null=True, blank=True),
@@ -188,6 +206,14 @@ class JobAssessmentResult(ComputedFieldsModel):
         elif self.raw_status == CriteriaStatus.COMPLETE.value:
             return self.Status.COMPLETED
 
+    @computed(
+        models.DateTimeField(null=True, blank=True, editable=False, verbose_name=_("Deadline")),
+        depends=[("self", ["created_at", "job_assessment"]), ("job_assessment", ["time_limit"])],
+    )
+    def deadline(self):
+        # created_at is only set by the insert itself
+        return (self.created_at or timezone.now()) + self.job_assessment.time_limit
+
     def is_timeout(self):
         if not self.created_at:
             return False
@@ -196,6 +222,28 @@ class JobAssessmentResult(ComputedFieldsModel):
     class Meta:
         verbose_name = _("Job Assessment Result")
         verbose_name_plural = _("Job Assessment Results")
+        constraints = [
+            # Idempotency key of the order creation, duplicate submissions share the pending order
+            models.UniqueConstraint(
+                fields=["user", "job_assessment"],
+                condition=models.Q(order_status=JobAssessmentOrderStatus.PENDING),
+                name="unique_job_assessment_result_pending_order",
+            ),
+        ]
+        indexes = [
+            # Only the open results are swept when their deadline passes
+            models.Index(
+                fields=["deadline"],
+                condition=models.Q(status__in=["not_started", "in_progress"]),
+                name="criteria_result_deadline_idx",
+            ),
+            # Pending orders are swept for lost order creations
+            models.Index(
+                fields=["order_claimed_at"],
+                condition=models.Q(order_status=JobAssessmentOrderStatus.PENDING),
+                name="criteria_result_pending_order_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.email} - {self.job_assessment.title} - {self.score}"
@@ -225,3 +273,26 @@ class JobAssessmentResultReportFile(TimeStampedModel, FileModel):
     class Meta:
         verbose_name = _("Job Assessmen Result Report File")
         verbose_name_plural = _("Job Assessmen Result Report Files")
+
+
+class CriteriaWebhookInbox(models.Model):
+    """Raw Criteria callback, acknowledged on receipt and applied to its result by a background task."""
+
+    class Event(models.TextChoices):
+        SCORES_UPDATE = "scores_update", _("Scores Update")
+        STATUS_UPDATE = "status_update", _("Status Update")
+
+    event = models.CharField(max_length=32, choices=Event.choices, verbose_name=_("Event"))
+    order_id = models.UUIDField(verbose_name=_("Order ID"))
+    payload = models.JSONField(verbose_name=_("Payload"))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created At"))
+    # Callbacks that could not be applied are kept for inspection and skipped by later runs
+    failed_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Failed At"))
+    error = models.TextField(blank=True, default="", verbose_name=_("Error"))
+
+    class Meta:
+        verbose_name = _("Criteria Webhook Inbox")
+        verbose_name_plural = _("Criteria Webhook Inbox")
+
+    def __str__(self):
+        return f"{self.event} - {self.order_id}"
@@ -1,29 +1,62 @@
+from functools import partial
+
 import graphene
 from account.mixins import DocumentCUDMixin
 from common.decorators import login_required, ratelimit
+from common.utils import fj
 from graphene_django_cud.mutations import DjangoCreateMutation
 
-from criteria.client.client import criteria_client
-from criteria.client.types import CreateOrderRequest, Identifier
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
 
 from .models import JobAssessment, JobAssessmentResult
+from .tasks import create_assessment_order_task
 
 
 @login_required
 @ratelimit(key="user", rate="1/m")
 class JobAssessmentCreateMutation(DocumentCUDMixin, DjangoCreateMutation):
-    assessment_access_url = graphene.String(required=True)
+    assessment_access_url = graphene.String()
 
     class Meta:
         model = JobAssessmentResult
         fields = (JobAssessmentResult.job_assessment.field.name,)
 
+    @classmethod
+    def full_clean(cls, obj):
+        # The pending order constraint is left to the database, create_obj handles its violation
+        obj.full_clean(validate_constraints=False)
+
     @classmethod
     def before_create_obj(cls, info, input, obj):
         obj.user = info.context.user
         cls.full_clean(obj)
 
+    @classmethod
+    def get_pending_result(cls, user, job_assessment_id):
+        return JobAssessmentResult.objects.filter(
+            **{
+                fj(JobAssessmentResult.user): user,
+                fj(JobAssessmentResult.job_assessment): job_assessment_id,
+                fj(JobAssessmentResult.order_status): JobAssessmentResult.OrderStatus.PENDING,
+            }
+        ).first()
+
+    @classmethod
+    def create_obj(cls, input, info, *args, **kwargs):
+        job_assessment_id = input.get(JobAssessmentResult.job_assessment.field.name)
+        if pending_result := cls.get_pending_result(info.context.user, job_assessment_id):
+            return pending_result
+
+        try:
+            with transaction.atomic():
+                return super().create_obj(input, info, *args, **kwargs)
+        except IntegrityError:
+            # A concurrent duplicate submission created the pending order first
+            if pending_result := cls.get_pending_result(info.context.user, job_assessment_id):
+                return pending_result
+            raise
+
     @classmethod
     def validate(cls, root, info, input):
         user = info.context.user
@@ -36,23 +69,21 @@ class JobAssessmentCreateMutation(DocumentCUDMixin, DjangoCreateMutation):
         ):
             raise ValidationError({JobAssessmentResult.job_assessment.field.name: "Not related to the user."})
 
-        job_assessment = JobAssessment.objects.get(id=job_assessment_id)
-        _, error_message = job_assessment.can_start(user)
-        if error_message:
-            raise ValidationError(error_message)
+        if not cls.get_pending_result(user, job_assessment_id):
+            job_assessment = JobAssessment.objects.get(id=job_assessment_id)
+            _, error_message = job_assessment.can_start(user)
+            if error_message:
+                raise ValidationError(error_message)
 
         return super().validate(root, info, input)
 
     @classmethod
     def after_mutate(cls, root, info, input, obj, return_data):
-        assessment_access_url = criteria_client.create_order(
-            CreateOrderRequest(
-                packageId=Identifier(value=obj.job_assessment.package_id),
-                orderId=Identifier(value=str(obj.order_id)),
-                externalId=Identifier(value=str(obj.pk)),
-            )
-        ).assessmentAccessURL
-        return_data["assessment_access_url"] = assessment_access_url.uri
+        # The order is created in the background, the access URL is on the result once it is created.
+        # Duplicate submissions schedule the task again, which is a no-op unless the order is still pending.
+        if obj.order_status == JobAssessmentResult.OrderStatus.PENDING:
+            transaction.on_commit(partial(create_assessment_order_task.delay, obj.pk))
+        return_data["assessment_access_url"] = obj.assessment_access_url
         return super().after_mutate(root, info, input, obj, return_data)
 
 
@@ -0,0 +1,301 @@
+import functools
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import List, Optional
+
+import httpx
+from common.http_client import BaseHttpClient
+from common.logging import get_logger
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
+from watchdog.observers import Observer
+from webdriver_manager.chrome import ChromeDriverManager
+
+from .client.config import CriteriaClientConfig
+from .client.exceptions import CriteriaRequestException
+from .constants import (
+    CRITERIA_REPORT_BROWSER_ACQUIRE_TIMEOUT,
+    CRITERIA_REPORT_BROWSER_POOL_SIZE,
+    CRITERIA_REPORT_DOWNLOAD_TIMEOUT,
+    CRITERIA_REPORT_PAGE_TIMEOUT,
+)
+
+logger = get_logger()
+
+PDF_SIGNATURE = b"%PDF"
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+DOWNLOAD_BUTTON_SELECTORS = [
+    "//button[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'download')]",
+    "//a[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'download')]",
+    "//button[contains(@class, 'download')]",
+    "//a[contains(@class, 'download')]",
+    "//button[contains(@id, 'download')]",
+    "//a[contains(@id, 'download')]",
+    "//input[@type='button'][contains(translate(@value, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'download')]",
+    "//input[@type='submit'][contains(translate(@value, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'download')]",
+]
+DOWNLOAD_ELEMENTS_FALLBACK_SELECTOR = (
+    "//*[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'download')]"
+)
+PARTIAL_DOWNLOAD_SUFFIXES = (".crdownload", ".tmp")
+
+
+class ReportFetchError(Exception):
+    pass
+
+
+class ReportDownloadClientConfig(CriteriaClientConfig):
+    timeout: float = CRITERIA_REPORT_DOWNLOAD_TIMEOUT
+
+    @classmethod
+    def get_client_kwargs(cls):
+        client_kwargs = super().get_client_kwargs()
+        client_kwargs["headers"]["User-Agent"] = USER_AGENT
+        return {**client_kwargs, "follow_redirects": True}
+
+
+class ReportDownloadClient(BaseHttpClient):
+    config = ReportDownloadClientConfig
+    request_exception = CriteriaRequestException
+
+    def download(self, report_link: str) -> bytes:
+        response = self.send_request("GET", report_link)
+        if not response.content.startswith(PDF_SIGNATURE):
+            raise ReportFetchError(f"{report_link} responded with {response.headers.get('content-type')}, not a PDF")
+        return response.content
+
+
+class DownloadCompleteHandler(FileSystemEventHandler):
+    """
+    Signals the first file the browser finished writing to the download directory.
+
+    A created file may still be written to, so a download only completes once its file is closed
+    for writing, or once Chrome renames its .crdownload file to the final name.
+    """
+
+    def __init__(self):
+        self.completed = threading.Event()
+        self.path: Optional[str] = None
+
+    def on_file_ready(self, path: str):
+        # Chrome also writes hidden scratch files (e.g. ".com.google.Chrome.*") next to the download
+        if path.endswith(PARTIAL_DOWNLOAD_SUFFIXES) or os.path.basename(path).startswith("."):
+            return
+
+        if not self.completed.is_set():
+            self.path = path
+            self.completed.set()
+
+    def on_closed(self, event: FileSystemEvent):
+        if not event.is_directory:
+            self.on_file_ready(event.src_path)
+
+    def on_moved(self, event: FileSystemEvent):
+        if not event.is_directory:
+            self.on_file_ready(event.dest_path)
+
+
+@functools.cache
+def get_chromedriver_path() -> str:
+    return ChromeDriverManager().install()
+
+
+class BrowserSession:
+    """A headless Chrome whose downloads go to its own directory, reused for many reports."""
+
+    def __init__(self, is_headless: bool = True):
+        self.download_dir = tempfile.mkdtemp(prefix="criteria-reports-")
+        self.driver = webdriver.Chrome(service=Service(get_chromedriver_path()), options=self.get_options(is_headless))
+
+    def get_options(self, is_headless: bool) -> Options:
+        chrome_options = Options()
+        if is_headless:
+            chrome_options.add_argument("--headless=new")
+            chrome_options.add_argument("--disable-gpu")
+            chrome_options.add_argument("--no-sandbox")
+            chrome_options.add_argument("--disable-dev-shm-usage")
+            chrome_options.add_argument("--window-size=1920,1080")
+
+        chrome_options.add_argument(f"user-agent={USER_AGENT}")
+        chrome_options.add_experimental_option(
+            "prefs",
+            {
+                "download.default_directory": self.download_dir,
+                "download.prompt_for_download": False,
+                "download.directory_upgrade": True,
+                "safebrowsing.enabled": False,
+                "plugins.always_open_pdf_externally": True,
+            },
+        )
+        return chrome_options
+
+    def clear_downloads(self):
+        for file_name in os.listdir(self.download_dir):
+            os.remove(os.path.join(self.download_dir, file_name))
+
+    def find_download_button(self, timeout: float):
+        selector_timeout = max(5, timeout // len(DOWNLOAD_BUTTON_SELECTORS))
+        for selector in DOWNLOAD_BUTTON_SELECTORS:
+            try:
+                return WebDriverWait(self.driver, selector_timeout).until(
+                    EC.element_to_be_clickable((By.XPATH, selector))
+                )
+            except TimeoutException:
+                logger.info(f"Selector not found: {selector}")
+            except Exception as e:
+                logger.warning(f"Error with selector {selector}: {str(e)}")
+
+        logger.info("Trying fallback approach for finding download button")
+        for element in self.driver.find_elements(By.XPATH, DOWNLOAD_ELEMENTS_FALLBACK_SELECTOR):
+            try:
+                if element.is_displayed() and element.is_enabled():
+                    return element
+            except WebDriverException:
+                continue
+
+        raise TimeoutException("Download button not found on the page")
+
+    def download(self, report_link: str, *, page_timeout: float, download_timeout: float) -> bytes:
+        self.clear_downloads()
+        self.driver.get(report_link)
+        logger.info(f"Navigated to page with title: {self.driver.title}")
+        download_button = self.find_download_button(page_timeout)
+
+        handler = DownloadCompleteHandler()
+        observer = Observer()
+        observer.schedule(handler, self.download_dir)
+        observer.start()
+        try:
+            download_button.click()
+            if not handler.completed.wait(download_timeout):
+                raise ReportFetchError(
+                    f"No file was downloaded from {report_link} within {download_timeout}s. "
+                    f"Directory contents: {os.listdir(self.download_dir)}"
+                )
+        finally:
+            observer.stop()
+            observer.join()
+
+        with open(handler.path, "rb") as file:
+            content = file.read()
+        if not content.startswith(PDF_SIGNATURE):
+            raise ReportFetchError(f"{os.path.basename(handler.path)} downloaded from {report_link} is not a PDF")
+        return content
+
+    def close(self):
+        try:
+            self.driver.quit()
+        except WebDriverException as e:
+            logger.warning(f"Error quitting WebDriver: {str(e)}")
+        for file_name in os.listdir(self.download_dir):
+            os.remove(os.path.join(self.download_dir, file_name))
+        os.rmdir(self.download_dir)
+
+
+class BrowserSessionPool:
+    """
+    Long-lived browser sessions of the process, started on demand up to ``size``.
+
+    Waiters are woken both when a session is released and when one is discarded, in which case
+    they start a new session in its place.
+    """
+
+    def __init__(self, size: int, acquire_timeout: float = CRITERIA_REPORT_BROWSER_ACQUIRE_TIMEOUT):
+        self.size = size
+        self.acquire_timeout = acquire_timeout
+        self.condition = threading.Condition()
+        self.sessions: List[BrowserSession] = []
+        self.started = 0
+        self.pid = os.getpid()
+
+    def acquire(self) -> BrowserSession:
+        with self.condition:
+            if self.pid != os.getpid():
+                # Sessions of the parent process cannot be driven from a forked worker
+                self.pid, self.sessions, self.started = os.getpid(), [], 0
+
+            if not self.condition.wait_for(lambda: self.sessions or self.started < self.size, self.acquire_timeout):
+                raise ReportFetchError(f"No browser session was free within {self.acquire_timeout}s")
+
+            if self.sessions:
+                return self.sessions.pop()
+            self.started += 1
+
+        try:
+            return BrowserSession()
+        except Exception:
+            self.forget()
+            raise
+
+    def release(self, session: BrowserSession):
+        with self.condition:
+            self.sessions.append(session)
+            self.condition.notify()
+
+    def forget(self):
+        with self.condition:
+            self.started -= 1
+            self.condition.notify()
+
+    def discard(self, session: BrowserSession):
+        try:
+            session.close()
+        finally:
+            self.forget()
+
+    @contextmanager
+    def session(self):
+        session = self.acquire()
+        try:
+            yield session
+        except Exception:
+            # The page may be left in any state, a fresh session is started for the next report
+            self.discard(session)
+            raise
+        else:
+            self.release(session)
+
+    def close(self):
+        with self.condition:
+            sessions, self.sessions = self.sessions, []
+        for session in sessions:
+            self.discard(session)
+
+
+class ReportFetcher:
+    """
+    Fetches assessment report PDFs.
+
+    The report link is first downloaded directly over HTTP; a browser session of the pool is only
+    used when the link serves a page that starts the download itself.
+    """
+
+    def __init__(self, pool_size: int = CRITERIA_REPORT_BROWSER_POOL_SIZE):
+        self.http_client = ReportDownloadClient()
+        self.browser_pool = BrowserSessionPool(pool_size)
+
+    def fetch(self, report_link: str) -> bytes:
+        try:
+            return self.http_client.download(report_link)
+        except (ReportFetchError, CriteriaRequestException, httpx.InvalidURL) as e:
+            logger.info(f"Direct download of {report_link} failed ({e}), falling back to a browser session.")
+
+        with self.browser_pool.session() as session:
+            return session.download(
+                report_link,
+                page_timeout=CRITERIA_REPORT_PAGE_TIMEOUT,
+                download_timeout=CRITERIA_REPORT_DOWNLOAD_TIMEOUT,
+            )
+
+
+report_fetcher = ReportFetcher()
@@ -1,13 +1,25 @@
+from datetime import timedelta
+
 from common.logging import get_logger
 from common.utils import fj
 from config.settings.subscriptions import AssessmentSubscription
 from flex_pubsub.tasks import register_task
 from tenacity import RetryError, retry, stop_after_attempt, wait_exponential
 
-from django.db.models.lookups import IsNull
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.lookups import IsNull, LessThan
+from django.utils import timezone
 
-from .constants import CRITERIA_REPORT_FILE_DOWNLOAD_RETRY_ATTEMPTS
+from .client.client import criteria_client
+from .client.exceptions import CriteriaClientException
+from .client.types import CreateOrderRequest, Identifier
+from .constants import (
+    CRITERIA_ORDER_CLAIM_TIMEOUT,
+    CRITERIA_REPORT_FILE_DOWNLOAD_RETRY_ATTEMPTS,
+)
 from .models import JobAssessmentResult, JobAssessmentResultReportFile
+from .timeouts import time_out_expired_results
 from .utils import download_report_file
 
 logger = get_logger()
@@ -67,3 +79,90 @@ def download_report_file_task(job_assessment_result_id: int):
     except Exception as e:
         logger.error(f"Failed to download report pdf for result with id {job_assessment_result_id}. {e}")
         return
+
+
+@register_task([AssessmentSubscription.ORDERS])
+def create_assessment_order_task(job_assessment_result_id: int):
+    claimed_at = timezone.now()
+    stale_before = claimed_at - timedelta(seconds=CRITERIA_ORDER_CLAIM_TIMEOUT)
+    # Duplicate deliveries skip the order while it is claimed, a lost worker's claim is taken over once stale
+    if not JobAssessmentResult.objects.filter(
+        Q(**{fj(JobAssessmentResult.order_claimed_at, IsNull.lookup_name): True})
+        | Q(**{fj(JobAssessmentResult.order_claimed_at, LessThan.lookup_name): stale_before}),
+        **{
+            JobAssessmentResult._meta.pk.attname: job_assessment_result_id,
+            fj(JobAssessmentResult.order_status): JobAssessmentResult.OrderStatus.PENDING,
+        },
+    ).update(**{JobAssessmentResult.order_claimed_at.field.name: claimed_at}):
+        logger.info(f"Order of result with id {job_assessment_result_id} is not pending or being created, skipping.")
+        return
+
+    assessment_result = JobAssessmentResult.objects.select_related(fj(JobAssessmentResult.job_assessment)).get(
+        **{JobAssessmentResult._meta.pk.attname: job_assessment_result_id}
+    )
+    # The order is created without holding a row lock or a transaction open
+    try:
+        response = criteria_client.create_order(
+            CreateOrderRequest(
+                packageId=Identifier(value=assessment_result.job_assessment.package_id),
+                orderId=Identifier(value=str(assessment_result.order_id)),
+                externalId=Identifier(value=str(assessment_result.pk)),
+            )
+        )
+    except CriteriaClientException as e:
+        logger.error(f"Failed to create order for result with id {job_assessment_result_id}. {e}")
+        assessment_result.order_status = JobAssessmentResult.OrderStatus.FAILED
+    else:
+        assessment_result.order_status = JobAssessmentResult.OrderStatus.CREATED
+        assessment_result.assessment_access_url = str(response.assessmentAccessURL.uri)
+
+    with transaction.atomic():
+        if not (
+            JobAssessmentResult.objects.select_for_update()
+            .filter(
+                **{
+                    JobAssessmentResult._meta.pk.attname: job_assessment_result_id,
+                    fj(JobAssessmentResult.order_claimed_at): claimed_at,
+                }
+            )
+            .exists()
+        ):
+            logger.warning(f"Order of result with id {job_assessment_result_id} was taken over, dropping the outcome.")
+            return
+
+        assessment_result.save(
+            update_fields=[
+                JobAssessmentResult.order_status.field.name,
+                JobAssessmentResult.assessment_access_url.field.name,
+            ]
+        )
+
+
+@register_task([AssessmentSubscription.ORDERS], schedule={"schedule": "*/5 * * * *"})
+def retry_lost_assessment_orders_task():
+    """Schedule again the pending orders whose task was lost, or whose worker died while creating them."""
+
+    stale_before = timezone.now() - timedelta(seconds=CRITERIA_ORDER_CLAIM_TIMEOUT)
+    for job_assessment_result_id in JobAssessmentResult.objects.filter(
+        Q(**{fj(JobAssessmentResult.order_claimed_at, LessThan.lookup_name): stale_before})
+        | Q(
+            **{
+                fj(JobAssessmentResult.order_claimed_at, IsNull.lookup_name): True,
+                fj(JobAssessmentResult.created_at, LessThan.lookup_name): stale_before,
+            }
+        ),
+        **{fj(JobAssessmentResult.order_status): JobAssessmentResult.OrderStatus.PENDING},
+    ).values_list(JobAssessmentResult._meta.pk.attname, flat=True):
+        create_assessment_order_task.delay(job_assessment_result_id)
+
+
+@register_task([AssessmentSubscription.WEBHOOKS])
+def process_webhook_inbox_task():
+    from .webhooks import process_webhook_inbox
+
+    process_webhook_inbox()
+
+
+@register_task([AssessmentSubscription.TIMEOUTS], schedule={"schedule": "*/5 * * * *"})
+def time_out_expired_results_task():
+    time_out_expired_results()
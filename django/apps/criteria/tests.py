@@ -0,0 +1,542 @@
+import json
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+from unittest import mock
+
+import httpx
+from graphql_jwt.testcases import JSONWebTokenClient, JSONWebTokenTestCase
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .client.client import CriteriaClient
+from .constants import (
+    CRITERIA_ORDER_CLAIM_TIMEOUT,
+    CRITERIA_RESULT_TIMEOUT_BATCH_SIZE,
+    CRITERIA_WEBHOOK_INBOX_SCHEDULED_CACHE_KEY,
+)
+from .models import CriteriaWebhookInbox, JobAssessment, JobAssessmentResult
+from .report_fetcher import (
+    BrowserSessionPool,
+    DownloadCompleteHandler,
+    ReportDownloadClient,
+    ReportDownloadClientConfig,
+    ReportFetcher,
+    ReportFetchError,
+)
+from .tasks import (
+    create_assessment_order_task,
+    process_webhook_inbox_task,
+    retry_lost_assessment_orders_task,
+)
+from .timeouts import job_assessment_results_timed_out, time_out_expired_results
+from .webhooks import process_webhook_inbox
+
+PDF_CONTENT = b"%PDF-1.7\n%report\n%%EOF"
+REPORT_LINK = "https://reports.criteria.test/report/order-1"
+
+
+class StandInReportDownloadClient(ReportDownloadClient):
+    def __init__(self, handler):
+        class StandInConfig(ReportDownloadClientConfig):
+            max_retries = 1
+
+            @classmethod
+            def get_client_kwargs(cls):
+                return {"transport": httpx.MockTransport(handler), "follow_redirects": True}
+
+        self.config = StandInConfig
+        super().__init__()
+
+
+class StandInBrowserPool:
+    def __init__(self):
+        self.downloads = []
+
+    @contextmanager
+    def session(self):
+        yield mock.Mock(download=lambda report_link, **kwargs: self.downloads.append(report_link) or PDF_CONTENT)
+
+
+def get_stand_in_fetcher(handler) -> ReportFetcher:
+    fetcher = ReportFetcher(pool_size=1)
+    fetcher.http_client = StandInReportDownloadClient(handler)
+    fetcher.browser_pool = StandInBrowserPool()
+    return fetcher
+
+
+class ReportFetcherTestCase(SimpleTestCase):
+    def test_direct_download(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            if request.url.path.startswith("/report/"):
+                return httpx.Response(302, headers={"Location": "https://files.criteria.test/order-1.pdf"})
+            return httpx.Response(200, content=PDF_CONTENT, headers={"Content-Type": "application/pdf"})
+
+        fetcher = get_stand_in_fetcher(handler)
+
+        self.assertEqual(fetcher.fetch(REPORT_LINK), PDF_CONTENT)
+        self.assertEqual(len(requests), 2)
+        self.assertListEqual(fetcher.browser_pool.downloads, [])
+
+    def test_falls_back_to_browser_for_report_pages(self):
+        fetcher = get_stand_in_fetcher(
+            lambda request: httpx.Response(200, text="<html>Download</html>", headers={"Content-Type": "text/html"})
+        )
+
+        self.assertEqual(fetcher.fetch(REPORT_LINK), PDF_CONTENT)
+        self.assertListEqual(fetcher.browser_pool.downloads, [REPORT_LINK])
+
+    def test_falls_back_to_browser_on_request_errors(self):
+        fetcher = get_stand_in_fetcher(lambda request: httpx.Response(403))
+
+        self.assertEqual(fetcher.fetch(REPORT_LINK), PDF_CONTENT)
+        self.assertListEqual(fetcher.browser_pool.downloads, [REPORT_LINK])
+
+    def test_download_complete_handler_waits_for_written_files(self):
+        handler = DownloadCompleteHandler()
+        handler.on_created(mock.Mock(is_directory=False, src_path="/downloads/report.pdf"))
+        handler.on_closed(mock.Mock(is_directory=False, src_path="/downloads/report.pdf.crdownload"))
+        handler.on_closed(mock.Mock(is_directory=False, src_path="/downloads/.com.google.Chrome.x1y2z3"))
+        self.assertFalse(handler.completed.is_set())
+
+        handler.on_moved(
+            mock.Mock(
+                is_directory=False, src_path="/downloads/report.pdf.crdownload", dest_path="/downloads/report.pdf"
+            )
+        )
+        self.assertTrue(handler.completed.is_set())
+        self.assertEqual(handler.path, "/downloads/report.pdf")
+
+        handler = DownloadCompleteHandler()
+        handler.on_closed(mock.Mock(is_directory=False, src_path="/downloads/report.pdf"))
+        self.assertEqual(handler.path, "/downloads/report.pdf")
+
+
+@mock.patch("criteria.report_fetcher.BrowserSession")
+class BrowserSessionPoolTestCase(SimpleTestCase):
+    def test_discarded_session_is_replaced_for_waiters(self, browser_session_mock):
+        pool = BrowserSessionPool(size=1, acquire_timeout=5)
+        acquired = threading.Event()
+        waiter_sessions = []
+
+        def wait_for_session():
+            acquired.set()
+            with pool.session() as session:
+                waiter_sessions.append(session)
+
+        with self.assertRaises(ReportFetchError), pool.session():
+            waiter = threading.Thread(target=wait_for_session)
+            waiter.start()
+            acquired.wait()
+            raise ReportFetchError("Download button not found on the page")
+
+        waiter.join(timeout=5)
+        self.assertFalse(waiter.is_alive())
+        self.assertEqual(len(waiter_sessions), 1)
+        self.assertEqual(browser_session_mock.call_count, 2)
+        self.assertEqual((pool.started, len(pool.sessions)), (1, 1))
+
+    def test_acquire_times_out_while_sessions_are_busy(self, browser_session_mock):
+        pool = BrowserSessionPool(size=1, acquire_timeout=0.1)
+
+        with pool.session(), self.assertRaises(ReportFetchError):
+            pool.acquire()
+
+
+class StandInCriteriaAPI:
+    """Stand-in Criteria API behind an ``httpx.MockTransport``, recording the created orders."""
+
+    def __init__(self, latency: float = 0.0, status_code: int = 200):
+        self.latency = latency
+        self.status_code = status_code
+        self.orders = []
+        self.in_transaction = []
+        self.on_request = None
+        self.lock = threading.Lock()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.in_transaction.append(connection.in_atomic_block)
+        if self.on_request:
+            self.on_request()
+        threading.Event().wait(self.latency)
+        order_id = json.loads(request.content)["orderId"]["value"]
+        with self.lock:
+            self.orders.append(order_id)
+        if self.status_code != 200:
+            return httpx.Response(self.status_code)
+        return httpx.Response(
+            200, json={"assessmentAccessURL": {"uri": f"https://assessments.criteria.test/{order_id}"}}
+        )
+
+    def get_client(self) -> httpx.Client:
+        return httpx.Client(base_url="https://criteria.test/", transport=httpx.MockTransport(self))
+
+
+class JobAssessmentOrderMixin:
+    start_mutation = """
+    mutation Start($jobAssessment: ID!) {
+        criteria {
+            jobAssessment {
+                start(input: {jobAssessment: $jobAssessment}) {
+                    assessmentAccessUrl
+                    jobAssessmentResult {
+                        id
+                    }
+                }
+            }
+        }
+    }
+    """
+    api_latency = 1
+
+    def setUp(self):
+        super().setUp()
+        self.user = get_user_model().objects.create_user(
+            email="assessment@example.com", username="assessment", first_name="", last_name=""
+        )
+        self.job_assessment = JobAssessment.objects.create(
+            package_id="package", title="Assessment", short_description="", description="", required=True
+        )
+        self.api = StandInCriteriaAPI(latency=self.api_latency)
+        self.queue = []
+
+        for patcher in (
+            mock.patch.object(
+                CriteriaClient, "client", new_callable=mock.PropertyMock, return_value=self.api.get_client()
+            ),
+            mock.patch.object(create_assessment_order_task, "delay", side_effect=self.queue.append),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def start(self, client=None):
+        return (client or self.client).execute(self.start_mutation, {"jobAssessment": self.job_assessment.pk})
+
+    def get_results(self):
+        return JobAssessmentResult.objects.filter(
+            **{
+                JobAssessmentResult.user.field.name: self.user,
+                JobAssessmentResult.job_assessment.field.name: self.job_assessment,
+            }
+        )
+
+
+@override_settings(RATELIMIT_ENABLE=False)
+class JobAssessmentOrderTestCase(JobAssessmentOrderMixin, JSONWebTokenTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.authenticate(self.user)
+
+    def test_start_returns_before_the_order_is_created(self):
+        started = time.perf_counter()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.start()
+        elapsed = time.perf_counter() - started
+
+        self.assertIsNone(response.errors)
+        self.assertLess(elapsed, self.api_latency)
+        self.assertIsNone(response.data["criteria"]["jobAssessment"]["start"]["assessmentAccessUrl"])
+        self.assertListEqual(self.api.orders, [])
+        result = self.get_results().get()
+        self.assertEqual(result.order_status, JobAssessmentResult.OrderStatus.PENDING)
+
+        for job_assessment_result_id in self.queue:
+            create_assessment_order_task(job_assessment_result_id)
+
+        result.refresh_from_db()
+        self.assertEqual(result.order_status, JobAssessmentResult.OrderStatus.CREATED)
+        self.assertEqual(result.assessment_access_url, f"https://assessments.criteria.test/{result.order_id}")
+        self.assertListEqual(self.api.orders, [str(result.order_id)])
+
+    def test_duplicate_submissions_share_the_pending_order(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            responses = [self.start(), self.start()]
+
+        self.assertTrue(all(response.errors is None for response in responses))
+        result = self.get_results().get()
+        for response in responses:
+            self.assertEqual(
+                response.data["criteria"]["jobAssessment"]["start"]["jobAssessmentResult"]["id"], str(result.pk)
+            )
+
+        for job_assessment_result_id in self.queue:
+            create_assessment_order_task(job_assessment_result_id)
+
+        self.assertListEqual(self.api.orders, [str(result.order_id)])
+
+    def test_failed_order_does_not_block_a_new_start(self):
+        self.api.latency, self.api.status_code = 0, 400
+        with self.captureOnCommitCallbacks(execute=True):
+            self.start()
+        create_assessment_order_task(self.queue.pop())
+
+        self.assertEqual(self.get_results().get().order_status, JobAssessmentResult.OrderStatus.FAILED)
+        self.assertTrue(self.job_assessment.can_start(self.user)[0])
+
+    def test_claimed_order_is_skipped_until_its_claim_is_stale(self):
+        self.api.latency = 0
+        with self.captureOnCommitCallbacks(execute=True):
+            self.start()
+        job_assessment_result_id = self.queue.pop()
+        results = self.get_results()
+        results.update(order_claimed_at=timezone.now())
+
+        create_assessment_order_task(job_assessment_result_id)
+        retry_lost_assessment_orders_task()
+
+        self.assertListEqual(self.api.orders, [])
+        self.assertListEqual(self.queue, [])
+
+        results.update(order_claimed_at=timezone.now() - timedelta(seconds=CRITERIA_ORDER_CLAIM_TIMEOUT + 1))
+        retry_lost_assessment_orders_task()
+        self.assertListEqual(self.queue, [job_assessment_result_id])
+        create_assessment_order_task(self.queue.pop())
+
+        result = results.get()
+        self.assertEqual(result.order_status, JobAssessmentResult.OrderStatus.CREATED)
+        self.assertListEqual(self.api.orders, [str(result.order_id)])
+
+    def test_outcome_of_a_taken_over_order_is_dropped(self):
+        self.api.latency = 0
+        with self.captureOnCommitCallbacks(execute=True):
+            self.start()
+        results = self.get_results()
+
+        # Another worker takes the order over while the API call of this one is in flight
+        self.api.on_request = lambda: results.update(order_claimed_at=timezone.now())
+        create_assessment_order_task(self.queue.pop())
+
+        self.assertEqual(results.get().order_status, JobAssessmentResult.OrderStatus.PENDING)
+
+
+@override_settings(RATELIMIT_ENABLE=False)
+class JobAssessmentOrderConcurrencyTestCase(JobAssessmentOrderMixin, TransactionTestCase):
+    client_class = JSONWebTokenClient
+    api_latency = 0.2
+    concurrency = 5
+
+    def run_concurrently(self, func, *args):
+        barrier = threading.Barrier(self.concurrency)
+        outcomes = []
+
+        def target():
+            try:
+                barrier.wait()
+                outcomes.append(func(*args))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=target) for _ in range(self.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return outcomes
+
+    def authenticated_start(self):
+        client = JSONWebTokenClient()
+        client.authenticate(self.user)
+        return self.start(client)
+
+    def test_concurrent_duplicate_submissions_create_one_order(self):
+        responses = self.run_concurrently(self.authenticated_start)
+
+        self.assertEqual(len(responses), self.concurrency)
+        self.assertTrue(all(response.errors is None for response in responses))
+        result = self.get_results().get()
+        self.assertEqual(len(self.queue), self.concurrency)
+
+        self.run_concurrently(lambda: [create_assessment_order_task(pk) for pk in self.queue])
+
+        result.refresh_from_db()
+        self.assertEqual(result.order_status, JobAssessmentResult.OrderStatus.CREATED)
+        self.assertListEqual(self.api.orders, [str(result.order_id)])
+        self.assertListEqual(self.api.in_transaction, [False])
+
+
+@override_settings(CRITERIA_SETTINGS={"WEBHOOK_SECRET": "secret"})
+class CriteriaWebhookInboxTestCase(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            email="webhook@example.com", username="webhook", first_name="", last_name=""
+        )
+        job_assessment = JobAssessment.objects.create(
+            package_id="package", title="Assessment", short_description="", description=""
+        )
+        self.result = JobAssessmentResult.objects.create(
+            user=user, job_assessment=job_assessment, order_status=JobAssessmentResult.OrderStatus.CREATED
+        )
+        cache.delete(CRITERIA_WEBHOOK_INBOX_SCHEDULED_CACHE_KEY)
+
+        patcher = mock.patch.object(process_webhook_inbox_task, "delay")
+        self.delay_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post_status(self, status: str, order_id=None):
+        return self.client.post(
+            reverse("criteria:webhooks:status"),
+            json.dumps(
+                {
+                    "orderId": str(order_id or self.result.order_id),
+                    "eventId": "event",
+                    "status": status,
+                    "statusDate": "2026-10-18",
+                }
+            ),
+            content_type="application/json",
+            headers={"x-criteria-api-key": "secret"},
+        )
+
+    def test_callbacks_are_acknowledged_without_touching_results(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            responses = [self.post_status(status) for status in ("Scheduled", "In Progress")]
+
+        self.assertListEqual([response.status_code for response in responses], [200, 200])
+        self.assertEqual(CriteriaWebhookInbox.objects.count(), 2)
+        self.result.refresh_from_db()
+        self.assertEqual(self.result.raw_status, JobAssessmentResult.raw_status.field.default)
+        self.delay_mock.assert_called_once_with()
+
+    def test_invalid_callbacks_are_rejected(self):
+        self.assertEqual(self.post_status("Unknown").status_code, 400)
+        self.assertFalse(CriteriaWebhookInbox.objects.exists())
+
+    def test_inbox_is_coalesced_per_order(self):
+        for status in ("Scheduled", "In Progress", "Evaluation in Progress - 1 of 2 Completed", "Complete"):
+            self.post_status(status)
+        self.post_status("Complete", order_id=uuid.uuid4())
+
+        with mock.patch.object(
+            JobAssessmentResult, "save", autospec=True, side_effect=JobAssessmentResult.save
+        ) as save:
+            process_webhook_inbox()
+
+        self.assertEqual(save.call_count, 1)
+        self.result.refresh_from_db()
+        self.assertEqual(self.result.raw_status, "Complete")
+        self.assertEqual(self.result.status, JobAssessmentResult.Status.COMPLETED)
+        self.assertFalse(CriteriaWebhookInbox.objects.exists())
+
+    def test_failed_order_is_dead_lettered_alone(self):
+        failing_result = JobAssessmentResult.objects.create(
+            user=self.result.user,
+            job_assessment=self.result.job_assessment,
+            order_status=JobAssessmentResult.OrderStatus.CREATED,
+        )
+        self.post_status("Complete")
+        self.post_status("Complete", order_id=failing_result.order_id)
+
+        original_save = JobAssessmentResult.save
+
+        def save(result, *args, **kwargs):
+            original_save(result, *args, **kwargs)
+            if result.pk == failing_result.pk:
+                raise ValueError("Broken result")
+
+        with mock.patch.object(JobAssessmentResult, "save", autospec=True, side_effect=save):
+            process_webhook_inbox()
+
+        self.result.refresh_from_db()
+        self.assertEqual(self.result.raw_status, "Complete")
+        failing_result.refresh_from_db()
+        self.assertEqual(failing_result.raw_status, JobAssessmentResult.raw_status.field.default)
+
+        dead_letter = CriteriaWebhookInbox.objects.get()
+        self.assertEqual(dead_letter.order_id, failing_result.order_id)
+        self.assertIsNotNone(dead_letter.failed_at)
+        self.assertIn("Broken result", dead_letter.error)
+
+        # Dead letters are not picked up again
+        process_webhook_inbox()
+        self.assertEqual(CriteriaWebhookInbox.objects.get().failed_at, dead_letter.failed_at)
+
+
+class TimeOutExpiredResultsTestCase(TestCase):
+    timed_out_rows = 100_000
+
+    def setUp(self):
+        self.now = timezone.now()
+        self.users = [
+            get_user_model().objects.create_user(
+                email=f"timeout{i}@example.com", username=f"timeout{i}", first_name="", last_name=""
+            )
+            for i in range(2)
+        ]
+        self.short = JobAssessment.objects.create(
+            package_id="short", title="Short", short_description="", description="", time_limit=timedelta(minutes=30)
+        )
+        self.long = JobAssessment.objects.create(
+            package_id="long", title="Long", short_description="", description="", time_limit=timedelta(hours=2)
+        )
+        receiver = mock.Mock()
+        job_assessment_results_timed_out.connect(receiver, dispatch_uid="test")
+        self.addCleanup(job_assessment_results_timed_out.disconnect, dispatch_uid="test")
+        self.receiver = receiver
+
+    def create_result(self, user, job_assessment, **kwargs):
+        with mock.patch("django.utils.timezone.now", return_value=self.now):
+            return JobAssessmentResult.objects.create(user=user, job_assessment=job_assessment, **kwargs)
+
+    def sweep_at(self, delta: timedelta):
+        with mock.patch("django.utils.timezone.now", return_value=self.now + delta):
+            time_out_expired_results()
+
+    def test_expired_open_results_time_out(self):
+        expired = self.create_result(self.users[0], self.short)
+        running = self.create_result(self.users[1], self.long)
+        completed = self.create_result(self.users[1], self.short, raw_status="Complete")
+        self.assertEqual(expired.deadline, self.now + self.short.time_limit)
+
+        self.sweep_at(timedelta(minutes=10))
+        expired.refresh_from_db()
+        self.assertEqual(expired.status, JobAssessmentResult.Status.IN_PROGRESS)
+        self.receiver.assert_not_called()
+
+        self.sweep_at(timedelta(minutes=31))
+        for result in (expired, running, completed):
+            result.refresh_from_db()
+        self.assertEqual(expired.status, JobAssessmentResult.Status.TIMEOUT)
+        self.assertEqual(running.status, JobAssessmentResult.Status.IN_PROGRESS)
+        self.assertEqual(completed.status, JobAssessmentResult.Status.COMPLETED)
+        self.receiver.assert_called_once_with(
+            signal=job_assessment_results_timed_out, sender=JobAssessmentResult, user_ids={self.users[0].pk}
+        )
+
+    def test_bulk_sweep_runs_in_bounded_batches(self):
+        expired_deadline = self.now - timedelta(minutes=1)
+        JobAssessmentResult.objects.bulk_create(
+            JobAssessmentResult(
+                user=self.users[i % 2],
+                job_assessment=self.short,
+                order_status=JobAssessmentResult.OrderStatus.CREATED,
+                status=JobAssessmentResult.Status.IN_PROGRESS,
+                deadline=expired_deadline,
+            )
+            for i in range(self.timed_out_rows)
+        )
+        batches = -(-self.timed_out_rows // CRITERIA_RESULT_TIMEOUT_BATCH_SIZE)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.sweep_at(timedelta())
+
+        # A locking select and a single UPDATE per batch, and the select that finds nothing left
+        self.assertEqual(
+            len([query for query in queries if query["sql"].startswith(("SELECT", "UPDATE"))]), 2 * batches + 1
+        )
+        self.assertEqual(self.receiver.call_count, batches)
+        self.assertFalse(
+            JobAssessmentResult.objects.filter(
+                **{JobAssessmentResult.status.field.name: JobAssessmentResult.Status.IN_PROGRESS}
+            ).exists()
+        )
@@ -0,0 +1,44 @@
+from common.utils import fj
+
+from django.db import transaction
+from django.db.models.lookups import In, LessThan
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .constants import CRITERIA_RESULT_TIMEOUT_BATCH_SIZE
+from .models import JobAssessmentResult
+
+# Sent with the ``user_ids`` of the results timed out by a bulk update, which fires no save signals
+job_assessment_results_timed_out = Signal()
+
+OPEN_STATUSES = [JobAssessmentResult.Status.NOT_STARTED, JobAssessmentResult.Status.IN_PROGRESS]
+
+
+def time_out_expired_results():
+    """Mark the open results whose deadline passed as timed out, in batches of bounded size."""
+
+    now = timezone.now()
+    while True:
+        with transaction.atomic():
+            expired = list(
+                JobAssessmentResult.objects.select_for_update(skip_locked=True)
+                .filter(
+                    **{
+                        fj(JobAssessmentResult.deadline, LessThan.lookup_name): now,
+                        fj(JobAssessmentResult.status, In.lookup_name): OPEN_STATUSES,
+                    }
+                )
+                .order_by(JobAssessmentResult.deadline.field.name)
+                .values_list(JobAssessmentResult._meta.pk.attname, JobAssessmentResult.user.field.attname)[
+                    :CRITERIA_RESULT_TIMEOUT_BATCH_SIZE
+                ]
+            )
+            if not expired:
+                return
+
+            JobAssessmentResult.objects.filter(
+                **{fj(JobAssessmentResult._meta.pk.attname, In.lookup_name): [pk for pk, _ in expired]}
+            ).update(**{JobAssessmentResult.status.field.name: JobAssessmentResult.Status.TIMEOUT})
+            job_assessment_results_timed_out.send(
+                sender=JobAssessmentResult, user_ids={user_id for _, user_id in expired}
+            )
@@ -32,6 +32,8 @@ class JobAssessmentResultType(FilterQuerySetByUserMixin, DjangoObjectType):
             JobAssessmentResult.score.field.name,
             JobAssessmentResult.created_at.field.name,
             JobAssessmentResult.updated_at.field.name,
+            JobAssessmentResult.order_status.field.name,
+            JobAssessmentResult.assessment_access_url.field.name,
         )
 
 
@@ -50,6 +52,7 @@ class JobAssessmentType(JobAssessmentUserContextMixin, DjangoObjectType):
     results = graphene.List(
         JobAssessmentResultType, filters=graphene.Argument(JobAssessmentResultFilterInput, required=False)
     )
+    last_result = graphene.Field(JobAssessmentResultType)
     can_retry = graphene.Boolean()
     required = graphene.Boolean()
 
@@ -105,6 +108,18 @@ class JobAssessmentType(JobAssessmentUserContextMixin, DjangoObjectType):
 
         return results.filter(filter_conditions).order_by(f"-{JobAssessmentResult.updated_at.field.name}")
 
+    def resolve_last_result(self, info):
+        if not (user := JobAssessmentType.get_user(info)):
+            return None
+
+        return (
+            JobAssessmentResult.objects.filter(
+                **{fj(JobAssessmentResult.job_assessment): self, fj(JobAssessmentResult.user): user}
+            )
+            .order_by(f"-{JobAssessmentResult.created_at.field.name}")
+            .first()
+        )
+
     def resolve_can_retry(self, info):
         return self.can_start(JobAssessmentType.get_user(info))[0]
 
@@ -1,11 +1,13 @@
+from functools import partial
+
 from common.views import WebhookView
-from common.webhook import WebhookEvent, WebhookHandlerResponse
+from common.webhook import WebhookEvent
 
 from django.conf import settings
 
-from .client.types import GetScoresResponse, GetStatusResponse
 from .forms import ScoreWebhookForm, StatusWebhookForm
-from .models import JobAssessmentResult
+from .models import CriteriaWebhookInbox
+from .webhooks import receive_webhook
 
 
 class CriteriaWebhookView(WebhookView):
@@ -16,33 +18,17 @@ class CriteriaWebhookView(WebhookView):
         return "x-criteria-api-key"
 
 
-def handle_scores_update(payload: dict) -> WebhookHandlerResponse:
-    scores_response = GetScoresResponse.model_validate(payload)
-    result = JobAssessmentResult.objects.get(order_id=scores_response.orderId)
-    result.raw_score = {k: v for k, v in scores_response.scores.model_dump().items() if v is not None}
-    result.report_url = scores_response.reportUrl
-    result.save(
-        update_fields=[
-            JobAssessmentResult.raw_score.field.name,
-            JobAssessmentResult.report_url.field.name,
-        ]
-    )
-    return WebhookHandlerResponse(status="success")
-
-
 class ScoresWebhookView(CriteriaWebhookView):
-    event = WebhookEvent(event="scores_update", handler=handle_scores_update)
+    event = WebhookEvent(
+        event=CriteriaWebhookInbox.Event.SCORES_UPDATE,
+        handler=partial(receive_webhook, CriteriaWebhookInbox.Event.SCORES_UPDATE),
+    )
     form_class = ScoreWebhookForm
 
 
-def handle_status_update(payload: dict) -> WebhookHandlerResponse:
-    status_response = GetStatusResponse.model_validate(payload)
-    result = JobAssessmentResult.objects.get(order_id=status_response.orderId)
-    result.raw_status = status_response.status
-    result.save(update_fields=[JobAssessmentResult.raw_status.field.name])
-    return WebhookHandlerResponse(status="success")
-
-
 class StatusWebhookView(CriteriaWebhookView):
-    event = WebhookEvent(event="status_update", handler=handle_status_update)
+    event = WebhookEvent(
+        event=CriteriaWebhookInbox.Event.STATUS_UPDATE,
+        handler=partial(receive_webhook, CriteriaWebhookInbox.Event.STATUS_UPDATE),
+    )
     form_class = StatusWebhookForm
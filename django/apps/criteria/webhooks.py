@@ -0,0 +1,140 @@
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Type
+
+from common.logging import get_logger
+from common.utils import fj
+from common.webhook import WebhookHandlerResponse
+from pydantic import BaseModel
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.lookups import In, IsNull
+from django.utils import timezone
+
+from .client.types import GetScoresResponse, GetStatusResponse
+from .constants import (
+    CRITERIA_WEBHOOK_INBOX_BATCH_SIZE,
+    CRITERIA_WEBHOOK_INBOX_SCHEDULED_CACHE_KEY,
+    CRITERIA_WEBHOOK_INBOX_SCHEDULED_TIMEOUT,
+)
+from .models import CriteriaWebhookInbox, JobAssessmentResult
+from .tasks import process_webhook_inbox_task
+
+logger = get_logger()
+
+EVENT_MODELS: Dict[str, Type[BaseModel]] = {
+    CriteriaWebhookInbox.Event.SCORES_UPDATE: GetScoresResponse,
+    CriteriaWebhookInbox.Event.STATUS_UPDATE: GetStatusResponse,
+}
+
+
+def schedule_webhook_inbox_processing():
+    # A burst of callbacks shares the task scheduled by its first callback
+    if cache.add(CRITERIA_WEBHOOK_INBOX_SCHEDULED_CACHE_KEY, True, timeout=CRITERIA_WEBHOOK_INBOX_SCHEDULED_TIMEOUT):
+        process_webhook_inbox_task.delay()
+
+
+def receive_webhook(event: str, payload: dict) -> WebhookHandlerResponse:
+    """Validate the callback and store it in the inbox, without touching its result."""
+
+    response = EVENT_MODELS[event].model_validate(payload)
+    CriteriaWebhookInbox.objects.create(
+        **{
+            fj(CriteriaWebhookInbox.event): event,
+            fj(CriteriaWebhookInbox.order_id): uuid.UUID(response.orderId),
+            fj(CriteriaWebhookInbox.payload): response.model_dump(mode="json"),
+        }
+    )
+    transaction.on_commit(schedule_webhook_inbox_processing)
+    return WebhookHandlerResponse(status="success")
+
+
+def apply_scores_update(result: JobAssessmentResult, payload: dict) -> List[str]:
+    scores_response = GetScoresResponse.model_validate(payload)
+    result.raw_score = {k: v for k, v in scores_response.scores.model_dump().items() if v is not None}
+    result.report_url = scores_response.reportUrl
+    return [JobAssessmentResult.raw_score.field.name, JobAssessmentResult.report_url.field.name]
+
+
+def apply_status_update(result: JobAssessmentResult, payload: dict) -> List[str]:
+    result.raw_status = GetStatusResponse.model_validate(payload).status
+    return [JobAssessmentResult.raw_status.field.name]
+
+
+EVENT_APPLIERS = {
+    CriteriaWebhookInbox.Event.SCORES_UPDATE: apply_scores_update,
+    CriteriaWebhookInbox.Event.STATUS_UPDATE: apply_status_update,
+}
+
+
+def apply_webhook_payloads(payloads_by_order: Dict[uuid.UUID, Dict[str, dict]]) -> Dict[uuid.UUID, Exception]:
+    """
+    Apply the latest payload of every event to the result of its order with a single save.
+
+    Every order is applied in its own savepoint, so an order that fails is rolled back alone.
+
+    Returns:
+        The error of every order that could not be applied
+    """
+
+    errors = {}
+    for result in JobAssessmentResult.objects.filter(
+        **{fj(JobAssessmentResult.order_id, In.lookup_name): list(payloads_by_order)}
+    ):
+        try:
+            with transaction.atomic():
+                update_fields = []
+                for event, payload in payloads_by_order.pop(result.order_id).items():
+                    update_fields += EVENT_APPLIERS[event](result, payload)
+                result.save(update_fields=update_fields)
+        except Exception as e:
+            logger.exception(f"Criteria callbacks of order {result.order_id} could not be applied: {e}")
+            errors[result.order_id] = e
+
+    for order_id in payloads_by_order:
+        logger.warning(f"Criteria callback for unknown order {order_id} is dropped.")
+
+    return errors
+
+
+def process_webhook_inbox():
+    cache.delete(CRITERIA_WEBHOOK_INBOX_SCHEDULED_CACHE_KEY)
+    while True:
+        with transaction.atomic():
+            pending = list(
+                CriteriaWebhookInbox.objects.select_for_update(skip_locked=True)
+                .filter(**{fj(CriteriaWebhookInbox.failed_at, IsNull.lookup_name): True})
+                .order_by(CriteriaWebhookInbox._meta.pk.attname)
+                .values_list(
+                    CriteriaWebhookInbox._meta.pk.attname,
+                    fj(CriteriaWebhookInbox.event),
+                    fj(CriteriaWebhookInbox.order_id),
+                    fj(CriteriaWebhookInbox.payload),
+                )[:CRITERIA_WEBHOOK_INBOX_BATCH_SIZE]
+            )
+            if not pending:
+                return
+
+            # Later callbacks of an order replace the earlier ones of the same event
+            payloads_by_order = defaultdict(dict)
+            pks_by_order = defaultdict(list)
+            for pk, event, order_id, payload in pending:
+                payloads_by_order[order_id][event] = payload
+                pks_by_order[order_id].append(pk)
+            errors = apply_webhook_payloads(payloads_by_order)
+
+            # Callbacks of failed orders are dead-lettered, the others are done
+            for order_id, error in errors.items():
+                CriteriaWebhookInbox.objects.filter(
+                    **{fj(CriteriaWebhookInbox._meta.pk.attname, In.lookup_name): pks_by_order.pop(order_id)}
+                ).update(
+                    **{
+                        fj(CriteriaWebhookInbox.failed_at): timezone.now(),
+                        fj(CriteriaWebhookInbox.error): repr(error),
+                    }
+                )
+            done = [pk for pks in pks_by_order.values() for pk in pks]
+            CriteriaWebhookInbox.objects.filter(
+                **{fj(CriteriaWebhookInbox._meta.pk.attname, In.lookup_name): done}
+            ).delete()
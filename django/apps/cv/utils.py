@@ -110,7 +110,7 @@ def extract_generated_resume_info(user):
         data["resume_data"] = user.resume.resume_json
 
     service = GoogleServices(Assistants.GENERATE_RESUME)
-    message = service.generate_text_content(json.dumps(data))
+    message = service.generate_text_content(json.dumps(data), use_cache=False)
     if not message:
         return
 
@@ -9,6 +9,15 @@ class NotificationTypes(TextChoices):
     IN_APP = "in_app", _("In-App")
 
 
+CAMPAIGN_CHUNK_SIZE = 500
+SMS_MAX_CONCURRENT_REQUESTS = 8
+PUSH_BATCH_SIZE = 500
+
+TEMPLATE_CACHE_SIZE = 256
+EMAIL_BASE_TEMPLATE = "notification/email_base.html"
+EMAIL_BASE_CONTENT_PLACEHOLDER = "REPLACE_ME"
+EMAIL_BASE_CONTENT_VARIABLE = "notification_content"
+
 SCHEDULER_TASK_NAME_TEMPLATE = "scheduler_for_campaign_%(campaign_id)s"
 
 
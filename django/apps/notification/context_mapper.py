@@ -1,7 +1,7 @@
 from collections import ChainMap
 from functools import wraps
 from operator import methodcaller
-from typing import Dict, List
+from typing import ClassVar, Dict, List, Sequence, Set
 
 from django.db.models import Model
 
@@ -11,6 +11,8 @@ from .types import ReportMapperType
 class ContextMapper:
     name: str
     help: str
+    # Queryset annotations the mapper reads from the instances
+    annotations: ClassVar[Sequence[str]] = ()
 
     @classmethod
     def get_context(cls, instance: Model):
@@ -20,6 +22,10 @@ class ContextMapper:
     def map(cls, instance: Model):
         raise NotImplementedError("Method 'map' must be implemented")
 
+    @classmethod
+    def map_many(cls, instances: List[Model]) -> List:
+        return [cls.map(instance) for instance in instances]
+
 
 class ContextMapperRegistry:
     _registry: Dict[Model, List[ContextMapper]] = {}
@@ -36,6 +42,10 @@ class ContextMapperRegistry:
     def get_mapper(cls, model: Model) -> ReportMapperType:
         return cls._registry.get(model)
 
+    @classmethod
+    def get_annotations(cls, model: Model) -> Set[str]:
+        return {annotation for mapper in cls.get_mapper(model) or [] for annotation in mapper.annotations}
+
     @classmethod
     def registry(cls) -> Dict[Model, List[ContextMapper]]:
         return cls._registry
@@ -48,5 +58,16 @@ class ContextMapperRegistry:
 
         return {k: v for k, v in ChainMap(*map(methodcaller("get_context", instance=instance), mappers)).items()}
 
+    @classmethod
+    def get_contexts(cls, instances: List[Model]) -> List[dict]:
+        if not instances or not (mappers := cls.get_mapper(instances[0]._meta.model)):
+            return [{} for _ in instances]
+
+        contexts = [{} for _ in instances]
+        for mapper in reversed(mappers):
+            for context, value in zip(contexts, mapper.map_many(instances)):
+                context[mapper.name] = value
+        return contexts
+
 
 register = ContextMapperRegistry.register
@@ -1,3 +1,6 @@
+from functools import lru_cache
+from typing import Dict, Tuple
+
 from account.models import UserDevice
 from common.utils import fj, get_all_subclasses
 from croniter import croniter
@@ -8,16 +11,36 @@ from phonenumber_field.modelfields import PhoneNumberField
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Count
+from django.db.models.lookups import In
 from django.template.base import Template
 from django.template.context import Context
 from django.template.loader import get_template
+from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
 
-from .constants import NotificationTypes
+from .constants import (
+    EMAIL_BASE_CONTENT_PLACEHOLDER,
+    EMAIL_BASE_CONTENT_VARIABLE,
+    EMAIL_BASE_TEMPLATE,
+    TEMPLATE_CACHE_SIZE,
+    NotificationTypes,
+)
 from .context_mapper import ContextMapperRegistry
 from .types import NotificationType
 
 
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(source: str) -> Template:
+    return Template(source)
+
+
+@lru_cache(maxsize=1)
+def get_email_base_template() -> Template:
+    source = get_template(EMAIL_BASE_TEMPLATE).template.source
+    return Template(source.replace(EMAIL_BASE_CONTENT_PLACEHOLDER, f"{{{{ {EMAIL_BASE_CONTENT_VARIABLE} }}}}"))
+
+
 def token_excerpt(token: str) -> str:
     return f"{token[:10]}...{token[-10:]}"
 
@@ -38,10 +61,11 @@ class NotificationTemplate(TimeStampedModel):
     content_template = models.TextField(verbose_name=_("Content Template"), help_text=get_template_help_text)
 
     def render(self, context: dict, is_email=False) -> str:
-        content = Template(self.content_template).render(Context(context))
+        content = compile_template(self.content_template).render(Context(context))
         if is_email:
-            base_template = get_template("notification/email_base.html").template
-            content = Template(base_template.source.replace("REPLACE_ME", content)).render(Context(context))
+            content = get_email_base_template().render(
+                Context(context | {EMAIL_BASE_CONTENT_VARIABLE: mark_safe(content)})
+            )
         return content
 
     def __str__(self):
@@ -137,6 +161,26 @@ class Campaign(TimeStampedModel):
             if not croniter.is_valid(self.crontab):
                 raise ValidationError({fj(Campaign.crontab): _("Invalid crontab value.")})
 
+    def get_successful_notifications_counts(self, users) -> Dict[Tuple[int, int], int]:
+        campaign_notification_type = fj(
+            CampaignNotification.notification.field.related_query_name(),
+            CampaignNotification.campaign_notification_type,
+        )
+        counts = (
+            Notification.objects.filter(
+                **{
+                    fj(campaign_notification_type, CampaignNotificationType.campaign): self,
+                    fj(Notification.user, In.lookup_name): users,
+                    fj(Notification.status): Notification.Status.SENT,
+                }
+            )
+            .order_by()
+            .values(campaign_notification_type, fj(Notification.user))
+            .annotate(count=Count(Notification._meta.pk.attname))
+            .values_list(campaign_notification_type, fj(Notification.user), "count")
+        )
+        return {(type_id, user_id): count for type_id, user_id, count in counts}
+
     def get_campaign_notification_types(self):
         campaign_notification_manager: models.BaseManager[CampaignNotificationType] = getattr(
             self,
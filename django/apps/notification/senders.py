@@ -1,9 +1,10 @@
 import os
 import traceback
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
-from itertools import groupby
-from typing import Generic, List, Optional, TypeVar
+from itertools import batched, groupby
+from typing import Generic, List, Optional, Tuple, TypeVar
 
 import firebase_admin
 from common.logging import get_logger
@@ -14,21 +15,28 @@ from flex_blob.models import FileModel
 from flex_blob.views import BlobResponseBuilder
 from flex_pubsub.tasks import register_task
 from pydantic import BaseModel, ConfigDict
+from twilio.http.http_client import TwilioHttpClient
 from twilio.rest import Client
 
 from django.conf import settings
 from django.core import mail
 from django.core.mail import EmailMessage
-from django.db.models import Model, QuerySet
+from django.db.models import Model, QuerySet, prefetch_related_objects
 from django.db.models.lookups import In
 from django.utils import timezone
 from django.utils.html import strip_tags
 
-from .constants import NotificationTypes
+from .constants import (
+    CAMPAIGN_CHUNK_SIZE,
+    PUSH_BATCH_SIZE,
+    SMS_MAX_CONCURRENT_REQUESTS,
+    NotificationTypes,
+)
 from .context_mapper import ContextMapperRegistry
 from .models import (
     Campaign,
     CampaignNotification,
+    CampaignNotificationType,
     EmailNotification,
     InAppNotification,
     Notification,
@@ -126,7 +134,12 @@ class TwilioSender(NotificationSender):
     @classmethod
     @lru_cache
     def get_client(cls) -> Client:
-        return Client(cls.get_setting("API_KEY"), cls.get_setting("API_SECRET"), cls.get_setting("ACCOUNT_SID"))
+        return Client(
+            cls.get_setting("API_KEY"),
+            cls.get_setting("API_SECRET"),
+            cls.get_setting("ACCOUNT_SID"),
+            http_client=TwilioHttpClient(pool_connections=True),
+        )
 
     @abstractmethod
     def serialize_phone_number(cls, phone_number: str) -> str:
@@ -156,13 +169,15 @@ class TwilioSender(NotificationSender):
         *notifications: SMSNotification,
         from_number: Optional[str] = None,
     ):
-        results = []
-        for notification in notifications:
+        def send(notification: SMSNotification):
             try:
-                results.append(self.send(notification, from_number=from_number))
+                return self.send(notification, from_number=from_number)
             except Exception as e:
-                results.append(e)
-        return results
+                return e
+
+        max_workers = max(1, min(len(notifications), SMS_MAX_CONCURRENT_REQUESTS))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sms-sender") as executor:
+            return list(executor.map(send, notifications))
 
 
 class SMSNotificationSender(TwilioSender):
@@ -205,27 +220,34 @@ class PushNotificationSender(NotificationSender):
             token=notification.notification.token,
         )
 
+    def delete_tokens(self, tokens: List[str]):
+        if tokens:
+            UserPushNotificationToken.objects.filter(
+                **{fj(UserPushNotificationToken.token, In.lookup_name): tokens}
+            ).delete()
+
     def send(self, notification: NotificationContext[PushNotification]):
         self.setup()
-        messaging.send(self.get_message(notification))
+        try:
+            messaging.send(self.get_message(notification))
+        except messaging.UnregisteredError:
+            self.delete_tokens([notification.notification.token])
+            raise
 
     def send_bulk(self, *notifications: NotificationContext[PushNotification], **kwargs):
         self.setup()
-        messages = [self.get_message(notification) for notification in notifications]
-        responses = messaging.send_each(messages)
-        for response, notification in zip(responses.responses, notifications):
-            if not response.success and isinstance(response.exception, messaging.UnregisteredError):
-                UserPushNotificationToken.objects.filter(
-                    **{fj(UserPushNotificationToken.token): notification.notification.token}
-                ).delete()
-        return [response.exception for response in responses.responses]
-
-    def handle_exception(self, exception: Exception, notification: NotificationContext[PushNotification]):
-        if isinstance(exception, messaging.UnregisteredError):
-            UserPushNotificationToken.objects.filter(
-                **{fj(UserPushNotificationToken.token): notification.notification.token}
-            ).delete()
-        return super().handle_exception(exception, notification)
+        exceptions = []
+        for batch in batched(notifications, PUSH_BATCH_SIZE):
+            responses = messaging.send_each([self.get_message(notification) for notification in batch])
+            self.delete_tokens(
+                [
+                    notification.notification.token
+                    for response, notification in zip(responses.responses, batch)
+                    if not response.success and isinstance(response.exception, messaging.UnregisteredError)
+                ]
+            )
+            exceptions.extend(response.exception for response in responses.responses)
+        return exceptions
 
 
 def handle_notification_error(notification, error, sender):
@@ -271,21 +293,18 @@ def send_notifications(*notifications: NotificationContext[Notification], **kwar
     return [n.notification.status == Notification.Status.SENT for n in notifications]
 
 
-@register_task([NotificationSubscription.CAMPAIGN])
-def send_campaign_notifications(campaign_id: int, pks=None):
-    campaign = Campaign.objects.filter(**{Campaign._meta.pk.attname: campaign_id}).first()
-
-    if not campaign:
-        return
-
-    campaign_notification_types = campaign.get_campaign_notification_types()
-    report_qs: QuerySet = campaign.saved_filter.get_queryset()
-    model: Model = report_qs.model
-    if pks is not None:
-        report_qs = report_qs.filter(**{fj(model._meta.pk.attname, In.lookup_name): pks})
-
-    if not report_qs.exists():
-        return
+def build_campaign_notifications(
+    campaign: Campaign,
+    campaign_notification_types: List[CampaignNotificationType],
+    instances: List[Model],
+) -> Tuple[List[NotificationContext], List[CampaignNotification]]:
+    prefetch_related_objects(instances, "user")
+    contexts = ContextMapperRegistry.get_contexts(instances)
+    successful_counts = (
+        campaign.get_successful_notifications_counts([instance.user for instance in instances])
+        if campaign.max_attempts
+        else {}
+    )
 
     notification_contexts = []
     campaign_notifications = []
@@ -296,13 +315,12 @@ def send_campaign_notifications(campaign_id: int, pks=None):
         NotificationModel = notification_dict.get(notification_type)
 
         notifications_kwargs = []
-        for instance in report_qs:
+        for instance, context in zip(instances, contexts):
             if campaign.max_attempts and (
-                campaign_notification_type.successful_notifications_count(instance.user) >= campaign.max_attempts
+                successful_counts.get((campaign_notification_type.pk, instance.user.pk), 0) >= campaign.max_attempts
             ):
                 continue
 
-            context = ContextMapperRegistry.get_context(instance)
             body = campaign_notification_type.body.render(
                 context, is_email=notification_type == NotificationTypes.EMAIL
             )
@@ -336,7 +354,38 @@ def send_campaign_notifications(campaign_id: int, pks=None):
                 )
             )
 
-    send_notifications(*notification_contexts)
+    return notification_contexts, campaign_notifications
+
+
+@register_task([NotificationSubscription.CAMPAIGN])
+def send_campaign_notifications(campaign_id: int, pks=None):
+    campaign = Campaign.objects.filter(**{Campaign._meta.pk.attname: campaign_id}).first()
+
+    if not campaign:
+        return
+
+    campaign_notification_types = list(
+        campaign.get_campaign_notification_types().select_related(
+            CampaignNotificationType.subject.field.name,
+            CampaignNotificationType.body.field.name,
+        )
+    )
+    report_qs: QuerySet = campaign.saved_filter.get_queryset()
+    model: Model = report_qs.model
+    if pks is not None:
+        report_qs = report_qs.filter(**{fj(model._meta.pk.attname, In.lookup_name): pks})
+    if hasattr(report_qs, "with_annotations"):
+        report_qs = report_qs.with_annotations(*ContextMapperRegistry.get_annotations(model))
+
+    if not report_qs.exists():
+        return
+
+    for instances in batched(report_qs.iterator(chunk_size=CAMPAIGN_CHUNK_SIZE), CAMPAIGN_CHUNK_SIZE):
+        notification_contexts, campaign_notifications = build_campaign_notifications(
+            campaign, campaign_notification_types, list(instances)
+        )
+        send_notifications(*notification_contexts)
+        CampaignNotification.objects.bulk_create(campaign_notifications, batch_size=CAMPAIGN_CHUNK_SIZE)
+
     campaign.sent_at = timezone.now()
     campaign.save(update_fields=[fj(Campaign.sent_at)])
-    CampaignNotification.objects.bulk_create(campaign_notifications, batch_size=20)
@@ -0,0 +1,318 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import parse_qs
+
+import firebase_admin
+from account.models import Profile, UserDevice
+from firebase_admin import messaging
+from google.auth.credentials import AnonymousCredentials
+from graphql_jwt.refresh_token.models import RefreshToken
+from twilio.base.exceptions import TwilioRestException
+from twilio.http.http_client import TwilioHttpClient
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.forms.models import model_to_dict
+from django.template.base import Template
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from .constants import SMS_MAX_CONCURRENT_REQUESTS, NotificationTypes
+from .context_mapper import ContextMapperRegistry
+from .models import (
+    Campaign,
+    CampaignNotificationType,
+    NotificationTemplate,
+    PushNotification,
+    SMSNotification,
+    UserPushNotificationToken,
+    compile_template,
+)
+from .senders import (
+    NotificationContext,
+    PushNotificationSender,
+    SMSNotificationSender,
+    TwilioSender,
+    build_campaign_notifications,
+)
+
+UNREGISTERED_TOKEN_PREFIX = "unregistered"
+INVALID_PHONE_NUMBER = "+15005550001"
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Local HTTP stand-in of a provider, answering every POST with ``respond(path, body)``."""
+
+    daemon_threads = True
+
+    def __init__(self, respond, latency: float = 0.0):
+        self.respond = respond
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(handler):
+                body = handler.rfile.read(int(handler.headers["Content-Length"])).decode()
+                with self.lock:
+                    self.requests.append(body)
+                    self.active += 1
+                    self.max_active = max(self.max_active, self.active)
+                try:
+                    time.sleep(self.latency)
+                    status, payload = self.respond(handler.path, body)
+                finally:
+                    with self.lock:
+                        self.active -= 1
+
+                content = json.dumps(payload).encode()
+                handler.send_response(status)
+                handler.send_header("Content-Type", "application/json")
+                handler.send_header("Content-Length", str(len(content)))
+                handler.end_headers()
+                handler.wfile.write(content)
+
+            def log_message(handler, *args):
+                pass
+
+        super().__init__(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def close(self):
+        self.shutdown()
+        self.server_close()
+
+
+def respond_as_twilio(path: str, body: str):
+    to = parse_qs(body)["To"][0]
+    if to == INVALID_PHONE_NUMBER:
+        return 400, {"code": 21211, "message": f"The 'To' number {to} is not a valid phone number.", "status": 400}
+    return 201, {"sid": f"SM{to.lstrip('+')}", "to": to, "status": "queued"}
+
+
+def respond_as_fcm(path: str, body: str):
+    token = json.loads(body)["message"]["token"]
+    if token.startswith(UNREGISTERED_TOKEN_PREFIX):
+        return 404, {
+            "error": {
+                "code": 404,
+                "message": "Requested entity was not found.",
+                "status": "NOT_FOUND",
+                "details": [
+                    {"@type": "type.googleapis.com/google.firebase.fcm.v1.FcmError", "errorCode": "UNREGISTERED"}
+                ],
+            }
+        }
+    return 200, {"name": f"projects/stand-in/messages/{token}"}
+
+
+@override_settings(
+    TWILIO={"ACCOUNT_SID": "AC00", "API_KEY": "SK00", "API_SECRET": "secret", "PHONE_NUMBER": "+15005550006"}
+)
+class SMSNotificationSenderTestCase(SimpleTestCase):
+    latency = 0.2
+
+    def setUp(self):
+        self.server = StandInServer(respond_as_twilio, latency=self.latency)
+        self.addCleanup(self.server.close)
+        server_url = self.server.url
+
+        class StandInTwilioHttpClient(TwilioHttpClient):
+            def request(self, method, url, *args, **kwargs):
+                return super().request(method, url.replace("https://api.twilio.com", server_url), *args, **kwargs)
+
+        patcher = mock.patch("notification.senders.TwilioHttpClient", StandInTwilioHttpClient)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for cached in (TwilioSender.get_setting, TwilioSender.get_client):
+            cached.cache_clear()
+            self.addCleanup(cached.cache_clear)
+
+    def get_notifications(self, phone_numbers):
+        return [
+            NotificationContext(notification=SMSNotification(phone_number=phone_number, body=f"Hello {phone_number}"))
+            for phone_number in phone_numbers
+        ]
+
+    def test_bulk_send_is_concurrent_and_bounded(self):
+        notifications = self.get_notifications(
+            [f"+1415555{index:04d}" for index in range(3 * SMS_MAX_CONCURRENT_REQUESTS)]
+        )
+
+        started = time.perf_counter()
+        results = SMSNotificationSender().send_bulk(*notifications)
+        elapsed = time.perf_counter() - started
+
+        self.assertListEqual(results, [None] * len(notifications))
+        self.assertEqual(len(self.server.requests), len(notifications))
+        self.assertEqual(self.server.max_active, SMS_MAX_CONCURRENT_REQUESTS)
+        self.assertLess(elapsed, len(notifications) * self.latency / 2)
+
+    def test_bulk_send_results_follow_input_order(self):
+        notifications = self.get_notifications(["+15005550002", INVALID_PHONE_NUMBER, "+15005550003"])
+
+        results = SMSNotificationSender().send_bulk(*notifications)
+
+        self.assertIsNone(results[0])
+        self.assertIsInstance(results[1], TwilioRestException)
+        self.assertIsNone(results[2])
+
+
+class PushNotificationSenderTestCase(TestCase):
+    def setUp(self):
+        self.server = StandInServer(respond_as_fcm)
+        self.addCleanup(self.server.close)
+
+        credential = mock.Mock(spec=firebase_admin.credentials.Base)
+        credential.get_credential.return_value = AnonymousCredentials()
+        app = firebase_admin.initialize_app(credential, options={"projectId": "stand-in"})
+        self.addCleanup(firebase_admin.delete_app, app)
+
+        self.send_each = mock.Mock(wraps=messaging.send_each)
+        for patcher in (
+            mock.patch.object(
+                messaging._MessagingService, "FCM_URL", f"{self.server.url}/v1/projects/{{0}}/messages:send"
+            ),
+            mock.patch("notification.senders.messaging.send_each", self.send_each),
+            mock.patch("notification.senders.PUSH_BATCH_SIZE", 3),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.user = get_user_model().objects.create_user(
+            email="push@example.com", username="push", first_name="", last_name=""
+        )
+
+    def register_tokens(self, tokens):
+        for index, token in enumerate(tokens):
+            UserPushNotificationToken.objects.create(
+                token=token,
+                device=UserDevice.objects.create(
+                    device_id=f"device-{index}", refresh_token=RefreshToken.objects.create(user=self.user)
+                ),
+            )
+
+    def get_notifications(self, tokens):
+        return [
+            NotificationContext(notification=PushNotification(user=self.user, token=token, title="Title", body="Body"))
+            for token in tokens
+        ]
+
+    def test_bulk_send_is_split_in_fcm_batches(self):
+        tokens = [f"token-{index}" for index in range(7)]
+
+        results = PushNotificationSender().send_bulk(*self.get_notifications(tokens))
+
+        self.assertListEqual(results, [None] * len(tokens))
+        self.assertListEqual([len(call.args[0]) for call in self.send_each.call_args_list], [3, 3, 1])
+        self.assertCountEqual([json.loads(body)["message"]["token"] for body in self.server.requests], tokens)
+
+    def test_unregistered_tokens_are_deleted(self):
+        tokens = ["token-0", f"{UNREGISTERED_TOKEN_PREFIX}-1", "token-2", f"{UNREGISTERED_TOKEN_PREFIX}-3"]
+        self.register_tokens(tokens)
+
+        results = PushNotificationSender().send_bulk(*self.get_notifications(tokens))
+
+        self.assertListEqual([result is None for result in results], [True, False, True, False])
+        self.assertIsInstance(results[1], messaging.UnregisteredError)
+        self.assertCountEqual(UserPushNotificationToken.objects.values_list("token", flat=True), ["token-0", "token-2"])
+
+
+class CampaignNotificationsTestCase(TestCase):
+    profiles_count = 6
+
+    def setUp(self):
+        for index in range(self.profiles_count):
+            get_user_model().objects.create_user(
+                email=f"user{index}@example.com", username=f"user{index}", first_name=f"First{index}", last_name=""
+            )
+        subject = NotificationTemplate.objects.create(title="Subject", content_template="Hello {{ first_name }}")
+        body = NotificationTemplate.objects.create(
+            title="Body", content_template="<p>{{ first_name }} ({{ email }}), {{ completed_stages|length }}</p>"
+        )
+        self.campaign = Campaign(title="Campaign")
+        self.campaign_notification_types = [
+            CampaignNotificationType(
+                notification_type=notification_type, subject=subject, body=body, campaign=self.campaign
+            )
+            for notification_type in (NotificationTypes.EMAIL, NotificationTypes.IN_APP)
+        ]
+
+    def get_profiles(self, count=None):
+        return list(Profile.objects.order_by(Profile._meta.pk.attname)[:count])
+
+    def build(self, profiles):
+        notification_contexts, campaign_notifications = build_campaign_notifications(
+            self.campaign, self.campaign_notification_types, profiles
+        )
+        return (
+            [(type(context.notification), model_to_dict(context.notification)) for context in notification_contexts],
+            [
+                (
+                    campaign_notification.campaign_notification_type.notification_type,
+                    campaign_notification.notification.user_id,
+                )
+                for campaign_notification in campaign_notifications
+            ],
+        )
+
+    def test_chunk_contexts_match_instance_contexts(self):
+        expected = [ContextMapperRegistry.get_context(profile) for profile in self.get_profiles()]
+
+        self.assertListEqual(ContextMapperRegistry.get_contexts(self.get_profiles()), expected)
+
+    def test_chunk_notifications_match_instance_notifications(self):
+        notifications, campaign_notifications = self.build(self.get_profiles())
+
+        expected_notifications, expected_campaign_notifications = [], []
+        for profile in self.get_profiles():
+            instance_notifications, instance_campaign_notifications = self.build([profile])
+            expected_notifications += instance_notifications
+            expected_campaign_notifications += instance_campaign_notifications
+
+        self.assertEqual(len(notifications), len(self.campaign_notification_types) * self.profiles_count)
+        self.assertCountEqual(notifications, expected_notifications)
+        self.assertCountEqual(campaign_notifications, expected_campaign_notifications)
+
+    def test_chunk_queries_do_not_grow_with_chunk_size(self):
+        with CaptureQueriesContext(connection) as small_chunk:
+            self.build(self.get_profiles(2))
+        with CaptureQueriesContext(connection) as large_chunk:
+            self.build(self.get_profiles())
+
+        self.assertEqual(len(large_chunk), len(small_chunk))
+
+
+class NotificationTemplateTestCase(SimpleTestCase):
+    def setUp(self):
+        compile_template.cache_clear()
+        self.addCleanup(compile_template.cache_clear)
+        patcher = mock.patch("notification.models.Template", wraps=Template)
+        self.Template = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_template_is_compiled_once(self):
+        template = NotificationTemplate(content_template="Hello {{ first_name }}")
+
+        rendered = [template.render({"first_name": first_name}) for first_name in ("Ada", "Alan", "Grace")]
+
+        self.assertListEqual(rendered, ["Hello Ada", "Hello Alan", "Hello Grace"])
+        self.Template.assert_called_once_with("Hello {{ first_name }}")
+
+    def test_edited_template_is_recompiled(self):
+        template = NotificationTemplate(content_template="Hello {{ first_name }}")
+        self.assertEqual(template.render({"first_name": "Ada"}), "Hello Ada")
+
+        template.content_template = "Goodbye {{ first_name }}"
+
+        self.assertEqual(template.render({"first_name": "Ada"}), "Goodbye Ada")
+        self.assertEqual(self.Template.call_count, 2)
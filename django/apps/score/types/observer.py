@@ -34,21 +34,24 @@ class ScoreObserver(FieldsObserver):
     def get_calculate_params(cls, instance: InstanceType) -> Dict[str, Any]:
         return {}
 
+    @classmethod
+    def get_changed_scores(cls, changed_fields: List[str], instance: InstanceType) -> List[Type[Score]]:
+        return [
+            score_class
+            for score_class in cls.get_scores()
+            if score_class.test_func(instance)
+            and (changed_fields == ["*"] or any(field in score_class.get_observed_fields() for field in changed_fields))
+        ]
+
+    @classmethod
+    def scores_changed(cls, instance: InstanceType, scores: List[Type[Score]]):
+        params = cls.get_calculate_params(instance)
+        cls.scores_calculated(instance, {score.slug: score().calculate(**params) for score in scores})
+
     @classmethod
     def fields_changed(cls, changed_fields: List[str], instance: InstanceType, *args, **kwargs):
         if not changed_fields:
             return
 
-        scores_dict = {}
-        for score_class in cls.get_scores():
-            if not score_class.test_func(instance):
-                continue
-
-            score = score_class()
-            if changed_fields != ["*"] and not any(field in score.get_observed_fields() for field in changed_fields):
-                continue
-
-            scores_dict[score.slug] = score.calculate(**cls.get_calculate_params(instance))
-
-        if scores_dict:
-            cls.scores_calculated(instance, scores_dict)
+        if scores := cls.get_changed_scores(changed_fields, instance):
+            cls.scores_changed(instance, scores)
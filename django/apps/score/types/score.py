@@ -1,8 +1,11 @@
-from typing import ClassVar, Dict, List, Type
+from typing import Any, ClassVar, Dict, Iterable, List, Type
 
 from account.models import User
+from common.utils import fj
 from pydantic import BaseModel, Field, PrivateAttr
 
+from django.db.models.lookups import In
+
 
 class ScoreRegistry:
     scores: Dict[str, Type["Score"]] = {}
@@ -39,6 +42,12 @@ class Score(BaseModel):
     def calculate(self, *args, **kwargs) -> int:
         raise NotImplementedError(f"Subclasses must implement 'calculate' in '{self.__class__.__name__}'")
 
+    def calculate_many(self, user_ids: List[int]) -> Dict[int, int]:
+        return {
+            user.pk: self.calculate(user)
+            for user in User.objects.filter(**{fj(User._meta.pk.attname, In.lookup_name): user_ids})
+        }
+
 
 class ExistingScore(Score):
     score: ClassVar[int]
@@ -46,9 +55,16 @@ class ExistingScore(Score):
     def get_value(self, user) -> int:
         raise NotImplementedError("Subclasses must implement 'get_value'")
 
+    def get_values(self, user_ids: List[int]) -> Dict[int, Any]:
+        raise NotImplementedError("Subclasses must implement 'get_values'")
+
     def calculate(self, user) -> int:
         return self.score if self.get_value(user) else 0
 
+    def calculate_many(self, user_ids: List[int]) -> Dict[int, int]:
+        values = self.get_values(user_ids)
+        return {user_id: self.score if values.get(user_id) else 0 for user_id in user_ids}
+
 
 class ScorePack(BaseModel):
     slug: ClassVar[str]
@@ -58,6 +74,15 @@ class ScorePack(BaseModel):
     def calculate(cls, user: User) -> Dict[str, int]:
         return {score.slug: score().calculate(user) for score in cls.scores}
 
+    @classmethod
+    def calculate_many(cls, user_ids: Iterable[int]) -> Dict[int, Dict[str, int]]:
+        user_ids = list(user_ids)
+        results = {user_id: {} for user_id in user_ids}
+        for score in cls.scores:
+            for user_id, value in score().calculate_many(user_ids).items():
+                results[user_id][score.slug] = value
+        return results
+
     @classmethod
     def calculate_total(cls, user) -> int:
         return sum(cls.calculate(user).values())
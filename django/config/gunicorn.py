@@ -0,0 +1,17 @@
+import os
+
+# Load the application in the master, so models preloaded there are shared copy-on-write by the workers
+preload_app = os.environ.get("GUNICORN_PRELOAD_APP", "false").lower() == "true"
+
+
+def when_ready(server):
+    if server.cfg.preload_app:
+        from ai.model_registry import preload_models
+
+        preload_models()
+
+
+def post_worker_init(worker):
+    from ai.model_registry import preload_models
+
+    preload_models()
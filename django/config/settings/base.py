@@ -295,6 +295,9 @@ HEADLESS_ONLY = True
 
 CITIES_LIGHT_CITY_SOURCES = ["https://download.geonames.org/export/dump/cities500.zip"]
 
+AI_PRELOAD_MODELS = list(filter(bool, os.environ.get("AI_PRELOAD_MODELS", "").split(",")))
+AI_PRELOAD_MODELS_ON_READY = os.environ.get("AI_PRELOAD_MODELS_ON_READY", "false").lower() == "true"
+
 CRITERIA_SETTINGS = {
     "BASE_URL": os.environ.get("CRITERIA_BASE_URL", "https://integrations.criteriacorp.com/api/v1"),
     "AUTH_TOKEN": os.environ.get("CRITERIA_AUTH_TOKEN"),
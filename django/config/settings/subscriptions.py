@@ -5,6 +5,8 @@ class AccountSubscription(SubscriptionBase):
     EMAILING = "emailing"
     ASSISTANTS = "assistants"
     DAILY_EXECUTION = "daily_execution"
+    SCORES = "scores"
+    EXPORTS = "exports"
 
 
 class CVSubscription(SubscriptionBase):
@@ -17,3 +19,6 @@ class NotificationSubscription(SubscriptionBase):
 
 class AssessmentSubscription(SubscriptionBase):
     REPORT_FILE = "report_file"
+    ORDERS = "orders"
+    WEBHOOKS = "webhooks"
+    TIMEOUTS = "timeouts"